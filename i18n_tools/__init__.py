@@ -0,0 +1,10 @@
+"""Locale tooling for src/i18n: parse each locale once, run many operations, write once.
+
+Run ``python -m i18n_tools --help`` for the command line interface.
+"""
+from .index import FlatIndex
+from .ops import Session, lookup
+from .paths import LOCALES_DIR, ROOT, SRC_DIR
+from .store import LocaleError, LocaleStore
+
+__all__ = ['LOCALES_DIR', 'ROOT', 'SRC_DIR', 'FlatIndex', 'LocaleError', 'LocaleStore', 'Session', 'lookup']
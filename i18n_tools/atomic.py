@@ -0,0 +1,267 @@
+"""Crash-safe file writes and multi-file transactions for the locale directory.
+
+``atomic_write`` writes a temp file next to the target, fsyncs it and renames
+it over the target, so readers see the old file or the new one and never a
+truncated one. ``atomic_open`` does the same for text written in pieces.
+
+``LocaleTransaction`` commits several files together. Each new text is first
+staged in a temp file, and each current file gets a hard-link backup. A
+journal listing both is then written before any target is replaced. If the
+process dies halfway, the next ``locale_lock`` on the directory finds the
+journal and restores every backup. An exception inside the ``with`` block
+rolls back the same way. Once every target is replaced, deleting the journal
+commits the transaction; backups a crash leaves after that are removed as
+leftovers rather than restored.
+
+``locale_lock`` is an advisory ``flock`` on ``<dir>/.i18n.lock``. It is
+re-entrant within a process, so a command chain can hold it while the store
+commits.
+"""
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from . import trace
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = '.i18n.lock'
+JOURNAL_FILE = '.i18n.journal'
+LOCK_TIMEOUT = 30.0
+
+_held = {}
+
+
+class LockTimeout(OSError):
+    """Another process kept the locale directory locked for too long."""
+
+
+def _fsync_dir(directory):
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _stage(path, data):
+    """Write ``data`` (``str`` as UTF-8) to a synced temp file in the directory of ``path``; return its name."""
+    directory, name = os.path.split(os.path.abspath(path))
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        trace.add_bytes(written=len(data))
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777 if os.path.exists(path) else 0o644)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp
+
+
+def atomic_write(path, data):
+    """Replace ``path`` with ``data`` (``str`` is written as UTF-8) in one rename."""
+    tmp = _stage(path, data)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+@contextlib.contextmanager
+def atomic_open(path):
+    """Text file to write ``path`` through; it replaces ``path`` only if the block succeeds."""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+            trace.add_bytes(written=f.tell())
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777 if os.path.exists(path) else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _fsync_dir(directory)
+
+
+def _lock_fd(fd, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f'timed out after {timeout:.0f}s waiting for another locale tool to finish')
+            time.sleep(0.05)
+
+
+def _unlock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def locale_lock(directory, timeout=LOCK_TIMEOUT):
+    """Hold the advisory lock on ``directory``; recovers an interrupted transaction first."""
+    directory = os.path.abspath(directory)
+    if directory in _held:
+        _held[directory][1] += 1
+    else:
+        fd = os.open(os.path.join(directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_fd(fd, timeout)
+        except BaseException:
+            os.close(fd)
+            raise
+        _held[directory] = [fd, 1]
+        recover(directory)
+    try:
+        yield
+    finally:
+        entry = _held[directory]
+        entry[1] -= 1
+        if not entry[1]:
+            del _held[directory]
+            _unlock_fd(entry[0])
+            os.close(entry[0])
+
+
+def recover(directory):
+    """Undo a transaction that was interrupted after it started replacing files.
+
+    Returns the restored paths.
+    """
+    journal = os.path.join(directory, JOURNAL_FILE)
+    try:
+        with open(journal, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        entries = None
+    except ValueError:
+        entries = []  # the journal itself was cut short, so nothing was replaced yet
+    restored = []
+    if entries is None:
+        _remove_leftovers(directory)
+        return restored
+    for entry in entries:
+        target, backup, tmp = entry['target'], entry['backup'], entry['tmp']
+        if backup is not None and os.path.exists(backup):
+            os.replace(backup, target)
+            restored.append(target)
+        elif backup is None and os.path.exists(target):
+            os.unlink(target)
+            restored.append(target)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    os.unlink(journal)
+    _remove_leftovers(directory)
+    _fsync_dir(directory)
+    return restored
+
+
+def _remove_leftovers(directory):
+    """Delete temp files and backups of a transaction that died before writing its journal or after deleting it."""
+    for name in os.listdir(directory):
+        if name.startswith('.') and name.endswith(('.tmp', '.tmp.bak')):
+            os.unlink(os.path.join(directory, name))
+
+
+class LocaleTransaction:
+    """Stage writes to files in one directory and commit them all or none.
+
+    Use as a context manager: leaving the block normally commits, an exception
+    rolls back. The directory lock is held from staging to the end of commit.
+    """
+
+    def __init__(self, directory, timeout=LOCK_TIMEOUT):
+        self.directory = os.path.abspath(directory)
+        self.timeout = timeout
+        self.staged = {}
+        self._lock = None
+
+    def __enter__(self):
+        self._lock = locale_lock(self.directory, self.timeout)
+        self._lock.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self._lock.__exit__(exc_type, exc, tb)
+        return False
+
+    def write(self, path, data):
+        path = os.path.abspath(path)
+        if os.path.dirname(path) != self.directory:
+            raise ValueError(f'{path} is not in {self.directory}')
+        if path in self.staged:
+            os.unlink(self.staged[path])
+        self.staged[path] = _stage(path, data)
+
+    def rollback(self):
+        """Drop everything staged; files on disk are not touched."""
+        for tmp in self.staged.values():
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self.staged.clear()
+
+    def commit(self):
+        """Replace every staged file; on failure restore the ones already replaced."""
+        if not self.staged:
+            return []
+        entries = []
+        for target, tmp in self.staged.items():
+            backup = None
+            if os.path.exists(target):
+                backup = f'{tmp}.bak'
+                try:
+                    os.link(target, backup)
+                except OSError:  # no hard links on this file system
+                    shutil.copy2(target, backup)
+            entries.append({'target': target, 'backup': backup, 'tmp': tmp})
+        atomic_write(os.path.join(self.directory, JOURNAL_FILE), json.dumps(entries, indent=2))
+        try:
+            for entry in entries:
+                os.replace(entry['tmp'], entry['target'])
+            _fsync_dir(self.directory)
+        except BaseException:
+            recover(self.directory)
+            self.staged.clear()
+            raise
+        # The commit point: without the journal, recovery keeps the new files.
+        os.unlink(os.path.join(self.directory, JOURNAL_FILE))
+        _fsync_dir(self.directory)
+        for entry in entries:
+            if entry['backup'] is not None:
+                os.unlink(entry['backup'])
+        written = list(self.staged)
+        self.staged.clear()
+        return written
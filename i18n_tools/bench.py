@@ -0,0 +1,247 @@
+"""Benchmarks of the locale tooling on synthetic locales and sources.
+
+``generate_locales`` builds an ``en``/``zh`` pair shaped like ours:
+camelCase keys in namespaces two to five levels deep, short English
+sentences, CJK values in ``zh``, ``{{count}}``-style placeholders, and a
+``zh`` that misses or adds a few keys. ``generate_sources`` writes a TSX
+tree whose components call ``t()`` on a sample of the keys.
+
+``run_benchmarks`` times each phase at each size, taking the best of
+``repeat`` runs, with any setup done outside the timer:
+
+``parse``       ``json.loads`` of the en text
+``flatten``     ``FlatIndex`` of en
+``diff``        ``diff_locales`` of zh against en
+``duplicates``  ``find_duplicates`` over the en text
+``repair``      ``check_text`` over the en text
+``extract``     ``extract_paths`` over the TSX tree, without the cache
+``patch``       a merge patch touching about 1% of the leaves
+``write``       splice the patched locale and commit it in a transaction
+
+``compare`` checks the results against an earlier results file.
+"""
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+
+from .atomic import LocaleTransaction
+from .diff import diff_locales
+from .duplicates import find_duplicates
+from .extract import extract_paths
+from .index import FlatIndex, flatten
+from .patch import Patch, PatchRun
+from .repair import check_text
+from .splice import splice
+from .store import dump_locale
+
+SIZES = (5_000, 50_000, 250_000, 1_000_000)
+PHASES = ('parse', 'flatten', 'diff', 'duplicates', 'repair', 'extract', 'patch', 'write')
+RESULTS_VERSION = 1
+RESULTS_FILE = os.path.join('build', 'bench', 'results.json')
+# Slowdowns smaller than this many seconds are noise, whatever the ratio.
+MIN_DELTA = 0.005
+
+WORDS = ('account', 'add', 'admin', 'age', 'apply', 'area', 'back', 'booking', 'browse', 'cancel', 'card',
+         'change', 'child', 'city', 'close', 'confirm', 'contact', 'country', 'date', 'delete', 'detail',
+         'document', 'edit', 'email', 'error', 'event', 'family', 'field', 'filter', 'form', 'help', 'host',
+         'item', 'job', 'label', 'language', 'list', 'load', 'location', 'message', 'name', 'new', 'next',
+         'note', 'offer', 'page', 'payment', 'phone', 'plan', 'post', 'price', 'profile', 'role', 'room',
+         'save', 'school', 'search', 'send', 'status', 'step', 'submit', 'success', 'title', 'type', 'upload',
+         'user', 'view', 'visa', 'week', 'work')
+PLACEHOLDERS = ('{{count}}', '{{name}}', '{{date}}', '{{amount}}')
+# Common CJK ideographs; values are drawn from here so their UTF-8 size matches real zh text.
+CJK = ''.join(chr(c) for c in range(0x4E00, 0x4E00 + 2000))
+MAX_DEPTH = 5
+
+
+def _key(rng, taken):
+    key = rng.choice(WORDS) + rng.choice(WORDS).capitalize()
+    while key in taken:
+        key += rng.choice(WORDS).capitalize()
+    return key
+
+
+def _values(rng):
+    """A matching ``(en, zh)`` pair of leaf values."""
+    en = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))).capitalize()
+    zh = ''.join(rng.choice(CJK) for _ in range(rng.randint(2, 14)))
+    if rng.random() < 0.1:
+        placeholder = rng.choice(PLACEHOLDERS)
+        en = f'{en} {placeholder}'
+        zh = f'{zh}{placeholder}'
+    return en, zh
+
+
+def _fill(rng, en, zh, n, depth):
+    """Add about ``n`` leaves to the parallel objects ``en`` and ``zh``."""
+    while n > 0:
+        key = _key(rng, en)
+        if depth < MAX_DEPTH and n >= 4 and rng.random() < 0.15:
+            size = rng.randint(2, min(n, 40))
+            en[key], zh[key] = {}, {}
+            _fill(rng, en[key], zh[key], size, depth + 1)
+            n -= size
+            continue
+        en[key], zh[key] = _values(rng)
+        roll = rng.random()
+        if roll < 0.01:
+            del zh[key]  # missing in zh
+        elif roll < 0.015:
+            zh[_key(rng, en) + 'Zh'] = zh[key]  # extra in zh
+        n -= 1
+
+
+def generate_locales(n, seed=0):
+    """``(en, zh)`` with about ``n`` leaves each."""
+    rng = random.Random(seed)
+    en, zh = {}, {}
+    left = n
+    while left > 0:
+        key = _key(rng, en)
+        size = min(left, rng.randint(40, 400))
+        en[key], zh[key] = {}, {}
+        _fill(rng, en[key], zh[key], size, 2)
+        left -= size
+    return en, zh
+
+
+def generate_sources(directory, keys, files, seed=0):
+    """Write ``files`` TSX components using keys sampled from ``keys``; return their paths."""
+    rng = random.Random(seed)
+    keys = list(keys)
+    paths = []
+    for i in range(files):
+        sub = os.path.join(directory, 'src', rng.choice(('components', 'pages', 'pages/admin', 'hooks')))
+        os.makedirs(sub, exist_ok=True)
+        lines = ["import { useTranslation } from 'react-i18next';", '',
+                 f'export default function Component{i}({{ type, count }}: Props) {{',
+                 '  const { t } = useTranslation();',
+                 '  return (',
+                 '    <div className="p-4">']
+        for _ in range(rng.randint(5, 30)):
+            key = rng.choice(keys)
+            roll = rng.random()
+            if roll < 0.1:
+                lines.append(f"      <p>{{t('{key}', {{ count }})}}</p>")
+            elif roll < 0.15:
+                lines.append(f'      <p>{{t(`{key.rpartition(".")[0]}.${{type}}`)}}</p>')
+            elif roll < 0.2:
+                lines.append(f'      <Button label={{t("{key}")}} />')
+            else:
+                lines.append(f"      <span>{{t('{key}')}}</span>")
+        lines += ['    </div>', '  );', '}', '']
+        path = os.path.join(sub, f'Component{i}.tsx')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+        paths.append(path)
+    return paths
+
+
+def _patch(data, rng):
+    """An ``overwrite`` patch changing about 1% of the leaves of ``data`` and adding as many."""
+    content = {}
+    for path, value, is_branch in flatten(data):
+        if is_branch or rng.random() >= 0.01:
+            continue
+        node = content
+        *parents, key = path.split('.')
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[key] = value + ' (updated)'
+        node[key + 'New'] = value
+    return Patch('bench', '', 'overwrite', 'replace', {'en': content}, '')
+
+
+def _time(func, setup=None, repeat=3):
+    """Best wall time of ``func(setup())`` over ``repeat`` runs; setup is not timed."""
+    best = None
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_size(n, phases=PHASES, repeat=3, workers=None, seed=0, log=None):
+    """``[{'phase', 'size', 'seconds', ...}]`` for one locale size."""
+    en, zh = generate_locales(n, seed)
+    en_text, zh_text = dump_locale(en), dump_locale(zh)
+    en_index, zh_index = FlatIndex(en), FlatIndex(zh)
+    rng = random.Random(seed)
+    results = []
+
+    def record(phase, seconds, **extra):
+        row = {'phase': phase, 'size': n, 'seconds': round(seconds, 6), **extra}
+        results.append(row)
+        if log is not None:
+            log(row)
+
+    work = tempfile.mkdtemp(prefix='i18n-bench-')
+    try:
+        if 'parse' in phases:
+            record('parse', _time(lambda _: json.loads(en_text), repeat=repeat), bytes=len(en_text.encode('utf-8')))
+        if 'flatten' in phases:
+            record('flatten', _time(lambda _: FlatIndex(en), repeat=repeat), keys=len(en_index))
+        if 'diff' in phases:
+            record('diff', _time(lambda _: diff_locales({'en': en_index, 'zh': zh_index}, 'en'), repeat=repeat))
+        if 'duplicates' in phases:
+            record('duplicates', _time(lambda _: list(find_duplicates(en_text)), repeat=repeat))
+        if 'repair' in phases:
+            record('repair', _time(lambda _: check_text(en_text), repeat=repeat))
+        if 'extract' in phases:
+            files = max(20, n // 250)
+            paths = generate_sources(work, en_index.keys, files, seed)
+            record('extract', _time(lambda _: extract_paths(paths, workers, work), repeat=repeat), files=files)
+        if 'patch' in phases or 'write' in phases:
+            patch = _patch(en, rng)
+            if 'patch' in phases:
+                record('patch', _time(lambda data: PatchRun().apply(data, 'en', patch),
+                                      lambda: json.loads(en_text), repeat))
+            if 'write' in phases:
+                patched = json.loads(en_text)
+                PatchRun().apply(patched, 'en', patch)
+                path = os.path.join(work, 'en.json')
+
+                def write(_):
+                    with LocaleTransaction(work) as tx:
+                        tx.write(path, splice(en_text, en, patched))
+
+                record('write', _time(write, repeat=repeat))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def run_benchmarks(sizes=SIZES, phases=PHASES, repeat=3, workers=None, seed=0, log=None):
+    """Results document for every size: ``{'version', 'python', 'machine', 'results': [...]}``."""
+    results = []
+    for n in sizes:
+        results.extend(run_size(n, phases, repeat, workers, seed, log))
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'machine': f'{platform.system()} {platform.machine()}',
+        'cpus': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """``[(phase, size, baseline seconds, seconds)]`` for every case more than ``threshold`` slower."""
+    before = {(r['phase'], r['size']): r['seconds'] for r in baseline.get('results', ())}
+    slower = []
+    for r in results['results']:
+        old = before.get((r['phase'], r['size']))
+        if old is None:
+            continue
+        if r['seconds'] > old * (1 + threshold) and r['seconds'] - old > MIN_DELTA:
+            slower.append((r['phase'], r['size'], old, r['seconds']))
+    return slower
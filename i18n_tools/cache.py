@@ -0,0 +1,110 @@
+"""Persistent per-file cache of key extraction results.
+
+Entries are keyed by repo-relative path and validated by ``(mtime_ns, size)``
+first and the SHA-1 of the content second, so a touched-but-unchanged file is
+re-hashed but not re-tokenized. Files that no longer exist drop out of the
+cache on the next save.
+"""
+import hashlib
+import json
+import os
+
+from . import trace
+from .atomic import atomic_write
+from .parallel import map_files
+from .paths import ROOT, rel
+
+CACHE_DIR = os.path.join(ROOT, '.i18n_cache')
+
+
+def digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class FileCache:
+    """``{relpath: {'stat': [mtime_ns, size], 'sha1': str, 'data': ...}}`` on disk as JSON."""
+
+    def __init__(self, name, version, cache_dir=CACHE_DIR, root=ROOT):
+        self.path = os.path.join(cache_dir, f'{name}.json')
+        self.version = version
+        self.root = root
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._changed = False
+        self.load()
+
+    def load(self):
+        try:
+            with trace.span('cache-load'), open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+                trace.add_bytes(read=f.tell())
+        except (OSError, ValueError):
+            return
+        if stored.get('version') == self.version and stored.get('root') == self.root:
+            self.entries = stored.get('files', {})
+
+    def save(self):
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with trace.span('cache-save'):
+            atomic_write(self.path, json.dumps({'version': self.version, 'root': self.root, 'files': self.entries},
+                                               ensure_ascii=False, separators=(',', ':')))
+        self._changed = False
+
+    def lookup(self, path):
+        """Cached data for ``path`` if it is still current, else ``None``."""
+        entry = self.entries.get(rel(path, self.root))
+        if entry is None:
+            return None
+        st = os.stat(path)
+        if entry['stat'] == [st.st_mtime_ns, st.st_size]:
+            return entry['data']
+        with open(path, 'rb') as f:
+            if digest(f.read()) != entry['sha1']:
+                return None
+        entry['stat'] = [st.st_mtime_ns, st.st_size]
+        self._changed = True
+        return entry['data']
+
+    def store(self, path, sha1, data):
+        st = os.stat(path)
+        self.entries[rel(path, self.root)] = {
+            'stat': [st.st_mtime_ns, st.st_size], 'sha1': sha1, 'data': data}
+        self._changed = True
+
+    def prune(self, paths):
+        """Forget entries for files that were deleted.
+
+        ``paths`` are known to exist; everything else is checked on disk, so a
+        run over a subset of files does not evict the rest of the tree.
+        """
+        keep = {rel(p, self.root) for p in paths}
+        for name in [n for n in self.entries if n not in keep]:
+            if not os.path.exists(os.path.join(self.root, name)):
+                del self.entries[name]
+                self._changed = True
+
+    def resolve(self, paths, compute, workers=None):
+        """Return ``{path: data}`` for ``paths``, recomputing only stale entries.
+
+        ``compute(path)`` must return ``(sha1, data)`` and is mapped over the
+        stale files in a process pool.
+        """
+        results = {}
+        stale = []
+        for path in paths:
+            data = self.lookup(path)
+            if data is None:
+                stale.append(path)
+            else:
+                results[path] = data
+        self.hits += len(results)
+        self.misses += len(stale)
+        for path, (sha1, data) in zip(stale, map_files(compute, stale, workers)):
+            self.store(path, sha1, data)
+            results[path] = data
+        self.prune(paths)
+        self.save()
+        return {path: results[path] for path in paths}
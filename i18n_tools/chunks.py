@@ -0,0 +1,99 @@
+"""Per-namespace locale chunks and a route manifest for lazy loading.
+
+Each locale is split by top-level key (``admin``, ``auPair``, ``jobs``, ...)
+into content-hashed files, ``<out>/<lang>/<namespace>.<hash>.json``. Every
+chunk holds ``{namespace: subtree}``, so it can be passed directly to
+``i18n.addResourceBundle(lang, 'translation', chunk, true, true)``.
+``<out>/manifest.json`` maps each chunk to its file. It also lists the
+namespaces the app shell needs and the extra ones each route in
+src/router.tsx needs.
+"""
+import hashlib
+import json
+import os
+
+from .atomic import atomic_write
+from .dynamic import pattern_prefix
+from .extract import WILDCARD
+from .routes import route_files
+
+CHUNKS_DIR = os.path.join('public', 'locales')
+MANIFEST = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def chunk_bytes(namespace, subtree):
+    return json.dumps({namespace: subtree}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def split_locale(data):
+    """``{namespace: (filename, bytes)}`` for every top-level key of a locale."""
+    out = {}
+    for namespace, subtree in data.items():
+        body = chunk_bytes(namespace, subtree)
+        out[namespace] = (f'{namespace}.{hashlib.sha256(body).hexdigest()[:10]}.json', body)
+    return out
+
+
+def namespaces_by_file(usages, known):
+    """``{file: namespaces}`` from a key usage index.
+
+    A key pattern whose first segment is itself dynamic could name any namespace,
+    so its file is attributed to all of ``known``.
+    """
+    out = {}
+    for key, uses in usages.items():
+        head = key.split('.', 1)[0]
+        if WILDCARD in head:
+            names = known if not pattern_prefix(head) else {n for n in known if n.startswith(pattern_prefix(head))}
+        else:
+            names = {head} & known
+        for u in uses:
+            out.setdefault(u.path, set()).update(names)
+    return out
+
+
+def build_manifest(split, usages, root):
+    known = set().union(*(set(chunks) for chunks in split.values()))
+    by_file = namespaces_by_file(usages, known)
+    shell_files, route_map = route_files(root)
+    shared = set().union(*(by_file.get(f, ()) for f in shell_files))
+    routes = {}
+    for path, files in sorted(route_map.items()):
+        needed = set().union(*(by_file.get(f, ()) for f in files)) - shared
+        routes[path] = sorted(needed)
+    return {
+        'version': MANIFEST_VERSION,
+        'chunks': {lang: {ns: f'{lang}/{name}' for ns, (name, _) in chunks.items()}
+                   for lang, chunks in split.items()},
+        'shared': sorted(shared),
+        'routes': routes,
+    }
+
+
+def write_chunks(split, manifest, out_dir, dry_run=False):
+    """Write new chunks and the manifest, and delete chunks that are no longer listed.
+
+    Returns ``(written, removed)`` chunk counts.
+    """
+    written = removed = 0
+    for lang, chunks in split.items():
+        lang_dir = os.path.join(out_dir, lang)
+        wanted = {name for name, _ in chunks.values()}
+        existing = set(os.listdir(lang_dir)) if os.path.isdir(lang_dir) else set()
+        for name, body in chunks.values():
+            if name in existing:
+                continue
+            written += 1
+            if not dry_run:
+                os.makedirs(lang_dir, exist_ok=True)
+                atomic_write(os.path.join(lang_dir, name), body)
+        for name in sorted(existing - wanted):
+            if name.endswith('.json'):
+                removed += 1
+                if not dry_run:
+                    os.remove(os.path.join(lang_dir, name))
+    if not dry_run:
+        os.makedirs(out_dir, exist_ok=True)
+        atomic_write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, ensure_ascii=False, indent=2))
+    return written, removed
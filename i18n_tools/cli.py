@@ -0,0 +1,375 @@
+"""Command line entry point: ``python -m i18n_tools <command> [+ <command> ...]``.
+
+Commands separated by a lone ``+`` run in order against the same parsed
+locales, and each modified locale is written once after the last command::
+
+    python -m i18n_tools validate + fix host-family location + list auPair.onboarding
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+
+from . import ops, trace
+from .atomic import atomic_write, locale_lock
+from .bench import PHASES, RESULTS_FILE, SIZES
+from .chunks import CHUNKS_DIR
+from .codemod import load_renames
+from .diff import KINDS
+from .dynamic import ENUM_DIRS
+from .fixes import FIXES
+from .hardcoded import HARDCODED_FILE
+from .missing import MISSING_REPORT_FILE
+from .paths import LOCALES_DIR, ROOT
+from .prune import PIN_FILE, PRUNED_DIR
+from .registry import REFERENCE_LOCALE, LocaleRegistry
+from .store import LocaleError, LocaleStore
+from .templates import COMPILED_DIR
+from .translate import API_KEY_ENV, BACKENDS, CONCURRENCY, RATE
+from .tree import EXISTS
+
+CHAIN = '+'
+
+
+def add_lang_option(p):
+    p.add_argument('--lang', action='append', dest='langs', metavar='LANG',
+                   help='limit to this locale (repeatable)')
+
+
+def add_workers_option(p):
+    p.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+
+
+def add_pin_options(p):
+    p.add_argument('--pin', action='append', default=[], metavar='KEY',
+                   help='treat KEY (a key, object path or * pattern) as used (repeatable)')
+    p.add_argument('--pins', default=PIN_FILE, metavar='FILE',
+                   help='file of pinned keys relative to the repo root (default: %(default)s)')
+
+
+def add_tree_options(p, exists=True):
+    if exists:
+        p.add_argument('--exists', choices=EXISTS, default='error',
+                       help='if the target exists: fail, replace it, or merge objects (default: %(default)s)')
+    p.add_argument('--optional', action='store_true', help='skip locales where the source does not exist')
+    add_lang_option(p)
+
+
+def run_codemod(session, args):
+    renames = {}
+    try:
+        for path in args.map:
+            renames.update(load_renames(os.path.join(session.root, path)))
+    except (OSError, ValueError) as e:
+        session.log(f"Error: {e}")
+        return 2
+    for r in args.renames:
+        old, _, new = r.partition('=')
+        if not old or not new:
+            session.log(f"Error: {r!r} is not OLD=NEW")
+            return 2
+        renames[old] = new
+    return ops.codemod(session, renames, args.src, args.workers)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m i18n_tools', description='Locale tooling for src/i18n.')
+    parser.add_argument('--root', default=ROOT, help='repository root (default: %(default)s)')
+    parser.add_argument('--locales-dir', default=LOCALES_DIR)
+    parser.add_argument('--locales', help='comma-separated locales to load (default: every locale in --locales-dir)')
+    parser.add_argument('--reference', metavar='LANG',
+                        help=f'reference locale (default: {REFERENCE_LOCALE} if present, else the first locale '
+                             'by name, or the first of --locales when they are given)')
+    parser.add_argument('--dry-run', action='store_true', help='report writes without performing them')
+    parser.add_argument('--no-cache', action='store_true', help='ignore the per-file extraction cache')
+    parser.add_argument('--profile', action='store_true', help='print time, I/O and memory per phase to stderr')
+    parser.add_argument('--trace', metavar='FILE', help='write a Chrome trace-event JSON file of every phase')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also record tracemalloc peaks (slow) for --profile and --trace')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('locales', help='list the locales found in the locale directory')
+    p.set_defaults(run=lambda s, a: ops.list_locales(s, s.registry))
+
+    p = sub.add_parser('validate', help='check that the locale files parse')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.validate(s, a.langs))
+
+    p = sub.add_parser('repair', help='list every syntax problem with context and optionally fix them')
+    p.add_argument('--write', action='store_true', help='write the minimally repaired files')
+    p.add_argument('--context', type=int, default=2, metavar='N', help='lines of context (default: %(default)s)')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.repair(s, a.langs, a.write, a.context))
+
+    p = sub.add_parser('duplicates', help='report keys repeated within the same object')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.duplicates(s, a.langs))
+
+    p = sub.add_parser('list', help='list the keys of one or more dotted paths')
+    p.add_argument('paths', nargs='*')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.list_keys(s, a.paths, a.langs))
+
+    p = sub.add_parser('diff', help='compare locales structurally with a reference locale')
+    p.add_argument('--ref', help='reference locale (default: the --reference locale)')
+    p.add_argument('--json', action='store_true', help='print a machine-readable report')
+    p.add_argument('--fail-on', action='append', choices=KINDS, metavar='KIND',
+                   help='exit 1 only for these kinds: %s (default: all)' % ', '.join(KINDS))
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.diff(s, a.langs, a.ref, a.json, a.fail_on or KINDS, a.workers))
+
+    p = sub.add_parser('shared', help='rank strings repeated under several keys and flag inconsistent translations')
+    p.add_argument('--ref', help='locale whose repeated strings are grouped (default: the --reference locale)')
+    p.add_argument('--limit', type=int, default=20, help='groups to print, 0 for all (default: %(default)s)')
+    p.add_argument('--min-count', type=int, default=2, help='keys a string needs to form a group (default: %(default)s)')
+    p.add_argument('--json', action='store_true', help='print a machine-readable report')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.shared(s, a.langs, a.ref, a.limit, a.min_count, a.json))
+
+    p = sub.add_parser('compile', help='check placeholder parity and write precompiled message files')
+    p.add_argument('--out', default=COMPILED_DIR, help='output directory relative to the repo root (default: %(default)s)')
+    p.add_argument('--ref', help='reference locale for placeholders (default: the --reference locale)')
+    p.add_argument('--check', action='store_true', help='only check placeholder parity')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.compile_templates(s, a.out, a.langs, a.ref, a.check))
+
+    p = sub.add_parser('keys', help='print flattened dotted keys, optionally by prefix')
+    p.add_argument('prefixes', nargs='*', help="string prefixes such as 'admin.visa.'")
+    p.add_argument('--values', action='store_true', help='print values too')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.keys(s, a.prefixes, a.langs, a.values))
+
+    p = sub.add_parser('search', help='find keys by their key or value text, in any locale')
+    p.add_argument('query', nargs='+', help="words or CJK text, e.g. '选择城市' or 'select city'")
+    p.add_argument('--limit', type=int, default=20, help='results to print, 0 for all (default: %(default)s)')
+    p.add_argument('--exact', action='store_true', help='no fuzzy matching of misspelt words')
+    p.add_argument('--json', action='store_true', help='print machine-readable results')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.search(s, ' '.join(a.query), a.langs, a.limit, not a.exact, a.json))
+
+    p = sub.add_parser('audit', help='report keys used in the sources but missing from the locales')
+    p.add_argument('sources', nargs='*', help='files or directories relative to the repo root (default: src)')
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.audit(s, a.sources, a.langs, a.workers))
+
+    p = sub.add_parser('missing', help='write a nested report of missing keys and a patch to fill them')
+    p.add_argument('sources', nargs='*', help='files or directories relative to the repo root (default: src)')
+    p.add_argument('--out', default=MISSING_REPORT_FILE,
+                   help="report file relative to the repo root, '-' for stdout (default: %(default)s)")
+    p.add_argument('--patch', metavar='FILE',
+                   help="also write a patch that adds every missing key, '-' for stdout")
+    p.add_argument('--fallback', metavar='LANG',
+                   help='fill the patch with values from this locale instead of [MISSING] markers')
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.missing(s, a.out, a.patch, a.fallback, a.sources, a.langs, a.workers))
+
+    p = sub.add_parser('translate', help='machine-translate leaves that are missing or still in English')
+    p.add_argument('--lang', default='zh', help='locale to fill (default: %(default)s)')
+    p.add_argument('--ref', help='locale to translate from (default: the --reference locale)')
+    p.add_argument('--backend', choices=BACKENDS, default='http',
+                   help="translation backend; 'fake' runs a local stand-in server (default: %(default)s)")
+    p.add_argument('--url', help='endpoint of the http backend (LibreTranslate API)')
+    p.add_argument('--api-key', help=f'API key for the http backend (default: ${API_KEY_ENV})')
+    p.add_argument('--memory', metavar='FILE',
+                   help='SQLite translation memory (default: .i18n_cache/translation_memory.sqlite; '
+                        'an in-memory one for the fake backend)')
+    p.add_argument('--concurrency', type=int, default=CONCURRENCY, help='requests in flight (default: %(default)s)')
+    p.add_argument('--rate', type=float, default=RATE, help='requests per second (default: %(default)s)')
+    p.set_defaults(run=lambda s, a: ops.translate(s, a.lang, a.ref, a.backend, a.url, a.api_key, a.memory,
+                                                  a.concurrency, a.rate))
+
+    p = sub.add_parser('hardcoded', help='report untranslated JSX text, text props and toast messages')
+    p.add_argument('sources', nargs='*', help='files or directories relative to the repo root (default: src)')
+    p.add_argument('--out', default=HARDCODED_FILE, help='report file relative to the repo root (default: %(default)s)')
+    p.add_argument('--check', action='store_true', help='exit 1 if the report is out of date instead of writing it')
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.hardcoded(s, a.out, a.sources, a.workers, a.check))
+
+    p = sub.add_parser('patterns', help='resolve template-literal keys such as t(`jobTypes.${type}`)')
+    p.add_argument('sources', nargs='*', help='files or directories relative to the repo root (default: src)')
+    p.add_argument('--bind', action='append', default=[], metavar='PATTERN=ENUM',
+                   help='check PATTERN against the values of ENUM (repeatable)')
+    p.add_argument('--enums-from', action='append', metavar='DIR',
+                   help='directories to read unions and constant arrays from (default: %s)' % ', '.join(ENUM_DIRS))
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.patterns(
+        s, a.sources, a.langs, dict(b.split('=', 1) for b in a.bind), a.enums_from or ENUM_DIRS, a.workers))
+
+    p = sub.add_parser('chunks', help='split locales into per-namespace chunks with a route manifest')
+    p.add_argument('--out', default=CHUNKS_DIR, help='output directory relative to the repo root (default: %(default)s)')
+    p.add_argument('--prune', action='store_true', help='leave out the keys reported by unused')
+    add_pin_options(p)
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.chunks(s, a.out, a.langs, a.workers, a.prune, a.pins, a.pin))
+
+    p = sub.add_parser('unused', help='report locale keys nothing in src/ can reach, with their byte cost')
+    p.add_argument('--limit', type=int, help='show only the N largest dead subtrees')
+    add_pin_options(p)
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.unused(s, a.langs, a.pins, a.pin, a.workers, a.limit))
+
+    p = sub.add_parser('prune', help='write production bundles without the unused keys')
+    p.add_argument('--out', default=PRUNED_DIR, help='output directory relative to the repo root (default: %(default)s)')
+    add_pin_options(p)
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.prune(s, a.out, a.langs, a.pins, a.pin, a.workers))
+
+    p = sub.add_parser('fix', help='apply built-in fixes',
+                       epilog='\n'.join(f'{name}: {f.help}' for name, f in FIXES.items()),
+                       formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument('names', nargs='+', choices=sorted(FIXES), metavar='NAME')
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.fix(s, a.names, a.langs, a.workers))
+
+    p = sub.add_parser('patch', help='apply declarative merge patches (JSON or YAML) in one transaction')
+    p.add_argument('files', nargs='+', help='patch files or directories relative to the repo root')
+    p.add_argument('--strict', action='store_true', help='write nothing if any patch hits a conflict')
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.patch(s, a.files, a.langs, a.strict, a.workers))
+
+    p = sub.add_parser('move', help='move a subtree to another dotted path')
+    p.add_argument('src')
+    p.add_argument('dst')
+    add_tree_options(p)
+    p.set_defaults(run=lambda s, a: ops.edit_tree(s, 'move', a.src, a.dst, a.langs, a.exists, a.optional))
+
+    p = sub.add_parser('copy', help='copy a subtree to another dotted path')
+    p.add_argument('src')
+    p.add_argument('dst')
+    add_tree_options(p)
+    p.set_defaults(run=lambda s, a: ops.edit_tree(s, 'copy', a.src, a.dst, a.langs, a.exists, a.optional))
+
+    p = sub.add_parser('rename', help='rename the last segment of a dotted path in place')
+    p.add_argument('path')
+    p.add_argument('new_key')
+    add_tree_options(p, exists=False)
+    p.set_defaults(run=lambda s, a: ops.edit_tree(s, 'rename', a.path, a.new_key, a.langs, optional=a.optional))
+
+    p = sub.add_parser('delete', help='delete a key or subtree')
+    p.add_argument('path')
+    add_tree_options(p, exists=False)
+    p.set_defaults(run=lambda s, a: ops.edit_tree(s, 'delete', a.path, None, a.langs, optional=a.optional))
+
+    p = sub.add_parser('codemod', help='rename translation keys in the TypeScript sources')
+    p.add_argument('renames', nargs='*', metavar='OLD=NEW',
+                   help="a key (and everything below it) to rename; a bare one-segment literal such as 'admin' "
+                        "is left alone, only the keys below it are renamed. Literals outside t() and i18nKey are "
+                        "renamed only if the reference locale has them")
+    p.add_argument('--map', action='append', default=[], metavar='FILE',
+                   help='JSON object of renames relative to the repo root (repeatable)')
+    p.add_argument('--src', action='append', default=[], metavar='PATH',
+                   help='files or directories relative to the repo root (default: src)')
+    add_workers_option(p)
+    p.set_defaults(run=run_codemod)
+
+    p = sub.add_parser('normalize', help='rewrite locales in the canonical indent=2 layout')
+    add_lang_option(p)
+    p.set_defaults(run=lambda s, a: ops.normalize(s, a.langs))
+
+    p = sub.add_parser('watch', help='stay resident and re-check locales and sources on every save')
+    p.add_argument('--ref', help='reference locale for mismatched keys (default: the --reference locale)')
+    p.add_argument('--poll', action='store_true', help='poll file stats instead of using inotify')
+    add_lang_option(p)
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.watch(s, a.langs, a.ref, a.poll, a.workers), resident=True)
+
+    p = sub.add_parser('bench', help='time the tooling on synthetic locales and TSX trees')
+    p.add_argument('--sizes', default=','.join(map(str, SIZES)), metavar='N,N,...',
+                   help='leaf counts of the generated locales (default: %(default)s)')
+    p.add_argument('--phase', action='append', dest='phases', choices=PHASES, metavar='PHASE',
+                   help='run only this phase: %s (repeatable)' % ', '.join(PHASES))
+    p.add_argument('--repeat', type=int, default=3, help='runs per case, the best is kept (default: %(default)s)')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--out', default=RESULTS_FILE, help='results file relative to the repo root (default: %(default)s)')
+    p.add_argument('--baseline', metavar='FILE', help='earlier results file to check for regressions')
+    p.add_argument('--threshold', type=float, default=0.2,
+                   help='fail if a case is this much slower than the baseline (default: %(default)s)')
+    add_workers_option(p)
+    p.set_defaults(run=lambda s, a: ops.bench(
+        s, [int(n) for n in a.sizes.split(',')], a.phases or PHASES, a.repeat, a.workers, a.seed,
+        a.out, a.baseline, a.threshold))
+
+    return parser
+
+
+def stdout_outputs(args):
+    """How many of a command's outputs go to stdout (``-``)."""
+    return sum(getattr(args, name, None) == '-' for name in ('out', 'patch'))
+
+
+def split_chain(argv):
+    segments = [[]]
+    for arg in argv:
+        if arg == CHAIN:
+            segments.append([])
+        else:
+            segments[-1].append(arg)
+    return [s for s in segments if s]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    segments = split_chain(argv) or [[]]
+    first = parser.parse_args(segments[0])
+    # Global options go before the first command; later segments share them.
+    commands = [first] + [parser.parse_args(s) for s in segments[1:]]
+    if len(commands) > 1 and any(getattr(a, 'resident', False) for a in commands):
+        parser.error('watch runs until interrupted and cannot be chained')
+    streams = sum(stdout_outputs(a) for a in commands)
+    if streams > 1:
+        parser.error("only one output can go to stdout ('-')")
+
+    try:
+        registry = LocaleRegistry(first.locales_dir, first.reference)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if first.locales:
+        langs = first.locales.split(',')
+        reference = first.reference or (REFERENCE_LOCALE if REFERENCE_LOCALE in langs else langs[0])
+    else:
+        langs, reference = registry.langs, registry.reference
+    store = LocaleStore(langs, first.locales_dir, reference)
+    # Messages go to stderr while a report is streamed to stdout, so it stays parseable.
+    log = functools.partial(print, file=sys.stderr) if streams else print
+    session = ops.Session(store, first.root, log, dry_run=first.dry_run, use_cache=not first.no_cache,
+                          registry=registry)
+    tracer = trace.enable(first.trace_memory) if first.profile or first.trace else None
+    status = 0
+    try:
+        if getattr(first, 'resident', False):
+            # Read-only and never exits: holding the lock would block every other tool.
+            return first.run(session, first)
+        # Held from the first read to the last write, so concurrent runs cannot lose updates.
+        with locale_lock(first.locales_dir):
+            for args in commands:
+                with trace.span(args.command):
+                    status = max(status, args.run(session, args) or 0)
+            with trace.span('commit'):
+                session.commit()
+    except (LocaleError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        status = 2
+    finally:
+        if tracer is not None:
+            report(trace.disable(), first)
+    return status
+
+
+def report(tracer, args):
+    if args.trace:
+        atomic_write(args.trace, json.dumps(tracer.chrome_trace()))
+        print(f"Wrote trace {args.trace}", file=sys.stderr)
+    if args.profile:
+        for line in ops.profile_table(tracer, args.root):
+            print(line, file=sys.stderr)
@@ -0,0 +1,166 @@
+"""Key renames across the TypeScript sources.
+
+A rename map ``{old key: new key}`` of any size is compiled into one trie
+over key segments. Each file is tokenized once; only string literals and the
+leading static part of template literals are candidates, and each is matched
+against the trie from its first character. Because a candidate must be a
+whole literal (or the head of one), anchoring the multi-pattern match at
+literal starts takes the place of Aho-Corasick failure links: every file is
+still scanned once, whatever the number of renames.
+
+The longest renamed prefix wins, and a rename also applies below the key:
+with ``onboarding -> auPair.onboarding``, ``'onboarding.title'`` becomes
+``'auPair.onboarding.title'`` and ``t(`onboarding.steps.${n}`)`` becomes
+``t(`auPair.onboarding.steps.${n}`)``. A bare single-segment literal such
+as ``'admin'`` is left alone, since it is far more often a role or a route
+than a key.
+
+Only key references are renamed. The first argument of ``t()`` and an
+``i18nKey`` always are; any other literal, such as ``labelKey:
+'onboarding.title'``, only if ``keys`` (the paths of the reference locale)
+has it under its old or its new name. File names, routes and config
+strings that merely look like keys, such as ``'onboarding.tsx'``, stay.
+"""
+import collections
+import difflib
+import functools
+import json
+import os
+import re
+
+from . import trace
+from .extract import scan_template
+from .parallel import map_files
+
+# Comments are matched so that quotes inside them do not open a literal.
+LITERAL_RE = re.compile(r'''
+    //[^\n]*
+  | /\*.*?\*/
+  | (?P<q>['"])(?P<s>(?:\\.|(?!(?P=q))[^\\\n])*)(?P=q)
+  | (?P<t>`)
+''', re.VERBOSE | re.DOTALL)
+KEY_RE = re.compile(r'[\w-]+(?:\.[\w-]+)*\.?')
+# What precedes a literal that is a key by position: ``t(`` or ``i18nKey=``.
+KEY_CONTEXT_RE = re.compile(r'(?:(?<![\w$.])(?:(?:i18n|i18next)\.)?t\(|\bi18nKey\s*=\s*\{?)\s*$')
+CONTEXT_WINDOW = 40
+
+Rewrite = collections.namedtuple('Rewrite', 'path text count')
+
+_END = ''
+
+
+def build_trie(renames):
+    """Nested ``{segment: subtrie}`` dicts; ``_END`` holds the new key."""
+    trie = {}
+    for old, new in renames.items():
+        node = trie
+        for part in old.split('.'):
+            node = node.setdefault(part, {})
+        node[_END] = new
+    return trie
+
+
+def rename_key(trie, key):
+    """``key`` with its longest renamed prefix replaced, or ``None``."""
+    parts = key.split('.')
+    node = trie
+    found = None
+    for i, part in enumerate(parts):
+        node = node.get(part)
+        if node is None:
+            break
+        if _END in node:
+            found = i
+            new = node[_END]
+    if found is None or (found == 0 and len(parts) == 1):
+        return None
+    rest = parts[found + 1:]
+    return '.'.join([new, *rest]) if rest else new
+
+
+def _known(keys, old, new, partial):
+    """True if ``old`` or ``new`` is a path in ``keys``; for a partial last segment, its parent object."""
+    if partial:
+        old, new = old.rpartition('.')[0], new.rpartition('.')[0]
+    return old in keys or new in keys
+
+
+def rewrite_text(text, trie, keys=None):
+    """``(new text, replacements)`` for one source file.
+
+    Outside ``t()`` and ``i18nKey`` a literal is only renamed if it is in
+    ``keys`` (see the module docstring); with ``keys=None``, never.
+    """
+    out = []
+    last = 0
+    count = 0
+    pos = 0
+    while True:
+        m = LITERAL_RE.search(text, pos)
+        if m is None:
+            break
+        pos = m.end()
+        if m.group('s') is not None:
+            start, end = m.span('s')
+            partial = False
+        elif m.group('t') is not None:
+            parts = scan_template(text, m.start())
+            if parts is None:
+                continue
+            start = m.end()
+            end = start + len(parts[0][0])
+            pos = parts[2]
+            partial = len(parts[0]) > 1
+        else:
+            continue
+        k = KEY_RE.match(text, start, end)
+        if k is None or k.end() != end:
+            continue
+        key = k.group(0)
+        new = rename_key(trie, key.rstrip('.'))
+        if new is None:
+            continue
+        if KEY_CONTEXT_RE.search(text, max(0, m.start() - CONTEXT_WINDOW), m.start()) is None:
+            if keys is None or not _known(keys, key.rstrip('.'), new, partial and not key.endswith('.')):
+                continue
+        if key.endswith('.'):
+            new += '.'
+        out.append(text[last:start])
+        out.append(new)
+        last = end
+        count += 1
+    if not count:
+        return text, 0
+    out.append(text[last:])
+    return ''.join(out), count
+
+
+def _rewrite_file(trie, keys, path):
+    with trace.span('read'), open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+        trace.add_bytes(read=os.fstat(f.fileno()).st_size)
+    with trace.span('scan'):
+        new, count = rewrite_text(text, trie, keys)
+    return Rewrite(path, new if count else None, count)
+
+
+def rewrite_files(paths, renames, workers=None, keys=None):
+    """``Rewrite(path, text, count)`` for every file in ``paths`` that changes."""
+    func = functools.partial(_rewrite_file, build_trie(renames), keys)
+    return [r for r in map_files(func, paths, workers) if r.count]
+
+
+def unified_diff(old, new, name):
+    return ''.join(difflib.unified_diff(old.splitlines(True), new.splitlines(True), f'a/{name}', f'b/{name}'))
+
+
+def load_renames(path):
+    """A rename map file: a JSON object from old key to new key."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            renames = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'{path}: {e}') from e
+    if not isinstance(renames, dict) or not all(isinstance(v, str) and v for v in renames.values()):
+        raise ValueError(f'{path}: expected an object mapping old keys to new keys')
+    return renames
@@ -0,0 +1,96 @@
+"""Structural diff of locales against a reference locale.
+
+Each locale is compared with the reference through their ``FlatIndex``es in
+one pass over each side's paths, and the result is one of:
+
+``missing``   a leaf of the reference is absent from the locale
+``extra``     a leaf of the locale is absent from the reference
+``conflict``  a path is a string in one locale and an object in the other
+``type``      both are leaves, but of different JSON types
+
+Below a conflict the two sides cannot be compared, so those paths are not
+reported again as missing or extra.
+"""
+import collections
+
+KINDS = ('missing', 'extra', 'conflict', 'type')
+
+Difference = collections.namedtuple('Difference', 'kind path lang expected actual')
+
+
+def type_name(value):
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, list):
+        return 'array'
+    return 'null'
+
+
+def _under_leaf(path, index):
+    """True if a proper ancestor of ``path`` is a leaf of ``index``."""
+    end = path.rfind('.')
+    while end > 0:
+        if path[:end] in index.values:
+            return True
+        end = path.rfind('.', 0, end)
+    return False
+
+
+def diff_index(ref, other, lang):
+    """Differences of ``other`` (the locale ``lang``) relative to ``ref``, sorted by path."""
+    out = []
+    for path, value in ref.values.items():
+        if path in other.values:
+            theirs = other.values[path]
+            if type_name(value) != type_name(theirs):
+                out.append(Difference('type', path, lang, type_name(value), type_name(theirs)))
+        elif path in other.branches:
+            out.append(Difference('conflict', path, lang, type_name(value), 'object'))
+        elif not _under_leaf(path, other):
+            out.append(Difference('missing', path, lang, type_name(value), None))
+    for path, value in other.values.items():
+        if path in ref.values:
+            continue
+        if path in ref.branches:
+            out.append(Difference('conflict', path, lang, 'object', type_name(value)))
+        elif not _under_leaf(path, ref):
+            out.append(Difference('extra', path, lang, None, type_name(value)))
+    out.sort(key=lambda d: (d.path, d.kind))
+    return out
+
+
+def diff_locales(indexes, reference):
+    """``{lang: [Difference]}`` for every locale in ``indexes`` except ``reference``."""
+    ref = indexes[reference]
+    return {lang: diff_index(ref, index, lang) for lang, index in indexes.items() if lang != reference}
+
+
+def diff_locale(ref, lang, locale):
+    """``diff_index`` of the ``FlatIndex`` ``locale`` against ``ref``; a ``LocaleStore.map`` task."""
+    return diff_index(ref, locale, lang)
+
+
+def summarize(diffs):
+    """``{lang: {kind: count}}`` with every kind present."""
+    out = {}
+    for lang, items in diffs.items():
+        counts = dict.fromkeys(KINDS, 0)
+        for d in items:
+            counts[d.kind] += 1
+        out[lang] = counts
+    return out
+
+
+def diff_report(diffs, reference):
+    """JSON-serializable form of ``diff_locales`` output for CI."""
+    return {
+        'reference': reference,
+        'summary': summarize(diffs),
+        'differences': [d._asdict() for items in diffs.values() for d in items],
+    }
@@ -0,0 +1,75 @@
+"""Same-object duplicate member detection in one pass over the raw JSON text.
+
+A key is only a duplicate when it repeats inside the same object; the same
+name under different parents (every ``"title"`` in the tree) is not reported.
+"""
+import collections
+
+from .scanner import ERROR, PUNCT, STRING, decode_string, iter_tokens, join_path
+
+Duplicate = collections.namedtuple('Duplicate', 'path first second')
+
+
+class ScanError(ValueError):
+    def __init__(self, msg, line, col):
+        self.msg = msg
+        self.line = line
+        self.col = col
+        super().__init__(f'{msg}: line {line} column {col}')
+
+
+class _Frame:
+    __slots__ = ('path', 'is_object', 'seen', 'expect_key', 'key', 'index')
+
+    def __init__(self, path, is_object):
+        self.path = path
+        self.is_object = is_object
+        self.seen = {} if is_object else None
+        self.expect_key = is_object
+        self.key = None
+        self.index = 0
+
+    def child_path(self):
+        return join_path(self.path, self.key if self.is_object else self.index)
+
+
+def find_duplicates(text):
+    """Yield a ``Duplicate`` for every repeated member of the same object.
+
+    ``first`` and ``second`` are ``(line, col)`` of the earlier and the later
+    key; ``json.load`` keeps the value of ``second``. Each repeat after the
+    first is reported against the first occurrence.
+    """
+    stack = []
+    for kind, start, end, line, col in iter_tokens(text):
+        top = stack[-1] if stack else None
+        if kind == STRING and top is not None and top.expect_key:
+            key = decode_string(text, start, end)
+            first = top.seen.setdefault(key, (line, col))
+            if first != (line, col):
+                yield Duplicate(join_path(top.path, key), first, (line, col))
+            top.key = key
+            top.expect_key = False
+        elif kind == PUNCT:
+            c = text[start]
+            if c in '{[':
+                path = top.child_path() if top is not None else ''
+                stack.append(_Frame(path, c == '{'))
+            elif c in '}]':
+                if not stack:
+                    raise ScanError(f"Unexpected '{c}'", line, col)
+                stack.pop()
+            elif c == ',' and top is not None:
+                if top.is_object:
+                    top.expect_key = True
+                else:
+                    top.index += 1
+        elif kind == ERROR:
+            raise ScanError(f'Unexpected character {text[start]!r}', line, col)
+    if stack:
+        raise ScanError('Unexpected end of file', *_end_position(text))
+
+
+def _end_position(text):
+    line = text.count('\n') + 1
+    return line, len(text) - (text.rfind('\n') + 1) + 1
@@ -0,0 +1,133 @@
+"""Resolution of template-literal key patterns against a locale index.
+
+``t(`admin.visa.status.${app.status}`)`` is recorded by the extractor as the
+pattern ``admin.visa.status.*``. Each ``*`` stands for one or more characters
+within a single key segment. Patterns are resolved in one batch: sorted by
+their static prefix, each one is narrowed to a slice of the index's sorted
+key list by bisection, and only that slice is matched against the regex.
+
+String-literal union types and constant arrays from the TypeScript sources
+serve as enums: when a pattern's expression is bound to an enum, the keys it
+can produce are known, and the ones missing from a locale can be reported.
+"""
+import collections
+import os
+import re
+
+from .extract import WILDCARD, iter_source_files
+from .paths import ROOT
+
+ENUM_DIRS = ('src/types', 'src/constants', 'src/services')
+
+UNION_RE = re.compile(r"""\btype\s+(\w+)\s*=\s*((?:\s*\|?\s*(['"])[^'"\n]*\3)+)\s*;""")
+UNION_MEMBER_RE = re.compile(r"""(['"])([^'"\n]*)\1""")
+CONST_ARRAY_RE = re.compile(r'\bexport\s+const\s+(\w+)\s*(?::\s*[\w<>\[\]]+\s*)?=\s*\[')
+ARRAY_ITEM_RE = re.compile(r"""
+    \b(?:value|id|code)\s*:\s*(?P<vq>['"])(?P<v>[^'"\n]*)(?P=vq)
+  | (?P<q>['"])(?P<s>[^'"\n]*)(?P=q)
+  | (?P<open>[\[{])
+  | (?P<close>[\]}])
+""", re.VERBOSE)
+EXPR_NAME_RE = re.compile(r'(?:^|\.)(\w+)$')
+
+Resolution = collections.namedtuple('Resolution', 'pattern keys candidates missing')
+
+
+def pattern_prefix(pattern):
+    return pattern.split(WILDCARD, 1)[0]
+
+
+def pattern_regex(pattern):
+    return re.compile('[^.]+'.join(re.escape(part) for part in pattern.split(WILDCARD)))
+
+
+def resolve_patterns(patterns, index):
+    """Map each pattern to the sorted leaf keys of ``index`` it matches."""
+    resolved = {}
+    for pattern in sorted(set(patterns), key=pattern_prefix):
+        regex = pattern_regex(pattern)
+        resolved[pattern] = [k for k in index.with_prefix(pattern_prefix(pattern)) if regex.fullmatch(k)]
+    return resolved
+
+
+def _array_values(text, start):
+    """Strings directly in the array opening before ``start`` or in its objects' value/id/code."""
+    values = []
+    depth = 1
+    for m in ARRAY_ITEM_RE.finditer(text, start):
+        if m.group('open'):
+            depth += 1
+        elif m.group('close'):
+            depth -= 1
+            if depth == 0:
+                break
+        elif m.group('s') is not None and depth == 1:
+            values.append(m.group('s'))
+        elif m.group('v') is not None and depth == 2:
+            values.append(m.group('v'))
+    return values
+
+
+def enums_from_text(text):
+    enums = {}
+    for m in UNION_RE.finditer(text):
+        enums[m.group(1)] = [v for _, v in UNION_MEMBER_RE.findall(m.group(2))]
+    for m in CONST_ARRAY_RE.finditer(text):
+        values = _array_values(text, m.end())
+        if values:
+            enums[m.group(1)] = values
+    return enums
+
+
+def load_enums(dirs=ENUM_DIRS, root=ROOT):
+    """``{name: [values]}`` for the unions and constant arrays under ``dirs``."""
+    enums = {}
+    for d in dirs:
+        for path in iter_source_files(os.path.join(root, d)):
+            with open(path, 'r', encoding='utf-8') as f:
+                enums.update(enums_from_text(f.read()))
+    return enums
+
+
+def _normalize(name):
+    return name.lower().replace('_', '')
+
+
+def guess_enum(expr, enums):
+    """Enum whose name matches the expression's last identifier (``visa_type`` -> ``VisaType``)."""
+    m = EXPR_NAME_RE.search(expr.replace('.toLowerCase()', ''))
+    if m is None:
+        return None
+    wanted = _normalize(m.group(1))
+    for name in enums:
+        if _normalize(name) == wanted:
+            return name
+    return None
+
+
+def candidate_keys(pattern, expr, values):
+    if '.toLowerCase()' in expr:
+        values = [v.lower() for v in values]
+    return [pattern.replace(WILDCARD, v) for v in values]
+
+
+def check_patterns(usages, index, enums=None, bindings=None):
+    """Resolve every pattern in ``usages`` and check bound enum candidates.
+
+    ``bindings`` maps a pattern to an enum name; unbound single-wildcard
+    patterns fall back to ``guess_enum``. Returns ``{pattern: Resolution}``.
+    """
+    enums = enums or {}
+    bindings = bindings or {}
+    patterns = [k for k in usages if WILDCARD in k]
+    out = {}
+    for pattern, keys in resolve_patterns(patterns, index).items():
+        candidates = missing = None
+        if pattern.count(WILDCARD) == 1:
+            expr = usages[pattern][0].exprs[0] if usages[pattern][0].exprs else ''
+            name = bindings.get(pattern) or guess_enum(expr, enums)
+            if name in enums:
+                candidates = candidate_keys(pattern, expr, enums[name])
+                missing = [k for k in candidates if k not in index]
+        out[pattern] = Resolution(pattern, keys, candidates, missing)
+    return out
@@ -0,0 +1,260 @@
+"""Translation key extraction from the TypeScript sources under src/.
+
+Recognised forms::
+
+    t('key')   t("key")   t(`key`)   i18n.t('key')
+    t('key', 'Default')   t('key', { defaultValue: 'Default' })   t('key') || 'Default'
+    <Trans i18nKey="key">   <Trans i18nKey={'key'} defaults="Default">
+    t(`admin.visa.status.${app.status}`)
+
+Template literals with ``${...}`` become key patterns such as
+``admin.visa.status.*`` (see ``dynamic.py``); their usages carry the source
+of each interpolated expression.
+
+Files are spread over a process pool and the per-file results are merged into
+one ``key -> [Usage]`` index. Per-file results can be kept in a ``FileCache``
+so a re-run only re-tokenizes the files that changed.
+"""
+import bisect
+import collections
+import os
+import re
+
+from . import trace
+from .cache import FileCache, digest
+from .parallel import map_files
+from .paths import ROOT, SRC_DIR, rel
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx')
+# Bump whenever extract_text() can return something different for the same file.
+EXTRACT_VERSION = 2
+
+WILDCARD = '*'
+
+Usage = collections.namedtuple('Usage', 'key path line col default exprs', defaults=(None,))
+
+_STR = r'''(?P<{0}q>['"`])(?P<{0}>(?:\\.|(?!(?P={0}q))[^\\\n])*)(?P={0}q)'''
+
+CALL_RE = re.compile(r'''
+    (?<![\w$.])(?:(?:i18n|i18next)\.)?t\(\s*
+    (?:(?P<q>['"])(?P<key>(?:\\.|(?!(?P=q))[^\\\n])+)(?P=q) | `(?P<tkey>[^`$\\\n]+)`)
+    (?:
+        \s*,\s*(?:{arg}|\{{[^{{}}]*?\bdefaultValue\s*:\s*{opt})
+      | \s*\)\s*\|\|\s*{alt}
+    )?
+'''.format(arg=_STR.format('arg'), opt=_STR.format('opt'), alt=_STR.format('alt')), re.VERBOSE)
+
+TRANS_TAG_RE = re.compile(r'''<Trans\b(?:[^>"'{}]|"[^"]*"|'[^']*'|\{(?:[^{}]|\{[^{}]*\})*\})*>''')
+TRANS_KEY_RE = re.compile(r'\bi18nKey\s*=\s*\{?\s*([\'"`])([^\'"`\\\n]+)\1')
+TRANS_DEFAULTS_RE = re.compile(r'\bdefaults\s*=\s*\{?\s*([\'"`])((?:\\.|(?!\1)[^\\\n])*)\1')
+ESCAPE_RE = re.compile(r'\\(.)')
+TEMPLATE_CALL_RE = re.compile(r'(?<![\w$.])(?:(?:i18n|i18next)\.)?t\(\s*`')
+PATTERN_RE = re.compile(r'[\w.\-*]+')
+# Key-shaped literals anywhere in the code, e.g. ``label: 'admin.sidebar.users'``.
+REFERENCE_RE = re.compile(r'''(['"`])([\w-]+(?:\.[\w-]+)+)\1''')
+REFERENCE_TEMPLATE_RE = re.compile(r'`(?=[\w-]+\.[\w.-]*\$\{)')
+# Bump whenever references_text() can return something different for the same file.
+REFERENCES_VERSION = 1
+
+
+def unescape(s):
+    """Undo JS backslash escapes well enough for keys and default texts."""
+    return ESCAPE_RE.sub(r'\1', s) if s and '\\' in s else s
+
+
+class LineIndex:
+    """Maps string offsets to 1-based (line, col) with a bisect over newline offsets."""
+
+    def __init__(self, text):
+        self.starts = [0]
+        self.starts.extend(m.end() for m in re.finditer('\n', text))
+
+    def position(self, offset):
+        i = bisect.bisect_right(self.starts, offset) - 1
+        return i + 1, offset - self.starts[i] + 1
+
+
+def scan_template(text, start):
+    """Split the template literal opening at ``text[start]`` into parts.
+
+    Returns ``(statics, exprs, end)``: the literal chunks, the source of each
+    ``${...}`` between them, and the offset after the closing backtick, or
+    ``None`` if the template is unterminated. Braces are counted inside
+    expressions so nested objects and templates do not end them early.
+    """
+    statics, exprs = [], []
+    chunk = start + 1
+    i = chunk
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            statics.append(text[chunk:i])
+            return statics, exprs, i + 1
+        if c == '$' and text.startswith('{', i + 1):
+            statics.append(text[chunk:i])
+            depth = 1
+            j = i + 2
+            while j < n and depth:
+                if text[j] == '{':
+                    depth += 1
+                elif text[j] == '}':
+                    depth -= 1
+                j += 1
+            if depth:
+                return None
+            exprs.append(text[i + 2:j - 1].strip())
+            chunk = i = j
+            continue
+        i += 1
+    return None
+
+
+def template_pattern(statics):
+    """``admin.visa.status.*`` for ``admin.visa.status.${x}``; ``None`` for prose."""
+    pattern = WILDCARD.join(statics)
+    return pattern if PATTERN_RE.fullmatch(pattern) else None
+
+
+def extract_text(text):
+    """Return ``[(key, line, col, default, exprs)]`` for every key reference in ``text``.
+
+    ``exprs`` is ``None`` for literal keys and the tuple of interpolated
+    expressions for template patterns.
+    """
+    found = []
+    lines = LineIndex(text)
+    for m in CALL_RE.finditer(text):
+        key = unescape(m.group('key')) or m.group('tkey')
+        default = unescape(m.group('arg') or m.group('opt') or m.group('alt'))
+        found.append((key, *lines.position(m.start()), default, None))
+    for m in TEMPLATE_CALL_RE.finditer(text):
+        parts = scan_template(text, m.end() - 1)
+        if parts is None or not parts[1]:
+            continue
+        pattern = template_pattern(parts[0])
+        if pattern is not None:
+            found.append((pattern, *lines.position(m.start()), None, tuple(parts[1])))
+    for m in TRANS_TAG_RE.finditer(text):
+        k = TRANS_KEY_RE.search(m.group(0))
+        if k is None:
+            continue
+        d = TRANS_DEFAULTS_RE.search(m.group(0))
+        found.append((k.group(2), *lines.position(m.start()), unescape(d.group(2)) if d else None, None))
+    found.sort(key=lambda u: (u[1], u[2]))
+    return found
+
+
+def references_text(text):
+    """Sorted dotted strings and template patterns in ``text``, wherever they occur.
+
+    Keys often travel through variables (``t(item.label)``, ``const key =
+    `education.levels.${x}`; t(key)``), so anything shaped like a key may be one.
+    """
+    found = {m.group(2) for m in REFERENCE_RE.finditer(text)}
+    for m in REFERENCE_TEMPLATE_RE.finditer(text):
+        parts = scan_template(text, m.start())
+        if parts is not None:
+            pattern = template_pattern(parts[0])
+            if pattern is not None:
+                found.add(pattern)
+    return sorted(found)
+
+
+def is_pattern(key):
+    return WILDCARD in key
+
+
+def extract_file(path, root=ROOT):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    name = rel(path, root)
+    return [Usage(key, name, line, col, default, exprs)
+            for key, line, col, default, exprs in extract_text(text)]
+
+
+def iter_source_files(src_dir=SRC_DIR, extensions=SOURCE_EXTENSIONS):
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(extensions) and not name.endswith('.d.ts'):
+                yield os.path.join(dirpath, name)
+
+
+def resolve_sources(sources, root=ROOT):
+    """Expand files and directories (relative to ``root``) into source files."""
+    paths = []
+    for source in sources:
+        path = os.path.join(root, source)
+        if os.path.isdir(path):
+            paths.extend(iter_source_files(path))
+        else:
+            paths.append(path)
+    return paths
+
+
+def read_source(path):
+    with trace.span('read'), open(path, 'rb') as f:
+        data = f.read()
+        trace.add_bytes(read=len(data))
+    return data
+
+
+def scan_file(path):
+    """``(sha1, rows)`` for one file; the cacheable unit of extraction."""
+    data = read_source(path)
+    with trace.span('scan'):
+        return digest(data), extract_text(data.decode('utf-8'))
+
+
+def scan_references(path):
+    """``(sha1, references)`` for one file; see ``references_text``."""
+    data = read_source(path)
+    with trace.span('scan'):
+        return digest(data), references_text(data.decode('utf-8'))
+
+
+def merge_usages(per_file, root=ROOT):
+    """Merge ``{path: rows}`` into one ``key -> [Usage]`` index."""
+    index = {}
+    for path, rows in per_file.items():
+        name = rel(path, root)
+        for key, line, col, default, exprs in rows:
+            exprs = tuple(exprs) if exprs is not None else None
+            index.setdefault(key, []).append(Usage(key, name, line, col, default, exprs))
+    return index
+
+
+def extract_tree(src_dir=SRC_DIR, workers=None, root=ROOT, cache=None):
+    """Extract every key used under ``src_dir`` into one ``key -> [Usage]`` index."""
+    return extract_paths(list(iter_source_files(src_dir)), workers, root, cache)
+
+
+def extract_paths(paths, workers=None, root=ROOT, cache=None):
+    """Key index for ``paths``; with a ``FileCache`` only changed files are re-scanned."""
+    if cache is not None:
+        per_file = cache.resolve(paths, scan_file, workers)
+    else:
+        per_file = dict(zip(paths, (rows for _, rows in map_files(scan_file, paths, workers))))
+    with trace.span('merge'):
+        return merge_usages(per_file, root)
+
+
+def extraction_cache(root=ROOT):
+    return FileCache('extract', EXTRACT_VERSION, root=root)
+
+
+def references_cache(root=ROOT):
+    return FileCache('references', REFERENCES_VERSION, root=root)
+
+
+def reference_paths(paths, workers=None, cache=None):
+    """Union of ``references_text`` over ``paths``."""
+    if cache is not None:
+        per_file = cache.resolve(paths, scan_references, workers).values()
+    else:
+        per_file = (refs for _, refs in map_files(scan_references, paths, workers))
+    return set().union(*per_file)
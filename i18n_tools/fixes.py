@@ -0,0 +1,48 @@
+"""Built-in locale fixes, ported from the one-off fix_*_keys.py scripts.
+
+Each fix is the patch file ``patches/<name>.json`` (see ``patch.py``), whose
+merge semantics reproduce the script it replaces, plus an optional step run
+after the patch, such as rewriting the components that use the moved keys.
+"""
+import collections
+import os
+
+from .atomic import atomic_write
+from .codemod import rewrite_files
+from .extract import iter_source_files
+from .paths import rel
+
+Fix = collections.namedtuple('Fix', 'help after')
+
+LOCATION_RENAMES = {
+    'onboarding.country': 'common.location.country',
+    'onboarding.selectCountry': 'common.location.selectCountry',
+    'onboarding.province': 'common.location.province',
+    'onboarding.selectProvince': 'common.location.selectProvince',
+    'onboarding.city': 'common.location.city',
+    'onboarding.selectCity': 'common.location.selectCity',
+    'onboarding.otherCity': 'common.location.otherCity',
+    'onboarding.enterCityName': 'common.location.enterCityName',
+}
+
+
+def rewrite_location_references(session):
+    """Point every reference in src/ at the moved keys (see ``codemod.py``)."""
+    paths = list(iter_source_files(os.path.join(session.root, 'src')))
+    for r in rewrite_files(paths, LOCATION_RENAMES):
+        name = rel(r.path, session.root)
+        if session.dry_run:
+            session.log(f"Would update {name}")
+            continue
+        atomic_write(r.path, r.text)
+        session.log(f"{name} updated.")
+
+
+FIXES = {
+    'au-pair-onboarding': Fix('overwrite auPair.onboarding with the AuPairOnboarding.tsx texts', None),
+    'host-family': Fix('fill missing HostFamilyOnboarding.tsx keys, keeping existing values', None),
+    'general-onboarding': Fix('merge the GeneralOnboarding.tsx keys two levels deep', None),
+    'location': Fix('move location labels under common.location and update their references in src',
+                    rewrite_location_references),
+    'admin-location-column': Fix('add admin.auPair.columns.location if it is missing', None),
+}
@@ -0,0 +1,260 @@
+"""Untranslated text in the TSX sources, written to hardcoded_strings.json.
+
+A small TSX scanner walks each file once, switching between code, JSX tags
+and JSX children with an explicit stack. It reports:
+
+``JSX_TEXT``  text between tags, such as ``<p>Premium Only</p>``
+``ATTR``      a literal ``placeholder``, ``title``, ``alt``, ``aria-label``,
+              ``label`` or ``text`` prop
+``TOAST``     a string or template literal passed to ``showToast``,
+              ``toast``/``toast.*`` or ``alert``, unless it sits inside ``t()``
+
+A ``<`` opens JSX only where an expression may start (after ``(``, ``=``,
+``return``, ``&&``, ...) and only when a tag name or ``>`` follows, so
+generics and comparisons stay code. Text must contain a letter to count.
+
+Results are cached per file by content hash (see ``cache.py``) and written
+as ``{posix path: [{"type", "attr"?, "text", "line"}]}``.
+"""
+import json
+import re
+
+from .cache import FileCache, digest
+from .extract import LineIndex, read_source, scan_template
+from .paths import ROOT, rel
+
+HARDCODED_FILE = 'hardcoded_strings.json'
+HARDCODED_VERSION = 1
+TEXT_ATTRS = frozenset(('placeholder', 'title', 'alt', 'aria-label', 'aria-placeholder', 'label', 'text'))
+TOAST_CALLS = frozenset(('showToast', 'toast', 'toast.success', 'toast.error', 'toast.info', 'toast.warning',
+                         'toast.warn', 'alert', 'window.alert'))
+TRANSLATE_CALLS = frozenset(('t', 'i18n.t', 'i18next.t'))
+# Tokens after which ``<`` starts a JSX element rather than a comparison or generic.
+JSX_AFTER = frozenset(('(', ',', '=', ':', '?', '[', '{', '}', ';', '&&', '||', '??', '!', '=>',
+                       'return', 'yield', 'default', 'case', 'else'))
+
+CODE_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<str>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<tpl>`)
+  | (?P<ident>[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)
+  | (?P<num>\d[\w.]*)
+  | (?P<open>[({\[])
+  | (?P<close>[)}\]])
+  | (?P<lt><)
+  | (?P<op>=>|&&|\|\||\?\?|[^\s])
+''', re.VERBOSE | re.DOTALL)
+TAG_RE = re.compile(r'<\s*([A-Za-z_$][\w$.:-]*)?')
+ATTR_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<end>/?>)
+  | (?P<spread>\{)
+  | (?P<name>[\w$:-]+)\s*(?P<eq>=\s*)?
+''', re.VERBOSE | re.DOTALL)
+QUOTED_RE = re.compile(r''''([^']*)'|"([^"]*)"''')
+BRACED_LITERAL_RE = re.compile(r'''\{\s*(?:'((?:\\.|[^'\\\n])*)'|"((?:\\.|[^"\\\n])*)"|`([^`$\\]*)`)\s*\}''')
+CLOSE_TAG_RE = re.compile(r'</\s*[\w$.:-]*\s*>')
+ENTITY_RE = re.compile(r'&(?:#\d+|#x[0-9a-fA-F]+|\w+);')
+# Toast types ('error', 'success') and translation keys passed along with the message.
+TOAST_WORD_RE = re.compile(r'[a-z][\w.-]*')
+
+
+def _has_letter(text):
+    return any(c.isalpha() for c in ENTITY_RE.sub('', text))
+
+
+class _Code:
+    __slots__ = ('closes', 'shows', 'brackets', 'prev')
+
+    def __init__(self, closes, shows=None):
+        self.closes = closes  # True inside ``{...}`` in JSX: the matching ``}`` returns to JSX
+        self.shows = shows  # ``(kind, extra)`` when string literals here are rendered as text
+        self.brackets = []  # ``(char, call)`` per open bracket; call is 'toast', 't', 'call' or None
+        self.prev = '('
+
+
+class _Tag:
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Children:
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Scanner:
+    def __init__(self, text, jsx=True):
+        self.text = text
+        self.jsx = jsx
+        self.lines = LineIndex(text)
+        self.found = []
+
+    def add(self, kind, offset, text, **extra):
+        text = ' '.join(text.split())
+        if text and _has_letter(text):
+            row = {'type': kind}
+            row.update(extra)
+            row['text'] = text
+            row['line'] = self.lines.position(offset)[0]
+            self.found.append(row)
+
+    def run(self):
+        stack = [_Code(False)]
+        pos = 0
+        n = len(self.text)
+        while pos < n and stack:
+            top = stack[-1]
+            if isinstance(top, _Code):
+                pos = self.code(stack, top, pos)
+            elif isinstance(top, _Tag):
+                pos = self.tag(stack, top, pos)
+            else:
+                pos = self.children(stack, top, pos)
+        self.found.sort(key=lambda r: r['line'])
+        return self.found
+
+    def _call(self, frame):
+        """The innermost call the scanner is inside, if any: 'toast', 't' or 'call' for any other."""
+        for _, call in reversed(frame.brackets):
+            if call is not None:
+                return call
+        return None
+
+    def literal(self, frame, pos, value, statics=None):
+        """A string or template literal in code: a toast message, or text rendered by JSX.
+
+        ``statics`` are a template's literal chunks; only they need a letter.
+        """
+        if TOAST_WORD_RE.fullmatch(value) or (statics is not None and not _has_letter(''.join(statics))):
+            return
+        call = self._call(frame)
+        if call == 'toast':
+            self.add('TOAST', pos, value)
+        elif call is None and frame.shows is not None and frame.prev not in ('||', '??', '==', '===', '!=', '!=='):
+            # ``t('key') || 'Fallback'`` is a default, ``format(date, 'MMM d')`` an argument.
+            kind, extra = frame.shows
+            self.add(kind, pos, value, **extra)
+
+    def code(self, stack, frame, pos):
+        text = self.text
+        m = CODE_RE.match(text, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind in ('ws', 'comment'):
+            return end
+        if kind == 'str':
+            self.literal(frame, pos, m.group()[1:-1])
+        elif kind == 'tpl':
+            parts = scan_template(text, pos)
+            if parts is None:
+                return len(text)
+            end = parts[2]
+            self.literal(frame, pos, text[pos + 1:end - 1], parts[0])
+        elif kind == 'open':
+            call = None
+            if m.group() == '(':
+                prev = frame.prev
+                call = ('toast' if prev in TOAST_CALLS else 't' if prev in TRANSLATE_CALLS
+                        else 'call' if (prev[:1].isalpha() or prev[:1] in '_$') and prev not in JSX_AFTER else None)
+            frame.brackets.append((m.group(), call))
+        elif kind == 'close':
+            if frame.brackets:
+                frame.brackets.pop()
+            elif frame.closes and m.group() == '}':
+                stack.pop()
+                return end
+        elif kind == 'lt' and self.jsx and frame.prev in JSX_AFTER:
+            t = TAG_RE.match(text, pos)
+            if t.group(1) or text.startswith('>', t.end()):
+                stack.append(_Tag(t.group(1) or ''))
+                frame.prev = ')'
+                return t.end()
+        frame.prev = m.group() if kind in ('ident', 'open', 'close', 'op') else kind
+        return end
+
+    def tag(self, stack, frame, pos):
+        text = self.text
+        m = ATTR_RE.match(text, pos)
+        if m is None:  # not JSX after all; resume as code
+            stack.pop()
+            return pos
+        if m.group('end'):
+            stack.pop()
+            if m.group('end') == '>':
+                stack.append(_Children(frame.name))
+            return m.end()
+        if m.group('spread'):
+            stack.append(_Code(True))
+            return m.end()
+        if m.group('name') is None or not m.group('eq'):
+            return m.end()
+        name = m.group('name')
+        pos = m.end()
+        q = QUOTED_RE.match(text, pos)
+        if q is not None:
+            if name in TEXT_ATTRS:
+                self.add('ATTR', pos, q.group(1) if q.group(1) is not None else q.group(2), attr=name)
+            return q.end()
+        b = BRACED_LITERAL_RE.match(text, pos)
+        if b is not None:
+            if name in TEXT_ATTRS:
+                value = next(g for g in b.groups() if g is not None)
+                self.add('ATTR', pos, value, attr=name)
+            return b.end()
+        if text.startswith('{', pos):
+            stack.append(_Code(True, ('ATTR', {'attr': name}) if name in TEXT_ATTRS else None))
+            return pos + 1
+        return pos
+
+    def children(self, stack, frame, pos):
+        text = self.text
+        n = len(text)
+        i = pos
+        while i < n and text[i] not in '<{':
+            i += 1
+        if i > pos:
+            chunk = text[pos:i]
+            self.add('JSX_TEXT', pos + len(chunk) - len(chunk.lstrip()), chunk)
+        if i >= n:
+            return n
+        if text[i] == '{':
+            stack.append(_Code(True, ('JSX_TEXT', {})))
+            return i + 1
+        c = CLOSE_TAG_RE.match(text, i)
+        if c is not None:
+            stack.pop()
+            return c.end()
+        t = TAG_RE.match(text, i)
+        stack.append(_Tag(t.group(1) or ''))
+        return t.end()
+
+
+def scan_text(text, jsx=True):
+    """Findings for one file, sorted by line; ``jsx=False`` for ``.ts``, where ``<`` is never a tag."""
+    return _Scanner(text, jsx).run()
+
+
+def scan_hardcoded(path):
+    """``(sha1, findings)`` for one file; the cacheable unit."""
+    data = read_source(path)
+    return digest(data), scan_text(data.decode('utf-8'), not path.endswith('.ts'))
+
+
+def hardcoded_cache(root=ROOT):
+    return FileCache('hardcoded', HARDCODED_VERSION, root=root)
+
+
+def report(per_file, root=ROOT):
+    """``{posix path: findings}`` for the files with findings, in scan order."""
+    return {rel(path, root): rows for path, rows in per_file.items() if rows}
+
+
+def report_text(report):
+    return json.dumps(report, ensure_ascii=False, indent=2)
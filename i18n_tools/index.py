@@ -0,0 +1,91 @@
+"""Flattened dotted-path index over a parsed locale.
+
+Built once per locale: a dict from dotted leaf path to value for O(1) exact
+lookups, the set of object (branch) paths, and a sorted key list for
+O(log n) prefix and range queries. Segments are joined with ``.``, matching
+how i18next resolves keys, so a literal dot inside a key is not supported.
+"""
+import bisect
+
+
+def flatten(data):
+    """Yield ``(path, value, is_branch)`` in document order, without recursion."""
+    stack = [('', iter(data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            path = f'{prefix}{key}'
+            if isinstance(value, dict):
+                yield path, value, True
+                stack.append((path + '.', iter(value.items())))
+                break
+            yield path, value, False
+        else:
+            stack.pop()
+
+
+def _upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class FlatIndex:
+    __slots__ = ('values', 'branches', 'keys')
+
+    def __init__(self, data):
+        self.values = {}
+        self.branches = {''}
+        for path, value, is_branch in flatten(data):
+            if is_branch:
+                self.branches.add(path)
+            else:
+                self.values[path] = value
+        self.keys = sorted(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, path):
+        return path in self.values
+
+    def __iter__(self):
+        """Leaf paths in document order."""
+        return iter(self.values)
+
+    def get(self, path, default=None):
+        return self.values.get(path, default)
+
+    def is_branch(self, path):
+        return path in self.branches
+
+    def has(self, path):
+        """True if ``path`` names a leaf or an object."""
+        return path in self.values or path in self.branches
+
+    def _bounds(self, prefix):
+        if not prefix:
+            return 0, len(self.keys)
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, _upper_bound(prefix), lo)
+        return lo, hi
+
+    def with_prefix(self, prefix):
+        """Sorted leaf paths that start with the string ``prefix``."""
+        lo, hi = self._bounds(prefix)
+        return self.keys[lo:hi]
+
+    def count_prefix(self, prefix):
+        lo, hi = self._bounds(prefix)
+        return hi - lo
+
+    def under(self, path):
+        """Sorted leaf paths inside the object at ``path`` (all leaves for ``''``)."""
+        return self.with_prefix(f'{path}.' if path else '')
+
+    def range(self, start, stop):
+        """Sorted leaf paths ``p`` with ``start <= p < stop``."""
+        lo = bisect.bisect_left(self.keys, start)
+        return self.keys[lo:bisect.bisect_left(self.keys, stop, lo)]
+
+    def items(self):
+        return self.values.items()
@@ -0,0 +1,124 @@
+"""Nested report of the source keys each locale lacks, and a patch filling them.
+
+The report has one object per locale, nested like the locale files, with a
+``"[MISSING] <key>"`` marker at every missing leaf::
+
+    {
+      "zh": {
+        "education": {
+          "apply": {
+            "emailHelp": "[MISSING] education.apply.emailHelp"
+          }
+        }
+      }
+    }
+
+The fill patch (see ``patch.py``) has the same shape under ``values`` and
+merges with ``keep`` and ``on_conflict: skip``, so applying it only adds
+leaves and never replaces a string that is in the way. Its values are the
+markers, or with a fallback locale that locale's value where it has one.
+
+Both are written as a stream of JSON text from the sorted missing keys of
+one locale at a time, laid out exactly as ``json.dumps(indent=2)`` would,
+without building the nested objects.
+"""
+import json
+
+from .dynamic import check_patterns
+from .extract import is_pattern
+
+MISSING_REPORT_FILE = 'missing_keys_report.json'
+MISSING_MARK = '[MISSING]'
+INDENT = '  '
+
+
+def marker(key):
+    return f'{MISSING_MARK} {key}'
+
+
+def missing_keys(usages, index):
+    """Missing non-pattern keys of ``usages`` as ``[segments]``, sorted by segment.
+
+    A key inside another missing key that is a leaf (``a.b`` and ``a.b.c``)
+    cannot be nested and is left out.
+    """
+    keys = sorted(k.split('.') for k in usages if not is_pattern(k) and not index.has(k))
+    out = []
+    for segments in keys:
+        if out and segments[:len(out[-1])] == out[-1]:
+            continue
+        out.append(segments)
+    return out
+
+
+def audit_locale(usages, lang, locale):
+    """``(missing keys, patterns matching nothing)``, sorted, for one locale's index; a ``LocaleStore.map`` task."""
+    missing = sorted(k for k in usages if not is_pattern(k) and not locale.has(k))
+    unmatched = sorted(p for p, r in check_patterns(usages, locale).items() if not r.keys)
+    return missing, unmatched
+
+
+def iter_nested(items, level=0):
+    """JSON text, in pieces, of the object holding ``(segments, value)`` leaves sorted by segments.
+
+    ``level`` is the indentation depth of the object's own braces.
+    """
+    open_path = []
+    first = [True]
+
+    def member(key):
+        sep = '' if first[-1] else ','
+        first[-1] = False
+        return f'{sep}\n{INDENT * (level + 1 + len(open_path))}{json.dumps(key, ensure_ascii=False)}: '
+
+    def close():
+        empty = first.pop()
+        if open_path:
+            open_path.pop()
+        return '}' if empty else f'\n{INDENT * (level + len(first))}}}'
+
+    yield '{'
+    for segments, value in items:
+        *parents, key = segments
+        common = 0
+        while common < min(len(open_path), len(parents)) and open_path[common] == parents[common]:
+            common += 1
+        while len(open_path) > common:
+            yield close()
+        for part in parents[common:]:
+            yield member(part) + '{'
+            open_path.append(part)
+            first.append(True)
+        yield member(key) + json.dumps(value, ensure_ascii=False)
+    while len(first) > 1:
+        yield close()
+    yield close()
+
+
+def report_items(missing):
+    """``(segments, value)`` for a report: ``{lang: {nested markers}}``, from ``(lang, [segments])`` pairs."""
+    for lang, keys in missing:
+        if not keys:
+            yield [lang], {}
+        for segments in keys:
+            yield [lang, *segments], marker('.'.join(segments))
+
+
+def fill_items(missing, fallback=None):
+    """``(segments, value)`` for a patch's ``values``; ``fallback`` is a ``FlatIndex`` or None."""
+    for lang, keys in missing:
+        for segments in keys:
+            key = '.'.join(segments)
+            value = fallback.get(key) if fallback is not None else None
+            yield [lang, *segments], value if isinstance(value, str) else marker(key)
+
+
+def iter_patch(items, description):
+    """JSON text, in pieces, of a fill patch around ``fill_items``."""
+    yield '{\n'
+    yield f'{INDENT}"description": {json.dumps(description, ensure_ascii=False)},\n'
+    yield f'{INDENT}"merge": "keep",\n'
+    yield f'{INDENT}"on_conflict": "skip",\n'
+    yield f'{INDENT}"values": '
+    yield from iter_nested(items, 1)
+    yield '\n}'
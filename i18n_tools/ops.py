@@ -0,0 +1,734 @@
+"""Audit, fix and list operations that run against one shared ``LocaleStore``."""
+import functools
+import json
+import os
+import sys
+import time
+
+from .atomic import atomic_open, atomic_write
+from .bench import compare, run_benchmarks
+from .chunks import build_manifest, split_locale, write_chunks
+from .codemod import rewrite_files, unified_diff
+from .diff import KINDS, diff_locale, diff_report, summarize
+from .dynamic import ENUM_DIRS, check_patterns, load_enums
+from .duplicates import ScanError, find_duplicates
+from .extract import (extract_paths, extraction_cache, iter_source_files, reference_paths,
+                      references_cache, resolve_sources)
+from .fixes import FIXES
+from .hardcoded import hardcoded_cache, report, report_text, scan_hardcoded
+from .missing import audit_locale, fill_items, iter_patch, iter_nested, missing_keys, report_items
+from .parallel import map_files
+from .patch import Patch, PatchError, builtin_patch, load_patch_file, load_patches, patch_locale
+from .prune import bundle_bytes, dead_keys, dead_trees, load_pins, prune_data, reachable_keys
+from .paths import ROOT, rel
+from .repair import apply_edits, check_text, context
+from .search import SearchIndex, search_file
+from .shared import ValueIndex, inconsistent, rank
+from .templates import check_parity, compile_index, resource_text
+from .store import LocaleError, LocaleStore
+from .translate import (MEMORY_FILE, Fill, TranslateError, TranslationMemory, nest, open_translator,
+                        untranslated)
+from .tree import TreeConflict
+from .watch import PollingWatcher, Watch, make_watcher
+
+
+class Session:
+    """One CLI invocation: a locale store plus the repo root operations act on."""
+
+    def __init__(self, store=None, root=ROOT, log=print, dry_run=False, use_cache=True, registry=None):
+        self.store = store if store is not None else LocaleStore()
+        self.registry = registry
+        self.root = root
+        self.log = log
+        self.dry_run = dry_run
+        self.use_cache = use_cache
+
+    def langs(self, requested=None):
+        return tuple(requested) if requested else self.store.langs
+
+    def commit(self):
+        if self.dry_run:
+            for lang in self.store.pending():
+                self.log(f"Would write {rel(self.store.path(lang), self.root)}")
+            return []
+        written = self.store.save()
+        for path in written:
+            self.log(f"Wrote {rel(path, self.root)}")
+        return written
+
+
+def lookup(data, key):
+    """Resolve a dotted key in a nested locale dict; ``None`` if absent."""
+    current = data
+    for part in key.split('.'):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def print_decode_error(session, error):
+    e = error.error
+    session.log(f"{rel(error.path, session.root)}: JSON Decode Error: {e.msg}")
+    session.log(f"Line: {e.lineno}")
+    session.log(f"Column: {e.colno}")
+    session.log(f"Position: {e.pos}")
+    lines = session.store.text(error.lang).splitlines()
+    start = max(0, e.lineno - 5)
+    end = min(len(lines), e.lineno + 5)
+    for i in range(start, end):
+        prefix = ">> " if i + 1 == e.lineno else "   "
+        session.log(f"{prefix}{i + 1}: {lines[i]}")
+
+
+def list_locales(session, registry):
+    """Print the locales found in the locale directory and the files that were passed over."""
+    for lang in registry:
+        note = ' (reference)' if lang == registry.reference else ''
+        session.log(f"{lang}: {rel(session.store.path(lang), session.root)}{note}")
+    for s in registry.skipped:
+        session.log(f"skipped {s.name}: {s.reason}")
+    return 0
+
+
+def validate(session, langs=None):
+    status = 0
+    for lang in session.langs(langs):
+        try:
+            session.store[lang]
+        except LocaleError as e:
+            if isinstance(e.error, json.JSONDecodeError):
+                print_decode_error(session, e)
+            else:
+                session.log(f"Error: {e}")
+            status = 1
+        else:
+            session.log(f"{lang}.json is valid.")
+    if status:
+        session.log("Run `python -m i18n_tools repair` to list every problem and a fix for each.")
+    return status
+
+
+def describe_edit(text, edit, limit=40):
+    start, end, replacement = edit
+    old = text[start:end]
+    if len(old) > limit:
+        old = old[:limit] + '...'
+    if not old:
+        return f"insert {replacement!r}"
+    if not replacement:
+        return f"delete {old!r}"
+    return f"replace {old!r} with {replacement!r}"
+
+
+def repair(session, langs=None, write=False, radius=2):
+    """Report every syntax problem in one pass per locale; ``write`` applies the minimal fixes."""
+    status = 0
+    for lang in session.langs(langs):
+        name = rel(session.store.path(lang), session.root)
+        text = session.store.text(lang)
+        problems = check_text(text)
+        for p in problems:
+            session.log(f"{name}:{p.line}:{p.col}: {p.message}")
+            for n, line, here in context(text, p.line, radius):
+                prefix = ">> " if here else "   "
+                session.log(f"{prefix}{n}: {line}")
+            session.log(f"   fix: {describe_edit(text, p.edit)}")
+        if not problems:
+            session.log(f"No syntax problems in {name}.")
+            continue
+        if not write:
+            session.log(f"Found {len(problems)} problems in {name}.")
+            status = 1
+            continue
+        fixed = apply_edits(text, problems)
+        try:
+            json.loads(fixed)
+        except json.JSONDecodeError as e:
+            session.log(f"Could not repair {name}: {e}")
+            status = 1
+            continue
+        session.store.set_text(lang, fixed)
+        session.log(f"Repaired {len(problems)} problems in {name}.")
+    return status
+
+
+def duplicates(session, langs=None):
+    status = 0
+    for lang in session.langs(langs):
+        name = rel(session.store.path(lang), session.root)
+        count = 0
+        try:
+            for dup in find_duplicates(session.store.text(lang)):
+                count += 1
+                session.log(f'{name}:{dup.second[0]}:{dup.second[1]}: duplicate key "{dup.path}" '
+                            f'(first defined at line {dup.first[0]}, column {dup.first[1]})')
+        except ScanError as e:
+            session.log(f"{name}:{e.line}:{e.col}: {e.msg}")
+            status = 1
+        if count:
+            session.log(f"Found {count} duplicates in {name}.")
+            status = 1
+        else:
+            session.log(f"No duplicate keys in {name}.")
+    return status
+
+
+def diff(session, langs=None, reference=None, as_json=False, fail_on=KINDS, workers=None):
+    """Compare every locale with ``reference`` (the registry's reference locale by default)."""
+    langs = session.langs(langs)
+    reference = reference or session.store.reference
+    others = [lang for lang in dict.fromkeys(langs) if lang != reference]
+    diffs = session.store.map(functools.partial(diff_locale, session.store.index(reference)), others, workers,
+                              view='index')
+    if as_json:
+        session.log(json.dumps(diff_report(diffs, reference), ensure_ascii=False, indent=2))
+    else:
+        for lang, items in diffs.items():
+            for d in items:
+                if d.kind == 'missing':
+                    session.log(f"[{lang}] missing {d.path}")
+                elif d.kind == 'extra':
+                    session.log(f"[{lang}] extra {d.path}")
+                else:
+                    session.log(f"[{lang}] {d.kind} {d.path}: {d.expected} in {reference}, {d.actual} in {lang}")
+        for lang, counts in summarize(diffs).items():
+            session.log(f"[{lang}] vs {reference}: " + ', '.join(f"{n} {kind}" for kind, n in counts.items()))
+    return int(any(d.kind in fail_on for items in diffs.values() for d in items))
+
+
+def _quote(text, limit=60):
+    text = json.dumps(text, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit - 4] + '..."'
+
+
+def shared(session, langs=None, reference=None, limit=20, min_count=2, as_json=False):
+    """Rank strings repeated under several keys; flag repeats translated more than one way."""
+    langs = session.langs(langs)
+    reference = reference or session.store.reference
+    indexes = {lang: session.store.index(lang) for lang in (reference, *langs)}
+    values = ValueIndex(indexes)
+    groups = rank(indexes, reference, min_count, values)
+    flagged = inconsistent(groups)
+    if as_json:
+        session.log(json.dumps({
+            'reference': reference,
+            'groups': [g._asdict() for g in groups],
+            'inconsistent': [{'text': g.text, 'lang': lang, 'values': g.translations[lang]} for g, lang in flagged],
+        }, ensure_ascii=False, indent=2))
+        return int(bool(flagged))
+    for lang in indexes:
+        count, keys, size = values.duplicated(lang)
+        session.log(f"[{lang}] {count} strings repeated under {keys} keys, {format_bytes(size)} in repeats")
+    session.log(f"{len(values)} distinct strings in all locales")
+    for g in groups[:limit] if limit else groups:
+        session.log(f"{_quote(g.text)} x{len(g.paths)}: {format_bytes(g.bytes)} and {g.effort} words "
+                    f"of translation saved")
+        session.log(f"    {', '.join(g.paths)}")
+    if limit and len(groups) > limit:
+        session.log(f"... {len(groups) - limit} more groups")
+    for g, lang in flagged:
+        session.log(f"[{lang}] {_quote(g.text)} is translated {len(g.translations[lang])} ways:")
+        for value, paths in sorted(g.translations[lang].items(), key=lambda item: -len(item[1])):
+            session.log(f"    {_quote(value)}: {', '.join(paths)}")
+    if flagged:
+        session.log(f"Found {len(flagged)} repeated strings with inconsistent translations.")
+    return int(bool(flagged))
+
+
+def compile_templates(session, out_dir, langs=None, reference=None, check_only=False):
+    """Check placeholder parity against ``reference`` and write precompiled resources."""
+    langs = session.langs(langs)
+    reference = reference or session.store.reference
+    indexes = {lang: session.store.index(lang) for lang in (reference, *langs)}
+    mismatches = check_parity(indexes, reference)
+    for m in mismatches:
+        parts = [f"missing {', '.join('{{%s}}' % n for n in m.missing)}" if m.missing else '',
+                 f"extra {', '.join('{{%s}}' % n for n in m.extra)}" if m.extra else '']
+        session.log(f"[{m.lang}] {m.path}: {'; '.join(p for p in parts if p)} (vs {reference})")
+    if mismatches:
+        session.log(f"Found {len(mismatches)} placeholder mismatches.")
+    if check_only:
+        return int(bool(mismatches))
+    out_dir = os.path.join(session.root, out_dir)
+    for lang in langs:
+        messages, stats = compile_index(indexes[lang])
+        path = os.path.join(out_dir, f'{lang}.json')
+        if not session.dry_run:
+            os.makedirs(out_dir, exist_ok=True)
+            atomic_write(path, resource_text(lang, messages))
+        prefix = 'Would write' if session.dry_run else 'Wrote'
+        session.log(f"{prefix} {rel(path, session.root)}: {stats['templates']} templates, "
+                    f"{stats['plain']} plain, {stats['dynamic']} left to i18next")
+    return int(bool(mismatches))
+
+
+def search(session, query, langs=None, limit=20, fuzzy=True, as_json=False):
+    """Ranked search over keys and values, through the persistent index."""
+    langs = session.langs(langs)
+    started = time.perf_counter()
+    index = SearchIndex(search_file(session.store.locales_dir))
+    if session.use_cache:
+        index.load()
+    for lang, (added, removed) in index.refresh(session.store, langs).items():
+        session.log(f"[{lang}] indexed: {added} added, {removed} removed")
+    if session.use_cache:
+        index.save()
+    hits = index.search(query, langs, limit, fuzzy)
+    elapsed = time.perf_counter() - started
+    if as_json:
+        session.log(json.dumps([h._asdict() for h in hits], ensure_ascii=False, indent=2))
+    else:
+        for h in hits:
+            session.log(f"[{h.lang}] {h.path} = {_quote(h.value, 80)}  ({h.score})")
+        session.log(f"{len(hits)} results in {elapsed * 1000:.1f} ms")
+    return int(not hits)
+
+
+def list_keys(session, paths=(), langs=None):
+    for lang in session.langs(langs):
+        data = session.store[lang]
+        for path in paths or ('',):
+            node = lookup(data, path) if path else data
+            label = path or 'Root'
+            if isinstance(node, dict):
+                session.log(f"[{lang}] {label} keys: {list(node.keys())}")
+            elif node is None:
+                session.log(f"[{lang}] {label} not found")
+            else:
+                session.log(f"[{lang}] {label} = {node!r}")
+    return 0
+
+
+def keys(session, prefixes=(), langs=None, values=False):
+    """Print flattened leaf paths, optionally limited to string prefixes."""
+    for lang in session.langs(langs):
+        index = session.store.index(lang)
+        for prefix in prefixes or ('',):
+            for path in index.with_prefix(prefix):
+                session.log(f"[{lang}] {path} = {index.get(path)!r}" if values else f"[{lang}] {path}")
+    return 0
+
+
+def source_index(session, sources=(), workers=None):
+    """Key usage index for ``sources`` (all of src/ when empty)."""
+    if sources:
+        paths = resolve_sources(sources, session.root)
+    else:
+        paths = list(iter_source_files(os.path.join(session.root, 'src')))
+    cache = extraction_cache(session.root) if session.use_cache else None
+    return extract_paths(paths, workers, session.root, cache)
+
+
+def reachable(session, langs=None, pin_file=None, pins=(), workers=None):
+    """``{lang: reachable leaf keys}`` from the usages and key-shaped strings in src/."""
+    paths = list(iter_source_files(os.path.join(session.root, 'src')))
+    usages = source_index(session, (), workers)
+    refs = reference_paths(paths, workers, references_cache(session.root) if session.use_cache else None)
+    names = set(usages) | refs | set(pins)
+    if pin_file:
+        names.update(load_pins(os.path.join(session.root, pin_file)))
+    return {lang: reachable_keys(session.store.index(lang), names) for lang in session.langs(langs)}
+
+
+def format_bytes(n):
+    return f"{n / 1024:.1f} KB" if n >= 1024 else f"{n} B"
+
+
+def profile_table(tracer, root=ROOT, files=10):
+    """Lines of the ``--profile`` report: one row per phase, then the slowest files."""
+    def size(n):
+        return format_bytes(n) if n is not None else '-'
+
+    lines = [f"{'phase':<14} {'calls':>6} {'wall ms':>10} {'cpu ms':>10} {'read':>11} {'written':>11} "
+             f"{'max rss':>11} {'py peak':>11}"]
+    for name, row in tracer.summary().items():
+        lines.append(f"{name:<14} {row['calls']:>6} {row['wall'] * 1000:>10.1f} {row['cpu'] * 1000:>10.1f} "
+                     f"{size(row['read']):>11} {size(row['written']):>11} {size(row['rss']):>11} "
+                     f"{size(row['peak']):>11}")
+    lines.append("Times include nested phases; py peak needs --trace-memory.")
+    slowest = tracer.slowest_files(files)
+    if slowest:
+        lines.append("Slowest files:")
+        for s in slowest:
+            lines.append(f"{s.wall * 1000:>10.1f} ms  {rel(s.args['file'], root)} ({s.name}, pid {s.pid})")
+    return lines
+
+
+def audit(session, sources=(), langs=None, workers=None):
+    usages = source_index(session, sources, workers)
+    session.log(f"Total keys found in source: {len(usages)}")
+    status = 0
+    results = session.store.map(functools.partial(audit_locale, usages), session.langs(langs), workers, view='index')
+    for lang, (missing, unmatched) in results.items():
+        session.log(f"[{lang}] Missing keys ({len(missing)}):")
+        for k in missing:
+            first = usages[k][0]
+            session.log(f"  {k}  ({first.path}:{first.line})")
+        if unmatched:
+            session.log(f"[{lang}] Key patterns matching nothing ({len(unmatched)}):")
+            for p in unmatched:
+                first = usages[p][0]
+                session.log(f"  {p}  ({first.path}:{first.line})")
+        status = status or int(bool(missing or unmatched))
+    return status
+
+
+def _stream(session, out, chunks):
+    """Write text ``chunks`` to ``out`` (repo-relative, ``-`` for stdout) as they come."""
+    if out == '-':
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.write('\n')
+        return
+    path = os.path.join(session.root, out)
+    if session.dry_run:
+        for _ in chunks:
+            pass
+        session.log(f"Would write {rel(path, session.root)}")
+        return
+    with atomic_open(path) as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.write('\n')
+    session.log(f"Wrote {rel(path, session.root)}")
+
+
+def missing(session, out, patch_file=None, fallback=None, sources=(), langs=None, workers=None):
+    """Write the nested missing-key report and, with ``patch_file``, a patch filling the gaps."""
+    usages = source_index(session, sources, workers)
+    by_lang = [(lang, missing_keys(usages, session.store.index(lang))) for lang in session.langs(langs)]
+    _stream(session, out, iter_nested(report_items(by_lang)))
+    for lang, keys in by_lang:
+        session.log(f"[{lang}] Missing keys: {len(keys)}")
+    if patch_file:
+        fallback_index = session.store.index(fallback) if fallback else None
+        source = f"values from {fallback} where it has them" if fallback else "marked placeholders"
+        items = fill_items(by_lang, fallback_index)
+        _stream(session, patch_file, iter_patch(items, f"Fill keys used in the sources but missing, with {source}."))
+    return 0
+
+
+def hardcoded(session, out, sources=(), workers=None, check_only=False):
+    """Scan the sources for untranslated text and write the report to ``out``."""
+    if sources:
+        paths = resolve_sources(sources, session.root)
+    else:
+        paths = list(iter_source_files(os.path.join(session.root, 'src')))
+    if session.use_cache:
+        per_file = hardcoded_cache(session.root).resolve(paths, scan_hardcoded, workers)
+    else:
+        per_file = dict(zip(paths, (rows for _, rows in map_files(scan_hardcoded, paths, workers))))
+    found = report(per_file, session.root)
+    counts = {}
+    for rows in found.values():
+        for row in rows:
+            counts[row['type']] = counts.get(row['type'], 0) + 1
+    session.log(f"Hardcoded strings: {sum(counts.values())} in {len(found)} files "
+                f"({', '.join(f'{n} {kind}' for kind, n in sorted(counts.items())) or 'none'})")
+    text = report_text(found)
+    path = os.path.join(session.root, out)
+    try:
+        with open(path, encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if current == text:
+        session.log(f"{rel(path, session.root)} is up to date")
+        return 0
+    if check_only:
+        session.log(f"{rel(path, session.root)} is out of date; run hardcoded to regenerate it")
+        return 1
+    if session.dry_run:
+        session.log(f"Would write {rel(path, session.root)}")
+    else:
+        atomic_write(path, text)
+        session.log(f"Wrote {rel(path, session.root)}")
+    return 0
+
+
+def patterns(session, sources=(), langs=None, bindings=None, enum_dirs=ENUM_DIRS, workers=None):
+    """Resolve template-literal key patterns and check them against known enums."""
+    usages = source_index(session, sources, workers)
+    enums = load_enums(enum_dirs, session.root)
+    status = 0
+    for lang in session.langs(langs):
+        index = session.store.index(lang)
+        for pattern, r in check_patterns(usages, index, enums, bindings).items():
+            first = usages[pattern][0]
+            checked = ''
+            if r.candidates is not None:
+                checked = f", {len(r.candidates) - len(r.missing)}/{len(r.candidates)} enum values"
+            session.log(f"[{lang}] {pattern}  {len(r.keys)} keys{checked}  "
+                        f"({first.path}:{first.line} {first.exprs[0]})")
+            if r.missing:
+                status = 1
+                for k in r.missing:
+                    session.log(f"    missing {k}")
+            if not r.keys:
+                status = 1
+    return status
+
+
+def chunks(session, out_dir, langs=None, workers=None, pruned=False, pin_file=None, pins=()):
+    """Split the locales into per-namespace chunks plus a route manifest.
+
+    With ``pruned`` the chunks hold only the keys ``unused`` considers reachable.
+    """
+    out_dir = os.path.join(session.root, out_dir)
+    if pruned:
+        keep = reachable(session, langs, pin_file, pins, workers)
+        split = {lang: split_locale(prune_data(session.store[lang], keep[lang])) for lang in keep}
+    else:
+        split = {lang: split_locale(session.store[lang]) for lang in session.langs(langs)}
+    manifest = build_manifest(split, source_index(session, (), workers), session.root)
+    written, removed = write_chunks(split, manifest, out_dir, session.dry_run)
+    total = sum(len(c) for c in split.values())
+    prefix = 'Would write' if session.dry_run else 'Wrote'
+    session.log(f"{prefix} {written} new of {total} chunks to {rel(out_dir, session.root)} "
+                f"({removed} stale removed), {len(manifest['routes'])} routes in the manifest")
+    return 0
+
+
+def unused(session, langs=None, pin_file=None, pins=(), workers=None, limit=None):
+    """Report leaves nothing in src/ can reach, grouped into dead subtrees, with byte costs."""
+    status = 0
+    for lang, keep in reachable(session, langs, pin_file, pins, workers).items():
+        index = session.store.index(lang)
+        dead = dead_keys(index, keep)
+        total = len(bundle_bytes(session.store[lang]))
+        session.log(f"[{lang}] {len(dead)} of {len(index)} keys unused, "
+                    f"{format_bytes(sum(dead.values()))} of {format_bytes(total)}")
+        trees = dead_trees(index, dead)
+        for tree in trees[:limit]:
+            what = f"{tree.path}.*  {tree.keys} keys" if index.is_branch(tree.path) else tree.path
+            session.log(f"  {what}  {format_bytes(tree.bytes)}")
+        if limit is not None and len(trees) > limit:
+            session.log(f"  ... {len(trees) - limit} more")
+        status = status or int(bool(dead))
+    return status
+
+
+def prune(session, out_dir, langs=None, pin_file=None, pins=(), workers=None):
+    """Write compact bundles holding only the reachable keys of each locale."""
+    out_dir = os.path.join(session.root, out_dir)
+    prefix = 'Would write' if session.dry_run else 'Wrote'
+    for lang, keep in reachable(session, langs, pin_file, pins, workers).items():
+        data = session.store[lang]
+        body = bundle_bytes(prune_data(data, keep))
+        path = os.path.join(out_dir, f'{lang}.json')
+        if not session.dry_run:
+            os.makedirs(out_dir, exist_ok=True)
+            atomic_write(path, body)
+        session.log(f"{prefix} {rel(path, session.root)}: {len(keep)} of {len(session.store.index(lang))} keys, "
+                    f"{format_bytes(len(body))} (was {format_bytes(len(bundle_bytes(data)))})")
+    return 0
+
+
+def apply_patches(session, patches, langs=None, strict=False, workers=None):
+    """Apply ``patches`` to every locale, in worker processes if there are enough, and report what they did.
+
+    If a patch hits an ``on_conflict: error`` conflict, or any conflict with
+    ``strict``, no patch is applied to any locale; changes made by earlier
+    commands in the chain stay.
+    """
+    results = session.store.map(functools.partial(patch_locale, patches), session.langs(langs), workers, view='edit')
+    conflicts = []
+    failed = False
+    for lang, (counts, lang_conflicts, lang_failed, _) in results.items():
+        for (name, _), n in counts.items():
+            session.log(f"[{lang}] {name}: " + ', '.join(f"{count} {what}" for what, count in n.items()))
+        conflicts.extend(lang_conflicts)
+        failed = failed or lang_failed
+    for c in conflicts:
+        existing = json.dumps(c.existing, ensure_ascii=False)
+        if len(existing) > 60:
+            existing = existing[:57] + '...'
+        session.log(f"[{c.lang}] conflict {c.path} = {existing} ({c.patch}): {c.resolution}")
+    if failed or (strict and conflicts):
+        session.log(f"Aborted: {len(conflicts)} conflicts, no locale changed")
+        return 1
+    for lang, (_, _, _, data) in results.items():
+        if data is not None:
+            session.store.set_data(lang, data)
+    return 0
+
+
+def translate(session, lang, reference=None, backend='http', url=None, api_key=None, memory_file=None,
+              concurrency=4, rate=5.0):
+    """Machine-translate the leaves of ``lang`` that are missing or still English."""
+    reference = reference or session.store.reference
+    todo = untranslated(session.store.index(reference), session.store.index(lang))
+    session.log(f"[{lang}] {len(todo)} leaves to translate, {len(set(todo.values()))} distinct texts")
+    if not todo:
+        return 0
+    if memory_file:
+        memory = TranslationMemory(os.path.join(session.root, memory_file))
+    else:
+        memory = TranslationMemory(':memory:' if backend == 'fake' else MEMORY_FILE)
+    try:
+        if session.dry_run:
+            known = memory.lookup(todo.values(), reference, lang, backend)
+            session.log(f"[{lang}] translation memory has {len(known)}; would send "
+                        f"{len(set(todo.values())) - len(known)} to the {backend} backend")
+            return 0
+        try:
+            with open_translator(backend, url, api_key) as translator:
+                fill = Fill(translator, memory, reference, lang, concurrency, rate, session.log)
+                known, stats = fill.run(todo.values())
+        except TranslateError as e:
+            session.log(f"Error: {e}")
+            return 2
+    finally:
+        memory.close()
+    session.log(f"[{lang}] {stats['memory']} from translation memory, {stats['translated']} translated in "
+                f"{stats['requests']} requests, {stats['rejected']} rejected, {stats['failed']} failed")
+    values = {path: known[source] for path, source in todo.items() if source in known}
+    patch = Patch('translate', '', 'overwrite', 'skip', {lang: nest(values)},
+                  f'Machine translations from {reference}.')
+    status = apply_patches(session, [patch], [lang])
+    return status or int(bool(stats['failed']))
+
+
+def patch(session, files, langs=None, strict=False, workers=None):
+    """Apply patch files (or directories of them, relative to the repo root)."""
+    try:
+        patches = load_patches([os.path.join(session.root, f) for f in files])
+    except (OSError, PatchError) as e:
+        session.log(f"Error: {e}")
+        return 2
+    return apply_patches(session, patches, langs, strict, workers)
+
+
+def fix(session, names, langs=None, workers=None):
+    patches = [p for name in names for p in load_patch_file(builtin_patch(name))]
+    status = apply_patches(session, patches, langs, workers=workers)
+    if status == 0:
+        for name in names:
+            if FIXES[name].after is not None:
+                FIXES[name].after(session)
+    return status
+
+
+TREE_DONE = {'move': 'Moved', 'copy': 'Copied', 'rename': 'Renamed', 'delete': 'Deleted'}
+
+
+def edit_tree(session, action, path, target=None, langs=None, exists='error', optional=False):
+    """Apply one structural edit (``move``, ``copy``, ``rename`` or ``delete``) to each locale.
+
+    A conflict leaves that locale untouched and makes the status 1; with
+    ``optional`` a missing ``path`` is skipped instead.
+    """
+    status = 0
+    what = f"{path} -> {target}" if target is not None else path
+    for lang in session.langs(langs):
+        tree = session.store.tree(lang)
+        if optional and path not in tree:
+            session.log(f"[{lang}] {path} does not exist, skipped")
+            continue
+        try:
+            if action == 'rename':
+                tree.rename(path, target)
+            elif action == 'delete':
+                tree.delete(path)
+            else:
+                getattr(tree, action)(path, target, exists)
+        except TreeConflict as e:
+            session.log(f"[{lang}] cannot {action} {what}: {e}")
+            status = 1
+            continue
+        session.store.mark_dirty(lang)
+        session.log(f"[{lang}] {TREE_DONE[action]} {what}")
+    return status
+
+
+def codemod(session, renames, sources=(), workers=None):
+    """Rewrite key references in the sources; with ``dry_run`` print unified diffs instead.
+
+    Literals outside ``t()`` and ``i18nKey`` are renamed only if the
+    reference locale, as the chain has left it, has them under the old or
+    the new name.
+    """
+    if sources:
+        paths = resolve_sources(sources, session.root)
+    else:
+        paths = list(iter_source_files(os.path.join(session.root, 'src')))
+    index = session.store.index(session.store.reference)
+    rewrites = rewrite_files(paths, renames, workers, frozenset(index.values).union(index.branches))
+    for r in rewrites:
+        name = rel(r.path, session.root)
+        if session.dry_run:
+            with open(r.path, 'r', encoding='utf-8') as f:
+                session.log(unified_diff(f.read(), r.text, name).rstrip('\n'))
+            continue
+        atomic_write(r.path, r.text)
+        session.log(f"{name}: {r.count} keys renamed")
+    total = sum(r.count for r in rewrites)
+    prefix = 'Would rename' if session.dry_run else 'Renamed'
+    session.log(f"{prefix} {total} key references in {len(rewrites)} of {len(paths)} files")
+    return 0
+
+
+def normalize(session, langs=None):
+    """Re-serialize locales in the canonical ``indent=2`` layout."""
+    for lang in session.langs(langs):
+        session.store[lang]
+        session.store.mark_dirty(lang, normalize=True)
+    return 0
+
+
+def bench(session, sizes, phases, repeat=3, workers=None, seed=0, out=None, baseline=None, threshold=0.2):
+    """Time the tooling on synthetic locales; exit 1 if a case regressed against ``baseline``."""
+    def show(row):
+        extra = ''.join(f", {k}={v}" for k, v in row.items() if k not in ('phase', 'size', 'seconds'))
+        session.log(f"{row['phase']:<11} {row['size']:>9} keys {row['seconds'] * 1000:10.1f} ms{extra}")
+
+    results = run_benchmarks(sizes, phases, repeat, workers, seed, show)
+    if out:
+        path = os.path.join(session.root, out)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, json.dumps(results, indent=2) + '\n')
+        session.log(f"Wrote {rel(path, session.root)}")
+    if not baseline:
+        return 0
+    with open(os.path.join(session.root, baseline), 'r', encoding='utf-8') as f:
+        slower = compare(results, json.load(f), threshold)
+    for phase, size, old, new in slower:
+        session.log(f"REGRESSION {phase} at {size} keys: {old * 1000:.1f} ms -> {new * 1000:.1f} ms "
+                    f"(+{(new / old - 1) * 100:.0f}%)")
+    if not slower:
+        session.log(f"No case is more than {threshold:.0%} slower than {baseline}.")
+    return int(bool(slower))
+
+
+def watch(session, langs=None, reference=None, poll=False, workers=None):
+    """Keep everything parsed and report problems that appear or go away as files are saved."""
+    state = Watch(session, os.path.join(session.root, 'src'), session.langs(langs), reference, workers)
+    watcher = make_watcher(state.dirs(), state.wanted, poll)
+    try:
+        start = time.perf_counter()
+        added, _ = state.load_all()
+        for message in added:
+            session.log(message)
+        how = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+        session.log(f"Watching {', '.join(rel(d, session.root) for d in state.dirs())} ({how}): "
+                    f"{len(state.problems)} problems, ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        while True:
+            paths = watcher.changes()
+            if paths is not None and not paths:
+                continue
+            start = time.perf_counter()
+            added, fixed = state.update(paths)
+            elapsed = (time.perf_counter() - start) * 1000
+            for message in fixed:
+                session.log(f"  fixed: {message}")
+            for message in added:
+                session.log(f"  {message}")
+            names = ', '.join(rel(p, session.root) for p in sorted(paths)) if paths is not None else 'rescan'
+            session.log(f"[{time.strftime('%H:%M:%S')}] {names}: {len(added)} new, {len(fixed)} fixed, "
+                        f"{len(state.problems)} open ({elapsed:.0f} ms)")
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
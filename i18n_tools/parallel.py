@@ -0,0 +1,73 @@
+"""Process-pool helpers shared by the per-file scanners and per-locale operations."""
+import concurrent.futures
+import functools
+import os
+
+from . import trace
+
+
+# Parsing one locale takes milliseconds; starting a pool for two of them costs more.
+MIN_PARALLEL_LOCALES = 3
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _merge_traced(tracer, results):
+    for _, spans in results:
+        if spans:
+            tracer.merge(spans)
+    return [result for result, _ in results]
+
+
+def map_files(func, paths, workers=None, min_parallel=16):
+    """``map`` ``func`` over ``paths`` in a process pool, keeping input order.
+
+    Small batches and single-core machines run in-process: forking a pool costs
+    more than scanning a handful of files. While tracing, every call gets a
+    span, and spans recorded in workers are merged into the caller's tracer.
+    """
+    workers = workers or default_workers()
+    tracer = trace.active()
+    if tracer is not None:
+        func = functools.partial(trace.call_traced, func, tracer.memory)
+    if workers <= 1 or len(paths) < min_parallel:
+        results = [func(p) for p in paths]
+    else:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(func, paths, chunksize=chunksize))
+    return results if tracer is None else _merge_traced(tracer, results)
+
+
+def locale_workers(count, workers=None, min_parallel=MIN_PARALLEL_LOCALES):
+    """Processes to spread ``count`` locales over; 1 means running them in this process."""
+    if count < min_parallel:
+        return 1
+    return max(1, min(workers or default_workers(), count))
+
+
+def map_locales(func, locales, workers=1):
+    """``{lang: func(lang, locale=locale)}`` for ``locales`` (``{lang: locale}``), one locale per task.
+
+    ``workers`` comes from ``locale_workers``; with more than one, each
+    ``locale`` is pickled to a worker process. Traced like ``map_files``,
+    with the locale in place of the file name.
+    """
+    tracer = trace.active()
+    calls = []
+    for lang, locale in locales.items():
+        call = functools.partial(func, locale=locale)
+        if tracer is not None:
+            call = functools.partial(trace.call_traced, call, tracer.memory, label='lang')
+        calls.append((lang, call))
+    if workers <= 1:
+        results = [call(lang) for lang, call in calls]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(call, lang) for lang, call in calls]
+            results = [f.result() for f in futures]
+    if tracer is not None:
+        results = _merge_traced(tracer, results)
+    return dict(zip(locales, results))
@@ -0,0 +1,247 @@
+"""Declarative merge patches for the locale files.
+
+A patch file is JSON (or YAML, if PyYAML is installed) holding one patch, a
+list of patches, or ``{"patches": [...]}``. A patch is::
+
+    {
+      "description": "Move location labels under common.location.",
+      "path": "common.location",
+      "merge": "overwrite",
+      "on_conflict": "replace",
+      "values": {"en": {...}, "zh": {...}}
+    }
+
+``value`` instead of ``values`` applies the same content to every locale
+(optionally limited by ``langs``); with ``values`` a patch only touches the
+locales it names. ``path`` is the dotted object the content is merged into,
+``''`` for the root.
+
+``merge`` is one of:
+
+``overwrite``  deep merge, incoming leaves replace existing ones
+``keep``       deep merge that only fills in leaves that do not exist yet
+``two-level``  merge one level of sub-objects; deeper content replaces wholesale
+``replace``    set ``path`` to the content as is
+
+``on_conflict`` says what happens where the patch needs an object but the
+locale has a string: ``replace`` it (the default), ``rename`` it to
+``<key>_legacy``, ``skip`` that part of the patch, or treat it as an
+``error``, which aborts the whole run without writing anything.
+
+All patches are applied to the parsed locales in memory, and each locale is
+written once at the end. Two patches setting the same leaf to different
+values in one run are reported as an overlap.
+"""
+import collections
+import json
+import os
+
+try:
+    import yaml
+except ImportError:  # YAML patches are optional
+    yaml = None
+
+MERGES = ('overwrite', 'keep', 'two-level', 'replace')
+ON_CONFLICT = ('replace', 'rename', 'skip', 'error')
+PATCH_EXTENSIONS = ('.json', '.yaml', '.yml')
+PATCHES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patches')
+
+Patch = collections.namedtuple('Patch', 'name path merge on_conflict values description')
+Conflict = collections.namedtuple('Conflict', 'patch lang path existing resolution')
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    """A patch file cannot be read or does not follow the patch schema."""
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise PatchError(f'{path}: PyYAML is required to read YAML patches')
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise PatchError(f'{path}: {e}') from e
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise PatchError(f'{path}: {e}') from e
+
+
+def _patch(raw, name, source):
+    if not isinstance(raw, dict):
+        raise PatchError(f'{source}: {name} is not an object')
+    merge = raw.get('merge', 'overwrite')
+    if merge not in MERGES:
+        raise PatchError(f"{source}: {name}: merge must be one of {', '.join(MERGES)}")
+    on_conflict = raw.get('on_conflict', 'replace')
+    if on_conflict not in ON_CONFLICT:
+        raise PatchError(f"{source}: {name}: on_conflict must be one of {', '.join(ON_CONFLICT)}")
+    if ('value' in raw) == ('values' in raw):
+        raise PatchError(f'{source}: {name}: give exactly one of value or values')
+    if 'values' in raw:
+        values = raw['values']
+        if not isinstance(values, dict):
+            raise PatchError(f'{source}: {name}: values must map locales to content')
+    else:
+        values = {lang: raw['value'] for lang in raw['langs']} if 'langs' in raw else {None: raw['value']}
+    if merge != 'replace' and not all(isinstance(v, dict) for v in values.values()):
+        raise PatchError(f'{source}: {name}: {merge} merges need object content')
+    path = raw.get('path', '')
+    if merge == 'replace' and not path:
+        raise PatchError(f'{source}: {name}: replace needs a non-empty path')
+    return Patch(raw.get('name', name), path, merge, on_conflict, values, raw.get('description', ''))
+
+
+def load_patch_file(path):
+    """The patches in one file, named ``<file stem>`` or ``<file stem>#<n>``."""
+    raw = _read(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if isinstance(raw, dict) and 'patches' in raw:
+        raw = raw['patches']
+    if isinstance(raw, list):
+        return [_patch(p, f'{stem}#{i + 1}', path) for i, p in enumerate(raw)]
+    return [_patch(raw, stem, path)]
+
+
+def patch_files(paths):
+    """Expand directories into their patch files, sorted by name."""
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            out.extend(os.path.join(path, n) for n in sorted(os.listdir(path)) if n.endswith(PATCH_EXTENSIONS))
+        else:
+            out.append(path)
+    return out
+
+
+def load_patches(paths):
+    return [p for path in patch_files(paths) for p in load_patch_file(path)]
+
+
+def builtin_patch(name):
+    return os.path.join(PATCHES_DIR, f'{name}.json')
+
+
+def _join(prefix, key):
+    return f'{prefix}.{key}' if prefix else key
+
+
+class PatchRun:
+    """Applies patches to parsed locales and records what each one did.
+
+    ``counts[(patch, lang)]`` counts ``added``, ``changed`` and ``kept`` leaves;
+    ``conflicts`` lists structural conflicts and overlaps between patches.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.conflicts = []
+        self.failed = False
+        self._writers = {}
+
+    def apply(self, data, lang, patch):
+        """Apply ``patch`` to the locale ``data``; False if it has nothing for ``lang``."""
+        content = patch.values.get(lang, patch.values.get(None, _MISSING))
+        if content is _MISSING:
+            return False
+        self._patch, self._lang = patch, lang
+        self._counts = self.counts.setdefault((patch.name, lang), dict.fromkeys(('added', 'changed', 'kept'), 0))
+        if patch.merge == 'replace':
+            parent_path, _, key = patch.path.rpartition('.')
+            parent = self._walk(data, parent_path)
+            if parent is not None:
+                self._set(parent, key, content, patch.path)
+            return True
+        node = self._walk(data, patch.path)
+        if node is None:
+            return True
+        if patch.merge == 'two-level':
+            for k, v in content.items():
+                path = _join(patch.path, k)
+                if isinstance(v, dict):
+                    child = self._child(node, k, path)
+                    if child is not None:
+                        for kk, vv in v.items():
+                            self._set(child, kk, vv, _join(path, kk))
+                else:
+                    self._set(node, k, v, path)
+        else:
+            self._merge(node, content, patch.path, patch.merge == 'keep')
+        return True
+
+    def _walk(self, data, path):
+        node = data
+        done = ''
+        for part in path.split('.') if path else ():
+            done = _join(done, part)
+            node = self._child(node, part, done)
+            if node is None:
+                return None
+        return node
+
+    def _merge(self, node, content, prefix, keep):
+        for k, v in content.items():
+            path = _join(prefix, k)
+            if isinstance(v, dict):
+                child = self._child(node, k, path)
+                if child is not None:
+                    self._merge(child, v, path, keep)
+            elif keep and k in node:
+                if node[k] != v:
+                    self._counts['kept'] += 1
+            else:
+                self._set(node, k, v, path)
+
+    def _child(self, node, key, path):
+        """``node[key]`` as an object, creating it or resolving a conflict; ``None`` to skip."""
+        child = node.get(key, _MISSING)
+        if isinstance(child, dict):
+            return child
+        if child is not _MISSING and not self._resolve(node, key, path, child):
+            return None
+        node[key] = child = {}
+        return child
+
+    def _resolve(self, node, key, path, existing):
+        """Record a string-vs-object conflict at ``path``; True if the patch may go ahead."""
+        resolution = self._patch.on_conflict
+        self.conflicts.append(Conflict(self._patch.name, self._lang, path, existing, resolution))
+        if resolution in ('skip', 'error'):
+            self.failed = self.failed or resolution == 'error'
+            return False
+        if resolution == 'rename':
+            node[f'{key}_legacy'] = node.pop(key)
+        return True
+
+    def _set(self, node, key, value, path):
+        existing = node.get(key, _MISSING)
+        if existing == value:
+            return
+        if isinstance(existing, dict) and not isinstance(value, dict) and self._patch.merge != 'replace':
+            if not self._resolve(node, key, path, existing):
+                return
+            existing = node.get(key, _MISSING)
+        writer = self._writers.get((self._lang, path))
+        if writer is not None and writer != self._patch.name:
+            self.conflicts.append(Conflict(self._patch.name, self._lang, path, existing, f'overlap with {writer}'))
+        self._writers[(self._lang, path)] = self._patch.name
+        self._counts['added' if existing is _MISSING else 'changed'] += 1
+        node[key] = value
+
+
+def patch_locale(patches, lang, locale):
+    """Apply ``patches`` in place to a copy of one locale's data; a ``LocaleStore.map`` task with ``view='edit'``.
+
+    Returns ``(counts, conflicts, failed, data)``, with ``None`` for the data
+    when no patch applies to ``lang``.
+    """
+    run = PatchRun()
+    touched = False
+    for patch in patches:
+        touched = run.apply(locale, lang, patch) or touched
+    return run.counts, run.conflicts, run.failed, locale if touched else None
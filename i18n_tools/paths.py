@@ -0,0 +1,16 @@
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, 'src')
+LOCALES_DIR = os.path.join(SRC_DIR, 'i18n', 'locales')
+
+DEFAULT_LOCALES = ('en', 'zh')
+
+
+def locale_path(lang, locales_dir=LOCALES_DIR):
+    return os.path.join(locales_dir, f'{lang}.json')
+
+
+def rel(path, root=ROOT):
+    """Repo-relative POSIX path, used in every report the tools print."""
+    return os.path.relpath(path, root).replace(os.sep, '/')
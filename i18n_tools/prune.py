@@ -0,0 +1,101 @@
+"""Dead-key detection and pruned production bundles.
+
+A leaf is reachable when something in src/ can name it:
+
+* a static ``t('key')`` usage, or one of its i18next plural forms
+  (``key_one``, ``key_other``, ...); a usage naming an object keeps its subtree;
+* a template pattern such as ``admin.visa.status.*``;
+* a key-shaped string anywhere in the code (``label: 'admin.sidebar.users'``,
+  ``const key = `education.levels.${x}```), since keys often reach ``t()``
+  through a variable;
+* a pinned key, for keys only ever built at runtime or used outside src/.
+
+Everything else is dead. The byte cost of a dead leaf is the size of its
+``"name":"value",`` entry in a compact bundle.
+"""
+import collections
+import json
+import os
+
+from .dynamic import resolve_patterns
+from .extract import is_pattern
+
+PIN_FILE = os.path.join('i18n_tools', 'pinned_keys.txt')
+PRUNED_DIR = os.path.join('build', 'i18n')
+PLURAL_SUFFIXES = ('_zero', '_one', '_two', '_few', '_many', '_other', '_plural')
+
+DeadTree = collections.namedtuple('DeadTree', 'path keys bytes')
+
+
+def load_pins(path):
+    """Keys, object paths and ``*`` patterns listed one per line; ``#`` starts a comment."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    return [s for s in (line.split('#', 1)[0].strip() for line in lines) if s]
+
+
+def reachable_keys(index, names):
+    """Leaf keys of ``index`` reachable from ``names`` (keys, object paths or patterns)."""
+    keep = set()
+    patterns = []
+    for name in names:
+        if is_pattern(name):
+            patterns.append(name)
+        elif name in index:
+            keep.add(name)
+        elif index.is_branch(name):
+            keep.update(index.under(name))
+        keep.update(k for k in (name + s for s in PLURAL_SUFFIXES) if k in index)
+    for keys in resolve_patterns(patterns, index).values():
+        keep.update(keys)
+    return keep
+
+
+def entry_bytes(key, value):
+    name = key.rsplit('.', 1)[-1]
+    return len(json.dumps(name, ensure_ascii=False).encode('utf-8')) + \
+        len(json.dumps(value, ensure_ascii=False).encode('utf-8')) + 2
+
+
+def dead_keys(index, keep):
+    """``{key: bytes}`` for the unreachable leaves, in document order."""
+    return {k: entry_bytes(k, v) for k, v in index.items() if k not in keep}
+
+
+def dead_trees(index, dead):
+    """Group ``dead`` into the outermost objects that are dead as a whole.
+
+    Leaves whose parent object is still partly in use are returned as
+    single-key trees. Sorted by bytes, largest first.
+    """
+    trees = []
+    covered = set()
+    for branch in sorted(index.branches - {''}, key=lambda b: (b.count('.'), b)):
+        leaves = index.under(branch)
+        if leaves and leaves[0] not in covered and all(k in dead for k in leaves):
+            covered.update(leaves)
+            trees.append(DeadTree(branch, len(leaves), sum(dead[k] for k in leaves)))
+    trees.extend(DeadTree(k, 1, b) for k, b in dead.items() if k not in covered)
+    trees.sort(key=lambda t: (-t.bytes, t.path))
+    return trees
+
+
+def prune_data(data, keep, prefix=''):
+    """Copy of ``data`` with only the leaves in ``keep``; emptied objects are dropped."""
+    out = {}
+    for key, value in data.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            value = prune_data(value, keep, path + '.')
+            if value:
+                out[key] = value
+        elif path in keep:
+            out[key] = value
+    return out
+
+
+def bundle_bytes(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,58 @@
+"""The locales in the locale directory, found rather than listed.
+
+Every ``<lang>.json`` in the directory is a locale when ``<lang>`` is a
+language tag (``en``, ``zh``, ``zh-TW``, ``pt_BR``, ``zh-Hant``) and the
+file is not empty. Hidden files (the lock, the transaction journal, temp
+files) are ignored, and other JSON files such as an empty ``en_clean.json``
+are listed as skipped with the reason.
+
+The reference locale, the one the others are compared with and filled
+from, is ``en`` if present, else the first locale by name. ``langs`` lists
+it first.
+"""
+import collections
+import os
+import re
+
+from .paths import LOCALES_DIR
+
+REFERENCE_LOCALE = 'en'
+LANG_RE = re.compile(r'[a-z]{2,3}(?:[-_](?:[A-Z][a-z]{3}|[A-Z]{2}|\d{3}))*')
+
+Skipped = collections.namedtuple('Skipped', 'name reason')
+
+
+class LocaleRegistry:
+    __slots__ = ('locales_dir', 'reference', 'langs', 'skipped')
+
+    def __init__(self, locales_dir=LOCALES_DIR, reference=None):
+        self.locales_dir = locales_dir
+        self.skipped = []
+        found = []
+        for entry in sorted(os.scandir(locales_dir), key=lambda e: e.name):
+            name = entry.name
+            if name.startswith('.') or not name.endswith('.json') or not entry.is_file():
+                continue
+            lang = name[:-len('.json')]
+            if not LANG_RE.fullmatch(lang):
+                self.skipped.append(Skipped(name, 'not a language tag'))
+            elif entry.stat().st_size == 0:
+                self.skipped.append(Skipped(name, 'empty'))
+            else:
+                found.append(lang)
+        if reference is None:
+            reference = REFERENCE_LOCALE if REFERENCE_LOCALE in found or not found else found[0]
+        if reference not in found:
+            raise ValueError(f'reference locale {reference!r} is not in {locales_dir}')
+        self.reference = reference
+        self.langs = (reference, *sorted(lang for lang in found if lang != reference))
+
+    def others(self):
+        """Every locale but the reference."""
+        return self.langs[1:]
+
+    def __iter__(self):
+        return iter(self.langs)
+
+    def __len__(self):
+        return len(self.langs)
@@ -0,0 +1,351 @@
+"""Tolerant single-pass JSON checker with minimal repairs.
+
+``check_text`` reads a broken locale once, left to right, and keeps going
+after every problem instead of stopping at the first one the way
+``json.loads`` does. Each ``Problem`` carries the edit that fixes it:
+
+* trailing commas, doubled commas, missing commas and colons;
+* extra, mismatched and missing ``}`` / ``]``, and junk after the root object;
+* unescaped ``"`` inside a string and strings left open at the end of a line;
+* single-quoted strings, unquoted keys, comments and stray characters;
+* duplicate members: the earlier one is removed, which keeps exactly what
+  ``json.load`` would have kept.
+
+``apply_edits`` applies the fixes. Where two fixes overlap, the one that
+starts first wins. Everything outside the edits is copied through as is, so
+the repaired file differs from the broken one only where it was broken.
+The work is linear in the file size, wherever the damage is.
+"""
+import collections
+import json
+import re
+
+from .extract import LineIndex
+from .scanner import join_path
+
+TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n]+)
+  | (?P<comment>//[^\n]*|/\*(?:.*?\*/|.*))
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<sstring>'(?:[^'\\\n]|\\.)*')
+  | (?P<punct>[{}\[\]:,])
+  | (?P<literal>(?:true|false|null|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\b)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<error>.)
+''', re.VERBOSE | re.DOTALL)
+# The first character after a string that is not a space or tab ('' at the end).
+SEPARATOR_RE = re.compile(r'[ \t\r]*(.?)', re.DOTALL)
+# A string followed by ':', i.e. the next key after a missing comma.
+NEXT_KEY_RE = re.compile(r'\s*"(?:[^"\\\n]|\\.)*"\s*:')
+PY_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null', 'undefined': 'null'}
+
+Problem = collections.namedtuple('Problem', 'kind line col message edit')
+
+# Frame states
+KEY, COLON, VALUE, COMMA, AFTER_COMMA = 'key', 'colon', 'value', 'comma', 'after_comma'
+
+
+class _Frame:
+    __slots__ = ('char', 'offset', 'path', 'state', 'key', 'index', 'comma', 'seen', 'starts', 'last_end')
+
+    def __init__(self, char, offset, path):
+        self.char = char
+        self.offset = offset
+        self.path = path
+        self.state = KEY if char == '{' else VALUE
+        self.key = None
+        self.index = 0
+        self.comma = None
+        self.seen = {} if char == '{' else None
+        self.starts = []
+        self.last_end = offset + 1
+
+    @property
+    def closer(self):
+        return '}' if self.char == '{' else ']'
+
+    def child_path(self):
+        return join_path(self.path, self.key if self.char == '{' else self.index)
+
+
+def _escape_quotes(text, start, end):
+    """``text[start:end]`` (a string body) with every bare ``"`` escaped."""
+    out = []
+    i = start
+    while i < end:
+        c = text[i]
+        if c == '\\':
+            out.append(text[i:i + 2])
+            i += 2
+            continue
+        out.append('\\"' if c == '"' else c)
+        i += 1
+    return ''.join(out)
+
+
+class _Checker:
+    def __init__(self, text):
+        self.text = text
+        self.lines = LineIndex(text)
+        self.problems = []
+        self.stack = []
+        self.done = False
+        # Offset of the last character that is not whitespace or a closer.
+        self.last_content = len(text.rstrip(' \t\r\n}]')) - 1
+
+    def report(self, kind, offset, message, edit):
+        line, col = self.lines.position(offset)
+        self.problems.append(Problem(kind, line, col, message, edit))
+
+    # -- values --------------------------------------------------------
+
+    def begin_value(self, start):
+        """Check that a value may start at ``start``; False if it is junk after the root."""
+        top = self.stack[-1] if self.stack else None
+        if top is None:
+            if self.done:
+                end = len(self.text.rstrip())
+                self.report('trailing-data', start, 'unexpected content after the end of the document',
+                            (start, end, ''))
+                return False
+            return True
+        if top.state == COLON:
+            self.report('missing-colon', start, f'missing \':\' after key "{top.key}"', (top.last_end, top.last_end, ':'))
+        elif top.state == COMMA:
+            self.report('missing-comma', start, "missing ',' between members", (top.last_end, top.last_end, ','))
+        return True
+
+    def end_value(self, end):
+        top = self.stack[-1] if self.stack else None
+        if top is None:
+            self.done = True
+            return
+        top.state = COMMA
+        top.last_end = end
+
+    def key(self, start, end, key):
+        top = self.stack[-1]
+        if top.state == COMMA:
+            self.report('missing-comma', start, "missing ',' between members", (top.last_end, top.last_end, ','))
+        first = top.seen.get(key)
+        if first is not None:
+            path = join_path(top.path, key)
+            nxt = top.starts[first + 1] if first + 1 < len(top.starts) else start
+            self.report('duplicate', top.starts[first], f'duplicate key "{path}", the later one is kept',
+                        (top.starts[first], nxt, ''))
+        top.seen[key] = len(top.starts)
+        top.starts.append(start)
+        top.key = key
+        top.state = COLON
+        top.last_end = end
+
+    def scalar(self, start, end):
+        """A string, number or literal in value position (or as an object key)."""
+        top = self.stack[-1] if self.stack else None
+        if top is not None and top.char == '{' and top.state in (KEY, AFTER_COMMA, COMMA):
+            return 'key'
+        if not self.begin_value(start):
+            return 'junk'
+        self.end_value(end)
+        return 'value'
+
+    # -- main loop -----------------------------------------------------
+
+    def run(self):
+        text = self.text
+        pos = 0
+        n = len(text)
+        while pos < n:
+            m = TOKEN_RE.match(text, pos)
+            kind = m.lastgroup
+            start, end = m.span()
+            pos = end
+            if kind == 'ws':
+                continue
+            if kind == 'comment':
+                self.report('comment', start, 'comments are not allowed in JSON', (start, end, ''))
+            elif kind == 'string':
+                pos = self.string(start, end)
+            elif kind == 'sstring':
+                fixed = json.dumps(text[start + 1:end - 1].replace('\\\'', '\''), ensure_ascii=False)
+                self.report('single-quotes', start, 'strings must use double quotes', (start, end, fixed))
+                self.token(start, end, json.loads(fixed))
+            elif kind == 'literal':
+                self.token(start, end, None)
+            elif kind == 'ident':
+                self.ident(start, end)
+            elif kind == 'punct':
+                self.punct(start, text[start])
+            elif text[start] == '"':
+                pos = self.open_string(start)
+            elif self.done and not self.stack:
+                self.begin_value(start)
+                break
+            else:
+                self.report('stray', start, f'unexpected character {text[start]!r}', (start, end, ''))
+            if self.done and not self.stack and self.problems and self.problems[-1].kind == 'trailing-data':
+                break
+        self.finish()
+        return self.problems
+
+    def token(self, start, end, key):
+        role = self.scalar(start, end)
+        if role == 'key':
+            if key is None:
+                key = self.text[start:end]
+                self.report('unquoted-key', start, f'key {key} must be a double-quoted string',
+                            (start, end, json.dumps(key)))
+            self.key(start, end, key)
+
+    def ident(self, start, end):
+        word = self.text[start:end]
+        top = self.stack[-1] if self.stack else None
+        if top is not None and top.char == '{' and top.state in (KEY, AFTER_COMMA, COMMA):
+            self.token(start, end, None)
+            return
+        fixed = PY_LITERALS.get(word, json.dumps(word))
+        self.report('bad-literal', start, f'{word} is not a JSON value', (start, end, fixed))
+        self.token(start, end, word)
+
+    def in_key_position(self):
+        top = self.stack[-1] if self.stack else None
+        return top is not None and top.char == '{' and top.state in (KEY, AFTER_COMMA, COMMA)
+
+    def _separated(self, pos, key):
+        """True if only a separator (or the end of the line) follows ``pos`` on its line."""
+        m = SEPARATOR_RE.match(self.text, pos)
+        c = m.group(1)
+        return c in ('', '\n', ',', '}', ']') or (key and c == ':')
+
+    def string(self, start, end):
+        """A complete ``"..."`` token; repairs unescaped quotes that split it. Returns the next position."""
+        text = self.text
+        key = self.in_key_position()
+        if not self._separated(end, key) and not NEXT_KEY_RE.match(text, end):
+            line_end = text.find('\n', end)
+            if line_end < 0:
+                line_end = len(text)
+            q = text.find('"', end, line_end)
+            while q >= 0:
+                if self._separated(q + 1, key):
+                    body = _escape_quotes(text, start + 1, q)
+                    self.report('unescaped-quote', end - 1, 'unescaped \'"\' inside a string', (start + 1, q, body))
+                    self.token(start, q + 1, json.loads(f'"{body}"'))
+                    return q + 1
+                q = text.find('"', q + 1, line_end)
+        self.token(start, end, json.loads(text[start:end]))
+        return end
+
+    def open_string(self, start):
+        """A ``"`` whose string runs into the end of the line; close it before any trailing comma."""
+        text = self.text
+        line_end = text.find('\n', start)
+        if line_end < 0:
+            line_end = len(text)
+        close = len(text[start:line_end].rstrip().rstrip(',').rstrip()) + start
+        close = max(close, start + 1)
+        body = _escape_quotes(text, start + 1, close)
+        self.report('unterminated-string', start, 'string is not closed on its line', (start + 1, close, body + '"'))
+        self.token(start, close, json.loads('"' + body + '"'))
+        return close
+
+    def punct(self, start, c):
+        top = self.stack[-1] if self.stack else None
+        if c in '{[':
+            if not self.begin_value(start):
+                return
+            path = top.child_path() if top is not None else ''
+            self.stack.append(_Frame(c, start, path))
+        elif c in '}]':
+            self.close(start, c)
+        elif c == ':':
+            if top is not None and top.char == '{' and top.state == COLON:
+                top.state = VALUE
+            else:
+                self.report('stray', start, "unexpected ':'", (start, start + 1, ''))
+        elif c == ',':
+            if top is None:
+                self.report('stray', start, "unexpected ','", (start, start + 1, ''))
+            elif top.state == COMMA:
+                top.state = AFTER_COMMA if top.char == '{' else VALUE
+                top.comma = start
+                top.index += top.char == '['
+            elif top.state in (AFTER_COMMA, KEY) or (top.char == '[' and top.state == VALUE):
+                self.report('extra-comma', start, "extra ','", (start, start + 1, ''))
+            else:
+                self.report('missing-value', start, f'missing value for "{top.key}"',
+                            (start, start, ': ""' if top.state == COLON else '""'))
+                top.state = AFTER_COMMA
+                top.comma = start
+
+    def close(self, start, c):
+        match = next((i for i in range(len(self.stack) - 1, -1, -1) if self.stack[i].closer == c), None)
+        if match == 0 and start < self.last_content:
+            # Closing the document with content still to come: the closer is the extra one.
+            match = None
+        if match is None:
+            if self.done and not self.stack:
+                self.report('extra-closer', start, f"extra '{c}' after the end of the document", (start, start + 1, ''))
+            else:
+                self.report('extra-closer', start, f"unexpected '{c}'", (start, start + 1, ''))
+            return
+        while len(self.stack) > match + 1:
+            frame = self.stack.pop()
+            self._check_close(frame, start)
+            line, col = self.lines.position(frame.offset)
+            self.report('missing-closer', start, f"missing '{frame.closer}' for the one opened at line {line}, column {col}",
+                        (start, start, frame.closer))
+            self.end_value(start)
+        frame = self.stack.pop()
+        self._check_close(frame, start)
+        self.end_value(start + 1)
+
+    def _check_close(self, frame, start):
+        if frame.state == AFTER_COMMA or (frame.char == '[' and frame.state == VALUE and frame.comma is not None):
+            self.report('trailing-comma', frame.comma, 'trailing comma', (frame.comma, frame.comma + 1, ''))
+        elif frame.state == COLON:
+            self.report('missing-value', start, f'missing value for "{frame.key}"', (frame.last_end, frame.last_end, ': ""'))
+        elif frame.state == VALUE and frame.char == '{':
+            self.report('missing-value', start, f'missing value for "{frame.key}"', (start, start, '""'))
+
+    def finish(self):
+        end = len(self.text.rstrip())
+        if not self.done and not self.stack:
+            self.report('empty', 0, 'the file holds no JSON value', (0, len(self.text), '{}'))
+            return
+        while self.stack:
+            frame = self.stack.pop()
+            self._check_close(frame, end)
+            line, col = self.lines.position(frame.offset)
+            indent = '  ' * len(self.stack)
+            self.report('missing-closer', end, f"missing '{frame.closer}' for the one opened at line {line}, column {col}",
+                        (end, end, f'\n{indent}{frame.closer}'))
+            self.end_value(end)
+
+
+def check_text(text):
+    """Every ``Problem`` in ``text``, in the order they were found."""
+    return _Checker(text).run()
+
+
+def apply_edits(text, problems):
+    """``text`` with the fix of every problem applied; overlapping fixes are skipped."""
+    edits = sorted((p.edit for p in problems), key=lambda e: (e[0], e[1]))
+    out = []
+    pos = 0
+    for start, end, replacement in edits:
+        if start < pos:
+            continue
+        out.append(text[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(text[pos:])
+    return ''.join(out)
+
+
+def context(text, line, radius=2):
+    """``[(line number, text, is_error_line)]`` around the 1-based ``line``."""
+    lines = text.splitlines()
+    start = max(0, line - 1 - radius)
+    end = min(len(lines), line + radius)
+    return [(i + 1, lines[i], i + 1 == line) for i in range(start, end)]
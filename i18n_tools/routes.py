@@ -0,0 +1,166 @@
+"""Static view of the SPA: the import graph of src/ and the routes in src/router.tsx."""
+import collections
+import os
+import re
+
+from .extract import iter_source_files
+from .paths import ROOT, rel
+
+ROUTER_FILE = 'src/router.tsx'
+RESOLVE_SUFFIXES = ('', '.tsx', '.ts', '/index.tsx', '/index.ts')
+
+IMPORT_RE = re.compile(r'''(?:\bfrom\s*|\bimport\s*\(\s*|^\s*import\s+)(['"])(\.[^'"]*)\1''', re.M)
+NAMED_IMPORT_RE = re.compile(r'''\bimport\s+(?:(\w+)\s*,?\s*)?(?:\{([^}]*)\})?\s*from\s*['"](\.[^'"]+)['"]''')
+ROUTE_TOKEN_RE = re.compile(r'''
+    (?P<open>\{) | (?P<close>\})
+  | \bpath\s*:\s*(?P<q>['"])(?P<path>[^'"]*)(?P=q)
+  | \b(?P<index>index)\s*:\s*true
+  | \b(?P<field>element|errorElement|children)\s*:
+  | <(?P<comp>[A-Z]\w*)
+''', re.VERBOSE)
+
+Route = collections.namedtuple('Route', 'path components index')
+
+
+def resolve_import(from_file, spec):
+    base = os.path.normpath(os.path.join(os.path.dirname(from_file), spec))
+    for suffix in RESOLVE_SUFFIXES:
+        candidate = base + suffix
+        if os.path.isfile(candidate) and candidate.endswith(('.ts', '.tsx')):
+            return candidate
+    return None
+
+
+def import_graph(src_dir):
+    """``{file: {imported files}}`` for the relative imports of every source file."""
+    graph = {}
+    for path in iter_source_files(src_dir):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        deps = set()
+        for m in IMPORT_RE.finditer(text):
+            target = resolve_import(path, m.group(2))
+            if target is not None:
+                deps.add(target)
+        graph[path] = deps
+    return graph
+
+
+def closure(graph, roots, stop=()):
+    """Files reachable from ``roots``, not descending into ``stop``."""
+    seen = set()
+    todo = [r for r in roots if r not in stop]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        todo.extend(d for d in graph.get(path, ()) if d not in seen and d not in stop)
+    return seen
+
+
+def component_files(router_path):
+    """``{ComponentName: file}`` from the imports at the top of the router."""
+    with open(router_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    out = {}
+    for m in NAMED_IMPORT_RE.finditer(text):
+        target = resolve_import(router_path, m.group(3))
+        if target is None:
+            continue
+        names = [m.group(1)] if m.group(1) else []
+        for part in (m.group(2) or '').split(','):
+            part = part.strip()
+            if part:
+                names.append(part.split(' as ')[-1].strip())
+        for name in names:
+            out[name] = target
+    return out
+
+
+class _RouteFrame:
+    __slots__ = ('path', 'index', 'field', 'components')
+
+    def __init__(self):
+        self.path = None
+        self.index = False
+        self.field = None
+        self.components = []
+
+
+def _join(parent, path):
+    if path.startswith('/'):
+        return path
+    return f"{parent.rstrip('/')}/{path}" if path else parent
+
+
+def parse_routes(router_path):
+    """Flatten the ``createBrowserRouter`` tree into ``Route(path, components, index)``.
+
+    ``components`` lists the ``element`` components of the route and of every
+    enclosing route, outermost first; ``errorElement`` components are ignored.
+    """
+    with open(router_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    start = text.find('createBrowserRouter(')
+    stack = []
+    routes = []
+    for m in ROUTE_TOKEN_RE.finditer(text, max(start, 0)):
+        top = stack[-1] if stack else None
+        if m.group('open'):
+            stack.append(_RouteFrame())
+        elif m.group('close'):
+            if not stack:
+                continue
+            frame = stack.pop()
+            if frame.path is None and not frame.index:
+                continue
+            path = '/'
+            components = []
+            for outer in stack:
+                if outer.path is not None:
+                    path = _join(path, outer.path)
+                components.extend(outer.components)
+            if frame.path is not None:
+                path = _join(path, frame.path)
+            routes.append(Route(path, components + frame.components, frame.index))
+        elif top is None:
+            continue
+        elif m.group('path') is not None:
+            top.path = m.group('path')
+        elif m.group('index'):
+            top.index = True
+        elif m.group('field'):
+            top.field = m.group('field')
+        elif m.group('comp') and top.field == 'element':
+            top.components.append(m.group('comp'))
+    routes.sort(key=lambda r: r.path)
+    return routes
+
+
+def route_files(root=ROOT, router=ROUTER_FILE):
+    """``{route path: set of source files}`` for every route, plus the shared shell.
+
+    The shell is everything ``main.tsx`` and the root layout pull in; the router
+    itself is excluded so that pages are attributed only to their routes.
+    Returns ``(shell_files, {path: files})`` with repo-relative paths.
+    """
+    src_dir = os.path.join(root, 'src')
+    router_path = os.path.join(root, router)
+    graph = import_graph(src_dir)
+    components = component_files(router_path)
+    routes = parse_routes(router_path)
+
+    stop = {router_path}
+    shell_roots = [p for p in (os.path.join(src_dir, 'main.tsx'),) if p in graph]
+    root_route = next((r for r in routes if r.path == '/' and not r.index), None)
+    if root_route is not None:
+        shell_roots += [components[c] for c in root_route.components if c in components]
+    shell = closure(graph, shell_roots, stop)
+
+    per_route = {}
+    for route in routes:
+        roots = [components[c] for c in route.components if c in components]
+        files = closure(graph, roots, stop | shell)
+        per_route.setdefault(route.path, set()).update(rel(f, root) for f in files)
+    return {rel(f, root) for f in shell}, per_route
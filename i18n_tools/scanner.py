@@ -0,0 +1,50 @@
+"""Linear-time JSON tokenizer that keeps offsets and line/column positions.
+
+``json.loads`` throws positions away and silently keeps the last of any
+duplicate member, so anything that needs to point at the source text works
+from these tokens instead.
+"""
+import json
+import re
+
+WS, STRING, PUNCT, LITERAL, ERROR = 'ws', 'string', 'punct', 'literal', 'error'
+
+TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n]+)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<punct>[{}\[\]:,])
+  | (?P<literal>true|false|null|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<error>.)
+''', re.VERBOSE | re.DOTALL)
+
+
+def iter_tokens(text, skip_ws=True):
+    """Yield ``(kind, start, end, line, col)`` for every token in ``text``.
+
+    Lines and columns are 1-based. Only whitespace can contain newlines in
+    valid JSON, so positions are maintained incrementally in one pass.
+    """
+    line = 1
+    line_start = 0
+    for m in TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        start, end = m.span()
+        if kind == WS:
+            n = text.count('\n', start, end)
+            if n:
+                line += n
+                line_start = text.rindex('\n', start, end) + 1
+            if skip_ws:
+                continue
+        yield kind, start, end, line, start - line_start + 1
+
+
+def decode_string(text, start, end):
+    """Decode the string token ``text[start:end]`` (quotes included)."""
+    if '\\' in text[start:end]:
+        return json.loads(text[start:end])
+    return text[start + 1:end - 1]
+
+
+def join_path(parent, key):
+    return f'{parent}.{key}' if parent else str(key)
@@ -0,0 +1,250 @@
+"""Persistent full-text index over the keys and values of every locale.
+
+Each string leaf is a document holding its dotted key and its value. Terms
+are lowercase Latin words and numbers plus, for CJK text, every character
+and every pair of neighbouring characters, so ``选择城市`` is found through
+``选择``, ``择城`` and ``城市``. Words of the key, split on dots and
+camelCase, are indexed as ``.word``, apart from the value's words, and
+count for less.
+
+A query is tokenized the same way. A query term missing from the index
+falls back to the index terms containing it (``loca`` finds ``location``),
+then to those one or two edits away (``loaction``). Matches are scored by
+the terms' rarity, with weights for how the term matched, and a bonus when
+the query occurs verbatim in the value or the key.
+
+The index of each locales directory is saved to its own
+``.i18n_cache/search-<hash of the directory>.json``. Before each search, any
+locale whose file changed is re-read and only its added, removed and
+changed leaves are re-indexed. A locale with unsaved edits in the store is
+indexed as edited, and re-checked against its file the next time.
+"""
+import collections
+import json
+import math
+import os
+import re
+
+from . import trace
+from .atomic import atomic_write
+from .cache import CACHE_DIR, digest
+
+SEARCH_VERSION = 2
+# Re-number a locale's documents once this share of its ids are deleted.
+COMPACT_RATIO = 0.25
+SUBSTRING_WEIGHT = 0.7
+FUZZY_WEIGHT = 0.4
+VALUE_BONUS = 3.0
+KEY_BONUS = 1.5
+KEY_WEIGHT = 0.6
+
+WORD_RE = re.compile(r'[A-Za-z]+|\d+')
+CAMEL_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+CJK_RUN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+Hit = collections.namedtuple('Hit', 'score lang path value')
+
+
+def search_file(locales_dir, cache_dir=CACHE_DIR):
+    """Where the index of ``locales_dir`` is saved."""
+    return os.path.join(cache_dir, f"search-{digest(os.path.abspath(locales_dir).encode('utf-8'))[:12]}.json")
+
+
+def cjk_terms(text):
+    out = []
+    for run in CJK_RUN_RE.findall(text):
+        out.extend(run)
+        out.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return out
+
+
+def terms(path, value):
+    """The distinct terms of one document."""
+    out = {w.lower() for w in WORD_RE.findall(value)}
+    out.update('.' + w.lower() for part in path.split('.') for w in CAMEL_RE.findall(part))
+    out.update(cjk_terms(value))
+    return out
+
+
+def query_terms(query):
+    """Query terms in order; a CJK run longer than one character contributes only its pairs."""
+    out = [w.lower() for w in WORD_RE.findall(query)]
+    for run in CJK_RUN_RE.findall(query):
+        out.extend(run if len(run) == 1 else (run[i:i + 2] for i in range(len(run) - 1)))
+    return list(dict.fromkeys(out))
+
+
+def within(a, b, limit):
+    """True if the edit distance between ``a`` and ``b`` is at most ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class _Locale:
+    """Documents and postings of one locale; document ids are positions in ``docs``."""
+
+    __slots__ = ('docs', 'ids', 'postings', 'deleted')
+
+    def __init__(self, docs=(), postings=None):
+        self.docs = [tuple(d) if d is not None else None for d in docs]  # [(path, value) or None]
+        self.ids = {d[0]: i for i, d in enumerate(self.docs) if d is not None}
+        self.postings = postings if postings is not None else {}
+        self.deleted = sum(d is None for d in self.docs)
+
+    def add(self, path, value):
+        doc = len(self.docs)
+        self.docs.append((path, value))
+        self.ids[path] = doc
+        for term in terms(path, value):
+            self.postings.setdefault(term, []).append(doc)
+
+    def remove(self, path):
+        doc = self.ids.pop(path)
+        for term in terms(*self.docs[doc]):
+            posting = self.postings[term]
+            posting.remove(doc)
+            if not posting:
+                del self.postings[term]
+        self.docs[doc] = None
+        self.deleted += 1
+
+    def update(self, index):
+        """Bring the documents in line with a ``FlatIndex``; ``(added, removed)`` counts."""
+        values = {path: value for path, value in index.items() if isinstance(value, str) and value}
+        removed = [p for p in self.ids if values.get(p) != self.docs[self.ids[p]][1]]
+        for path in removed:
+            self.remove(path)
+        added = [p for p in values if p not in self.ids]
+        if self.deleted > COMPACT_RATIO * max(len(self.docs), 1):
+            self.__init__()
+            added = list(values)
+        for path in added:
+            self.add(path, values[path])
+        return len(added), len(removed)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class SearchIndex:
+    """``{lang: _Locale}`` plus the ``(mtime_ns, size, sha1)`` of each locale file it reflects."""
+
+    def __init__(self, path):
+        self.path = path
+        self.locales = {}
+        self.files = {}
+        self._changed = False
+
+    def load(self):
+        try:
+            with trace.span('search-load'), open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if stored.get('version') == SEARCH_VERSION:
+            self.files = stored['files']
+            self.locales = {lang: _Locale(d['docs'], d['postings']) for lang, d in stored['locales'].items()}
+        return self
+
+    def save(self):
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with trace.span('search-save'):
+            atomic_write(self.path, json.dumps({'version': SEARCH_VERSION, 'files': self.files,
+                                                'locales': {lang: {'docs': loc.docs, 'postings': loc.postings}
+                                                            for lang, loc in self.locales.items()}},
+                                               ensure_ascii=False, separators=(',', ':')))
+        self._changed = False
+
+    def refresh(self, store, langs):
+        """Re-index the locales in ``langs`` whose files or unsaved data changed; ``{lang: (added, removed)}``."""
+        out = {}
+        dirty = set(store.dirty)
+        for lang in langs:
+            if lang in dirty:
+                with trace.span('search-index', lang=lang):
+                    out[lang] = self.locales.setdefault(lang, _Locale()).update(store.index(lang))
+                # The documents no longer match the file; the next refresh compares them with it again.
+                self.files.pop(lang, None)
+                self._changed = True
+                continue
+            path = store.path(lang)
+            st = os.stat(path)
+            entry = self.files.get(lang)
+            if entry is not None and entry[:2] == [st.st_mtime_ns, st.st_size] and lang in self.locales:
+                continue
+            sha1 = digest(store.text(lang).encode('utf-8'))
+            if entry is None or entry[2] != sha1 or lang not in self.locales:
+                with trace.span('search-index', lang=lang):
+                    out[lang] = self.locales.setdefault(lang, _Locale()).update(store.index(lang))
+            self.files[lang] = [st.st_mtime_ns, st.st_size, sha1]
+            self._changed = True
+        return out
+
+    def _expand(self, locale, term, fuzzy):
+        """``[(index term, weight)]`` for one query term, in the value and in the key."""
+        if CJK_RUN_RE.match(term):
+            return [(term, 1.0)] if term in locale.postings else []
+        exact = [(t, w) for t, w in ((term, 1.0), ('.' + term, KEY_WEIGHT)) if t in locale.postings]
+        if exact:
+            return exact
+        found = []
+        for t in locale.postings:
+            word = t[1:] if t[0] == '.' else t
+            if term in word:
+                found.append((t, SUBSTRING_WEIGHT * len(term) / len(word) * (KEY_WEIGHT if t[0] == '.' else 1.0)))
+        if found or not fuzzy or len(term) < 4:
+            return found
+        limit = 1 if len(term) < 8 else 2
+        for t in locale.postings:
+            word = t[1:] if t[0] == '.' else t
+            if word[:1] == term[:1] and within(term, word, limit):
+                found.append((t, FUZZY_WEIGHT * (KEY_WEIGHT if t[0] == '.' else 1.0)))
+        return found
+
+    def search(self, query, langs=None, limit=20, fuzzy=True):
+        """``[Hit]`` best first; a document must match at least half of the query terms."""
+        qterms = query_terms(query)
+        needle = query.strip().lower()
+        hits = []
+        for lang in langs or self.locales:
+            locale = self.locales.get(lang)
+            if locale is None or not qterms:
+                continue
+            n = max(len(locale), 1)
+            scores = {}
+            matched = collections.Counter()
+            for term in qterms:
+                best = {}
+                for t, weight in self._expand(locale, term, fuzzy):
+                    posting = locale.postings[t]
+                    score = weight * math.log(1 + n / len(posting))
+                    for doc in posting:
+                        if score > best.get(doc, 0.0):
+                            best[doc] = score
+                for doc, score in best.items():
+                    scores[doc] = scores.get(doc, 0.0) + score
+                    matched[doc] += 1
+            need = (len(qterms) + 1) // 2
+            for doc, score in scores.items():
+                if matched[doc] < need:
+                    continue
+                path, value = locale.docs[doc]
+                folded = value.lower()
+                if needle and needle in folded:
+                    score += VALUE_BONUS + (VALUE_BONUS if folded == needle else 0.0)
+                if needle and needle in path.lower():
+                    score += KEY_BONUS + (2 * VALUE_BONUS if path.lower() == needle else 0.0)
+                hits.append(Hit(round(score, 3), lang, path, value))
+        hits.sort(key=lambda h: (-h.score, h.lang, h.path))
+        return hits[:limit] if limit else hits
@@ -0,0 +1,104 @@
+"""Strings repeated under several keys, and what sharing them would save.
+
+``ValueIndex`` interns every string leaf of each locale: each distinct
+string gets one id, and each locale maps ids to the paths holding that
+string. Any string held by two or more paths is a duplicate group.
+
+``rank`` starts from the groups of the reference locale. Every other copy
+of the same English text ships again in each locale and is translated
+again, so a group of ``n`` paths saves:
+
+``bytes``   ``n - 1`` copies of the UTF-8 value in every locale where the
+            paths agree, counted per distinct translation where they do not
+``effort``  ``n - 1`` translations of its words into each other locale
+
+A group whose paths hold different values in another locale is flagged as
+inconsistent: either one translation is wrong or the keys mean different
+things and must stay apart.
+"""
+import collections
+import re
+
+WORD_RE = re.compile(r'\w+')
+
+Group = collections.namedtuple('Group', 'text paths bytes effort translations')
+
+
+def words(text):
+    return len(WORD_RE.findall(text))
+
+
+class ValueIndex:
+    """Interned string leaves of several locales."""
+
+    __slots__ = ('strings', 'ids', 'paths')
+
+    def __init__(self, indexes=None):
+        self.strings = []  # id -> string
+        self.ids = {}  # string -> id
+        self.paths = {}  # lang -> {id: [path]}
+        for lang, index in (indexes or {}).items():
+            self.add(lang, index)
+
+    def intern(self, value):
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+    def add(self, lang, index):
+        """Intern the string leaves of a ``FlatIndex``; empty strings are skipped."""
+        by_id = self.paths[lang] = {}
+        for path, value in index.items():
+            if isinstance(value, str) and value:
+                by_id.setdefault(self.intern(value), []).append(path)
+
+    def groups(self, lang, min_count=2):
+        """``{string: [path]}`` for the strings of ``lang`` held by at least ``min_count`` paths."""
+        return {self.strings[sid]: paths for sid, paths in self.paths[lang].items() if len(paths) >= min_count}
+
+    def duplicated(self, lang):
+        """``(groups, keys, bytes)``: repeated strings in ``lang``, the keys holding them, the repeats' size."""
+        groups = keys = size = 0
+        for sid, paths in self.paths[lang].items():
+            if len(paths) > 1:
+                groups += 1
+                keys += len(paths)
+                size += (len(paths) - 1) * len(self.strings[sid].encode('utf-8'))
+        return groups, keys, size
+
+    def __len__(self):
+        return len(self.strings)
+
+
+def rank(indexes, reference, min_count=2, values=None):
+    """``[Group]`` for the reference locale's duplicate strings, best savings first.
+
+    ``translations`` maps each other locale to ``{value: [path]}`` for the
+    group's paths; more than one value there is an inconsistency. ``values``
+    is the ``ValueIndex`` of ``indexes`` if one is already built.
+    """
+    values = values if values is not None else ValueIndex(indexes)
+    others = [lang for lang in indexes if lang != reference]
+    out = []
+    for text, paths in values.groups(reference, min_count).items():
+        saved = (len(paths) - 1) * len(text.encode('utf-8'))
+        translations = {}
+        for lang in others:
+            by_value = {}
+            for path in paths:
+                value = indexes[lang].get(path)
+                if isinstance(value, str) and value:
+                    by_value.setdefault(value, []).append(path)
+            translations[lang] = by_value
+            saved += sum((len(p) - 1) * len(v.encode('utf-8')) for v, p in by_value.items())
+        effort = (len(paths) - 1) * words(text) * len(others)
+        out.append(Group(text, paths, saved, effort, translations))
+    out.sort(key=lambda g: (-g.bytes, -g.effort, g.text))
+    return out
+
+
+def inconsistent(groups):
+    """``[(group, lang)]`` where the group's paths hold more than one value in ``lang``."""
+    return [(g, lang) for g in groups for lang, by_value in g.translations.items() if len(by_value) > 1]
@@ -0,0 +1,160 @@
+"""Format-preserving locale writer.
+
+Instead of re-serializing a whole locale, ``splice`` compares the data that
+was parsed from a file with the data to be written, and edits only the byte
+spans that differ: changed values are replaced, removed members are cut out
+together with their comma, and new members are inserted after the member
+that precedes them in the new data. Everything else, including hand-made
+layout, is copied through unchanged.
+
+Equal subtrees are skipped with one C-level ``==``. Only the objects along a
+changed path are located in the text, one member at a time with
+``JSONDecoder.raw_decode``, so the Python-level work grows with the size of
+the edit rather than the size of the file. If the keys an object shares with
+the new data are in a different order, that one object is re-serialized.
+"""
+import json
+
+INDENT = '  '
+
+_decoder = json.JSONDecoder()
+_WS = ' \t\r\n'
+
+
+def _skip_ws(text, i):
+    while i < len(text) and text[i] in _WS:
+        i += 1
+    return i
+
+
+class _Member:
+    __slots__ = ('key', 'key_start', 'value_start', 'value_end')
+
+    def __init__(self, key, key_start, value_start, value_end):
+        self.key = key
+        self.key_start = key_start
+        self.value_start = value_start
+        self.value_end = value_end
+
+
+def members(text, start):
+    """``(members, end)`` for the object whose ``{`` is at ``text[start]``."""
+    out = []
+    i = _skip_ws(text, start + 1)
+    if text[i] == '}':
+        return out, i + 1
+    while True:
+        key, key_end = _decoder.raw_decode(text, i)
+        j = _skip_ws(text, key_end)
+        value_start = _skip_ws(text, j + 1)
+        _, value_end = _decoder.raw_decode(text, value_start)
+        out.append(_Member(key, i, value_start, value_end))
+        i = _skip_ws(text, value_end)
+        if text[i] == '}':
+            return out, i + 1
+        i = _skip_ws(text, i + 1)
+
+
+def _line_indent(text, pos):
+    """Whitespace between the start of the line holding ``pos`` and ``pos``."""
+    line_start = text.rfind('\n', 0, pos) + 1
+    indent = text[line_start:pos]
+    return indent if not indent.strip() else None
+
+
+def _dump(value, indent):
+    """``value`` in the indent=2 layout, continuation lines prefixed with ``indent``."""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + indent)
+
+
+def _member_text(key, value, indent):
+    return f'{json.dumps(key, ensure_ascii=False)}: {_dump(value, indent)}'
+
+
+def _object_edits(text, start, old, new, indent, edits):
+    """Append ``(start, end, replacement)`` edits turning the object at ``start`` from ``old`` into ``new``."""
+    spans, end = members(text, start)
+    shared_old = [k for k in old if k in new]
+    shared_new = [k for k in new if k in old]
+    if not spans or not shared_new or shared_old != shared_new:
+        edits.append((start, end, _dump(new, indent)))
+        return
+    inner = _line_indent(text, spans[0].key_start)
+    if inner is None:
+        inner = indent + INDENT
+    last = {}
+    for i, m in enumerate(spans):
+        last[m.key] = i
+
+    # Cut runs of removed members along with the comma that separated them.
+    removed = [m.key not in new for m in spans]
+    i = 0
+    while i < len(spans):
+        if not removed[i]:
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(spans) and removed[j + 1]:
+            j += 1
+        if i > 0:
+            edits.append((spans[i - 1].value_end, spans[j].value_end, ''))
+        else:
+            edits.append((spans[0].key_start, spans[j + 1].key_start, ''))
+        i = j + 1
+
+    # Changed values of members kept on both sides.
+    for key in shared_new:
+        a, b = old[key], new[key]
+        if a == b:
+            continue
+        m = spans[last[key]]
+        if isinstance(a, dict) and isinstance(b, dict):
+            _object_edits(text, m.value_start, a, b, inner, edits)
+        else:
+            edits.append((m.value_start, m.value_end, _dump(b, inner)))
+
+    # New members go after the member that precedes them in ``new``.
+    anchor = None
+    pending = []
+    for key in [*new, None]:
+        if key is not None and key not in old:
+            pending.append(key)
+            continue
+        if pending:
+            body = f',\n{inner}'.join(_member_text(k, new[k], inner) for k in pending)
+            if anchor is None:
+                edits.append((spans[0].key_start, spans[0].key_start, f'{body},\n{inner}'))
+            else:
+                pos = spans[last[anchor]].value_end
+                edits.append((pos, pos, f',\n{inner}{body}'))
+            pending = []
+        anchor = key
+
+
+def copy_data(value):
+    """Copy of parsed JSON to edit while ``value`` stays the splice base; strings and numbers are shared."""
+    if isinstance(value, dict):
+        return {k: copy_data(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_data(v) for v in value]
+    return value
+
+
+def splice(text, old, new):
+    """``text`` (which parses to ``old``) edited so that it parses to ``new``."""
+    if old == new:
+        return text
+    start = _skip_ws(text, 0)
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return text[:start] + _dump(new, '') + text[len(text.rstrip()):]
+    edits = []
+    _object_edits(text, start, old, new, '', edits)
+    edits.sort(key=lambda e: (e[0], e[1]))
+    out = []
+    pos = 0
+    for s, e, replacement in edits:
+        out.append(text[pos:s])
+        out.append(replacement)
+        pos = max(pos, e)
+    out.append(text[pos:])
+    return ''.join(out)
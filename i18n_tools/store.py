@@ -0,0 +1,259 @@
+"""Shared in-memory model of the locale files.
+
+Every locale is read and parsed at most once per process. Operations mutate the
+parsed dicts in place and call ``mark_dirty``; ``save`` then writes each dirty
+file exactly once, no matter how many operations touched it. Writes splice the
+changes into the original text (see ``splice.py``) unless a locale was marked
+for normalization. The splice compares with the data parsed at load time, which
+is kept for that; only a locale edited in place has its text parsed again.
+
+``map`` runs a function over several locales, for work whose cost grows with
+the number of locales. A few locales are handled in this process on the
+store's own parsed data; only with ``MIN_PARALLEL_LOCALES`` or more does each
+go to a worker process as text.
+"""
+import functools
+import json
+import os
+
+from . import trace
+from .atomic import LocaleTransaction
+from .index import FlatIndex
+from .parallel import locale_workers, map_locales
+from .paths import DEFAULT_LOCALES, LOCALES_DIR, locale_path
+from .splice import copy_data, splice
+from .tree import LocaleTree
+
+
+class LocaleError(Exception):
+    """A locale file is missing or is not valid JSON."""
+
+    def __init__(self, lang, path, error):
+        self.lang = lang
+        self.path = path
+        self.error = error
+        super().__init__(f'{path}: {error}')
+
+    def __reduce__(self):
+        return type(self), (self.lang, self.path, self.error)
+
+
+def dump_locale(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _on_text(func, view, lang, locale):
+    """A ``LocaleStore.map`` task in a worker process: parse the text ``locale`` there first."""
+    data = json.loads(locale)
+    return func(lang, locale=FlatIndex(data) if view == 'index' else data)
+
+
+class LocaleStore:
+    def __init__(self, langs=DEFAULT_LOCALES, locales_dir=LOCALES_DIR, reference=None):
+        self.langs = tuple(langs)
+        self.reference = reference or self.langs[0]
+        self.locales_dir = locales_dir
+        self._data = {}
+        self._text = {}
+        self._disk = {}
+        self._base = {}
+        self._index = {}
+        self._tree = {}
+        self._dirty = set()
+        self._normalize = set()
+
+    def path(self, lang):
+        return locale_path(lang, self.locales_dir)
+
+    def text(self, lang):
+        """Raw file contents, read once and shared with the data loader."""
+        if lang not in self._text:
+            try:
+                with trace.span('read', lang=lang), open(self.path(lang), 'r', encoding='utf-8') as f:
+                    self._text[lang] = f.read()
+                    trace.add_bytes(read=os.fstat(f.fileno()).st_size)
+            except OSError as e:
+                raise LocaleError(lang, self.path(lang), e) from e
+        return self._text[lang]
+
+    def set_text(self, lang, text):
+        """Replace the raw text of ``lang`` (e.g. a repaired file) and schedule it for writing."""
+        current = self.text(lang)
+        self._disk.setdefault(lang, current)
+        self._text[lang] = text
+        self._data.pop(lang, None)
+        self._base.pop(lang, None)
+        self._tree.pop(lang, None)
+        self._index.pop(lang, None)
+        self._dirty.add(lang)
+
+    def __getitem__(self, lang):
+        if lang not in self._data and lang in self._tree:
+            self._data[lang] = self._tree.pop(lang).to_data()
+        if lang not in self._data and lang in self._base:
+            self._data[lang] = self._base[lang]
+        if lang not in self._data:
+            text = self.text(lang)
+            try:
+                with trace.span('parse', lang=lang):
+                    self._data[lang] = self._base[lang] = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise LocaleError(lang, self.path(lang), e) from e
+        return self._data[lang]
+
+    def edit(self, lang):
+        """Parsed data of ``lang`` to change in place; the parsed original stays intact for splicing."""
+        data = self[lang]
+        if data is self._base.get(lang):
+            with trace.span('copy', lang=lang):
+                data = self._data[lang] = copy_data(data)
+        return data
+
+    def draft(self, lang):
+        """Copy of the parsed data of ``lang`` to change without touching the store; see ``set_data``."""
+        data = self[lang]
+        with trace.span('copy', lang=lang):
+            return copy_data(data)
+
+    def set_data(self, lang, data):
+        """Take ``data``, edited outside the store (e.g. in a worker), as ``lang`` and schedule it for writing."""
+        self.text(lang)
+        self._tree.pop(lang, None)
+        self._data[lang] = data
+        self.mark_dirty(lang)
+
+    def tree(self, lang):
+        """``LocaleTree`` of the locale for structural edits.
+
+        Consecutive tree operations share one tree; the next dict access
+        converts it back, so mixing the two costs one conversion per switch.
+        """
+        if lang not in self._tree:
+            self._tree[lang] = LocaleTree(self[lang])
+            del self._data[lang]
+            self._index.pop(lang, None)
+        return self._tree[lang]
+
+    def index(self, lang):
+        """``FlatIndex`` of the locale, rebuilt only after it was marked dirty."""
+        if lang not in self._index:
+            data = self[lang]
+            with trace.span('flatten', lang=lang):
+                self._index[lang] = FlatIndex(data)
+        return self._index[lang]
+
+    def current_text(self, lang):
+        """The text ``lang`` would be saved as, in-memory changes included."""
+        if lang in self._dirty:
+            return self._serialize(lang, self._text.get(lang))
+        return self.text(lang)
+
+    def map(self, func, langs, workers=None, view='data'):
+        """``{lang: func(lang, locale=...)}``, in a process pool when there are enough locales.
+
+        ``locale`` is the parsed data for ``view='data'``, a copy of it to
+        change for ``'edit'`` (see ``draft``), or its ``FlatIndex`` for
+        ``'index'``. In this process the data and index are the store's own;
+        in a worker they are parsed from the current text. Either way an
+        ``'edit'`` task leaves the store as it was and returns its data for
+        ``set_data``. ``func`` must be picklable. A locale that is not valid
+        JSON raises ``LocaleError``.
+        """
+        langs = list(dict.fromkeys(langs))
+        workers = locale_workers(len(langs), workers)
+        if workers <= 1:
+            load = {'data': self.__getitem__, 'edit': self.draft, 'index': self.index}[view]
+            return map_locales(func, {lang: load(lang) for lang in langs})
+        texts = {lang: self.current_text(lang) for lang in langs}
+        try:
+            return map_locales(functools.partial(_on_text, func, view), texts, workers)
+        except json.JSONDecodeError as e:
+            lang = next(lang for lang, text in texts.items() if text == e.doc)
+            raise LocaleError(lang, self.path(lang), e) from e
+
+    def __iter__(self):
+        return iter(self.langs)
+
+    def items(self):
+        for lang in self.langs:
+            yield lang, self[lang]
+
+    def loaded(self, lang):
+        return lang in self._data or lang in self._tree
+
+    def mark_dirty(self, lang, normalize=False):
+        """Schedule ``lang`` for writing; ``normalize`` rewrites it in the canonical layout."""
+        if not self.loaded(lang):
+            raise KeyError(f'locale {lang!r} was never loaded')
+        self._dirty.add(lang)
+        if normalize:
+            self._normalize.add(lang)
+        if self._data.get(lang) is self._base.get(lang):
+            # Edited in place: the parsed original is gone and is parsed again on save.
+            del self._base[lang]
+        self._index.pop(lang, None)
+
+    def discard(self, lang):
+        """Drop in-memory changes; the locale is re-parsed from its text on next use."""
+        self._data.pop(lang, None)
+        self._tree.pop(lang, None)
+        self._index.pop(lang, None)
+        self._dirty.discard(lang)
+        self._normalize.discard(lang)
+        if lang in self._disk:
+            self._text[lang] = self._disk.pop(lang)
+            self._base.pop(lang, None)
+
+    def reload(self, lang):
+        """Forget ``lang`` entirely, text included; the next access reads the file again."""
+        self.discard(lang)
+        self._text.pop(lang, None)
+        self._base.pop(lang, None)
+
+    @property
+    def dirty(self):
+        return sorted(self._dirty)
+
+    def pending(self):
+        """Serialized text of each dirty locale whose content actually changed."""
+        out = {}
+        for lang in self.langs:
+            if lang in self._dirty:
+                base = self._text.get(lang)
+                with trace.span('serialize', lang=lang):
+                    text = self._serialize(lang, base)
+                if text != self._disk.get(lang, base):
+                    out[lang] = text
+        return out
+
+    def _serialize(self, lang, base):
+        if base is None or lang in self._normalize:
+            return dump_locale(self[lang])
+        if self.loaded(lang):
+            data = self[lang]
+            return splice(base, self._original(lang), data)
+        return base
+
+    def _original(self, lang):
+        """The parsed text of ``lang`` before any edit, kept from load time when it is intact."""
+        if lang not in self._base:
+            with trace.span('parse', lang=lang):
+                self._base[lang] = json.loads(self._text[lang])
+        return self._base[lang]
+
+    def save(self):
+        """Write every changed locale once, all or none, and return the paths written."""
+        written = []
+        pending = self.pending()
+        if pending:
+            with trace.span('write'), LocaleTransaction(self.locales_dir) as tx:
+                for lang, text in pending.items():
+                    tx.write(self.path(lang), text)
+            for lang, text in pending.items():
+                self._text[lang] = text
+                self._base[lang] = self[lang]
+                written.append(self.path(lang))
+        self._dirty.clear()
+        self._normalize.clear()
+        self._disk.clear()
+        return written
@@ -0,0 +1,121 @@
+"""Precompiled interpolation templates and placeholder parity.
+
+Every string value is tokenized once into literal and ``{{placeholder}}``
+segments. A value without placeholders compiles to itself. A value with
+placeholders compiles to a list that alternates literal and placeholder
+name, always starting and ending with a literal::
+
+    "Redirecting in {{count}}s..."  ->  ["Redirecting in ", "count", "s..."]
+
+src/i18n/format.ts, an i18next ``i18nFormat`` module, turns such a list back
+into a string by concatenation, so no regex runs at render time, and returns
+plain strings as they are. Values that use i18next features the formatter
+does not implement (``{{value, format}}``, ``{{- raw}}``, ``$t(nested)``) are
+counted as ``dynamic`` and left out of the compiled messages, so i18next
+interpolates them itself.
+
+``check_parity`` compares the placeholder names of every key present in two
+locales. A translation that drops or invents a placeholder renders a raw
+``{{...}}`` or loses a value.
+"""
+import collections
+import json
+import os
+import re
+
+PLACEHOLDER_RE = re.compile(r'\{\{(.*?)\}\}')
+NAME_RE = re.compile(r'\s*([\w.]+)\s*$')
+COMPILED_DIR = os.path.join('public', 'locales', 'compiled')
+COMPILED_VERSION = 2
+
+Template = collections.namedtuple('Template', 'segments names dynamic')
+Mismatch = collections.namedtuple('Mismatch', 'path lang missing extra')
+
+
+def parse(value):
+    """``Template`` for one string: segments as described above, the placeholder names in order."""
+    if '{{' not in value and '$t(' not in value:
+        return Template(value, (), False)
+    segments = []
+    names = []
+    dynamic = '$t(' in value
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(value):
+        name = NAME_RE.match(m.group(1))
+        if name is None:
+            dynamic = True
+            names.append(m.group(1).lstrip('- ').split(',')[0].strip())
+            continue
+        segments.append(value[pos:m.start()])
+        segments.append(name.group(1))
+        names.append(name.group(1))
+        pos = m.end()
+    if dynamic or not names:
+        return Template(value, tuple(names), dynamic)
+    segments.append(value[pos:])
+    return Template(segments, tuple(names), False)
+
+
+def compile_index(index):
+    """``({dotted key: compiled value}, stats)`` for the string leaves of a ``FlatIndex``.
+
+    Dynamic values are left out, and so are other leaves (numbers, arrays),
+    since a list would read as a template.
+    """
+    messages = {}
+    stats = collections.Counter()
+    for path, value in index.items():
+        if not isinstance(value, str):
+            stats['skipped'] += 1
+            continue
+        template = parse(value)
+        if template.dynamic:
+            stats['dynamic'] += 1
+            continue
+        messages[path] = template.segments
+        stats['templates' if isinstance(template.segments, list) else 'plain'] += 1
+    return messages, stats
+
+
+def resource(lang, messages):
+    """The precompiled resource file for one locale."""
+    return {'version': COMPILED_VERSION, 'lang': lang, 'messages': messages}
+
+
+def resource_text(lang, messages):
+    return json.dumps(resource(lang, messages), ensure_ascii=False, separators=(',', ':'))
+
+
+def placeholder_names(index):
+    """``{path: frozenset(names)}`` for every string leaf that has placeholders."""
+    out = {}
+    for path, value in index.items():
+        if isinstance(value, str) and '{{' in value:
+            names = parse(value).names
+            if names:
+                out[path] = frozenset(names)
+    return out
+
+
+def check_parity(indexes, reference):
+    """``[Mismatch]`` for keys whose placeholder names differ from ``reference``.
+
+    Only keys present in both locales are compared; absent keys are ``diff``'s job.
+    """
+    ref_index = indexes[reference]
+    ref_names = placeholder_names(ref_index)
+    out = []
+    for lang, index in indexes.items():
+        if lang == reference:
+            continue
+        names = placeholder_names(index)
+        for path in ref_names.keys() | names.keys():
+            value = index.get(path)
+            if not isinstance(value, str) or not isinstance(ref_index.get(path), str):
+                continue
+            want = ref_names.get(path, frozenset())
+            have = names.get(path, frozenset())
+            if want != have:
+                out.append(Mismatch(path, lang, sorted(want - have), sorted(have - want)))
+    out.sort(key=lambda m: (m.lang, m.path))
+    return out
@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+from i18n_tools.atomic import JOURNAL_FILE, LocaleTransaction, atomic_write, recover
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def locales(tmp_path):
+    for name in ('en.json', 'zh.json'):
+        (tmp_path / name).write_text('old', encoding='utf-8')
+    return tmp_path
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = tmp_path / 'en.json'
+    atomic_write(str(path), 'first')
+    atomic_write(str(path), 'second')
+    assert read(path) == 'second'
+    assert os.listdir(tmp_path) == ['en.json']
+
+
+def test_transaction_commits_every_file(locales):
+    with LocaleTransaction(str(locales)) as tx:
+        tx.write(str(locales / 'en.json'), 'new')
+        tx.write(str(locales / 'zh.json'), 'new')
+    assert read(locales / 'en.json') == read(locales / 'zh.json') == 'new'
+    assert sorted(os.listdir(locales)) == ['.i18n.lock', 'en.json', 'zh.json']
+
+
+def test_exception_rolls_back(locales):
+    with pytest.raises(RuntimeError):
+        with LocaleTransaction(str(locales)) as tx:
+            tx.write(str(locales / 'en.json'), 'new')
+            raise RuntimeError
+    assert read(locales / 'en.json') == 'old'
+    assert sorted(os.listdir(locales)) == ['.i18n.lock', 'en.json', 'zh.json']
+
+
+def test_write_outside_the_directory_is_refused(locales, tmp_path_factory):
+    other = tmp_path_factory.mktemp('other') / 'en.json'
+    with LocaleTransaction(str(locales)) as tx:
+        with pytest.raises(ValueError):
+            tx.write(str(other), 'new')
+
+
+def crash_after(locales, replaced):
+    """Leave the directory as a commit that died after replacing ``replaced`` files."""
+    entries = []
+    for name in ('en.json', 'zh.json', 'ja.json'):
+        target = str(locales / name)
+        tmp = str(locales / f'.{name}.x.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write('new')
+        backup = None
+        if os.path.exists(target):
+            backup = f'{tmp}.bak'
+            os.link(target, backup)
+        entries.append({'target': target, 'backup': backup, 'tmp': tmp})
+    (locales / JOURNAL_FILE).write_text(json.dumps(entries), encoding='utf-8')
+    for entry in entries[:replaced]:
+        os.replace(entry['tmp'], entry['target'])
+
+
+def test_recovery_restores_a_half_done_commit(locales):
+    crash_after(locales, 2)
+    assert read(locales / 'en.json') == 'new'
+    assert sorted(recover(str(locales))) == [str(locales / 'en.json'), str(locales / 'zh.json')]
+    assert read(locales / 'en.json') == read(locales / 'zh.json') == 'old'
+    assert sorted(os.listdir(locales)) == ['en.json', 'zh.json']
+
+
+def test_recovery_removes_files_the_commit_created(locales):
+    crash_after(locales, 3)
+    recover(str(locales))
+    assert not (locales / 'ja.json').exists()
+
+
+def test_recovery_keeps_a_commit_whose_journal_is_gone(locales):
+    crash_after(locales, 3)
+    os.unlink(locales / JOURNAL_FILE)
+    assert recover(str(locales)) == []
+    assert read(locales / 'en.json') == read(locales / 'ja.json') == 'new'
+    assert sorted(os.listdir(locales)) == ['en.json', 'ja.json', 'zh.json']
+
+
+def test_lock_recovers_before_the_next_transaction(locales):
+    crash_after(locales, 1)
+    with LocaleTransaction(str(locales)) as tx:
+        assert read(locales / 'en.json') == 'old'
+        tx.write(str(locales / 'zh.json'), 'newer')
+    assert read(locales / 'en.json') == 'old'
+    assert read(locales / 'zh.json') == 'newer'
@@ -0,0 +1,58 @@
+import json
+
+from i18n_tools.bench import PHASES, compare, generate_locales, generate_sources, run_benchmarks
+from i18n_tools.cli import main
+from i18n_tools.diff import diff_locales, summarize
+from i18n_tools.extract import extract_paths, is_pattern
+from i18n_tools.index import FlatIndex
+
+
+def test_generated_locales_are_reproducible_and_nearly_parallel():
+    en, zh = generate_locales(2_000, seed=3)
+    assert (en, zh) == generate_locales(2_000, seed=3)
+    assert en != generate_locales(2_000, seed=4)[0]
+    en_index = FlatIndex(en)
+    assert 1_900 <= len(en_index) <= 2_000
+    counts = summarize(diff_locales({'en': en_index, 'zh': FlatIndex(zh)}, 'en'))['zh']
+    assert counts['conflict'] == counts['type'] == 0
+    assert 0 < counts['missing'] < 100 and 0 < counts['extra'] < 100
+
+
+def test_generated_sources_use_the_given_keys(tmp_path):
+    index = FlatIndex(generate_locales(500)[0])
+    paths = generate_sources(str(tmp_path), index.keys, 10)
+    assert len(paths) == 10
+    used = extract_paths(paths, workers=1, root=str(tmp_path))
+    assert used
+    assert all(index.is_branch(k.rsplit('.', 1)[0]) if is_pattern(k) else k in index for k in used)
+
+
+def test_every_phase_is_timed_at_every_size():
+    results = run_benchmarks((100, 300), PHASES, repeat=1, workers=1)
+    assert [(r['phase'], r['size']) for r in results['results']] == \
+        [(phase, n) for n in (100, 300) for phase in PHASES]
+    assert all(r['seconds'] >= 0 for r in results['results'])
+
+
+def test_only_slowdowns_beyond_threshold_and_noise_count():
+    baseline = {'results': [{'phase': 'parse', 'size': 1, 'seconds': 0.1},
+                            {'phase': 'diff', 'size': 1, 'seconds': 0.001},
+                            {'phase': 'write', 'size': 1, 'seconds': 0.1}]}
+    results = {'results': [{'phase': 'parse', 'size': 1, 'seconds': 0.2},
+                           {'phase': 'diff', 'size': 1, 'seconds': 0.003},
+                           {'phase': 'write', 'size': 1, 'seconds': 0.11},
+                           {'phase': 'patch', 'size': 1, 'seconds': 9.0}]}
+    assert compare(results, baseline) == [('parse', 1, 0.1, 0.2)]
+
+
+def test_bench_writes_results_and_checks_the_baseline(tmp_path, capsys):
+    (tmp_path / 'base.json').write_text(json.dumps(
+        {'results': [{'phase': 'parse', 'size': 100, 'seconds': 0.0}]}), encoding='utf-8')
+    args = ['--root', str(tmp_path), 'bench', '--sizes', '100', '--phase', 'parse', '--phase', 'flatten',
+            '--repeat', '1', '--out', 'out/results.json']
+    assert main(args) == 0
+    results = json.loads((tmp_path / 'out' / 'results.json').read_text(encoding='utf-8'))
+    assert [r['phase'] for r in results['results']] == ['parse', 'flatten']
+    capsys.readouterr()
+    assert main(args + ['--baseline', 'base.json', '--threshold', '1000000']) == 0
+    assert 'No case is more than' in capsys.readouterr().out
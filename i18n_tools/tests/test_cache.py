@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from i18n_tools.cache import FileCache, digest
+from i18n_tools.extract import EXTRACT_VERSION, extract_paths, scan_file
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in ('A.tsx', 'B.tsx'):
+        (src / name).write_text(f"t('{name[0].lower()}.title');", encoding='utf-8')
+    return tmp_path
+
+
+def cache(tree):
+    return FileCache('extract', EXTRACT_VERSION, cache_dir=str(tree / 'cache'), root=str(tree))
+
+
+def paths(tree):
+    return sorted(str(p) for p in (tree / 'src').iterdir())
+
+
+def test_second_run_hits_the_cache(tree):
+    first = cache(tree)
+    assert sorted(extract_paths(paths(tree), cache=first, root=str(tree))) == ['a.title', 'b.title']
+    assert (first.hits, first.misses) == (0, 2)
+    second = cache(tree)
+    assert sorted(extract_paths(paths(tree), cache=second, root=str(tree))) == ['a.title', 'b.title']
+    assert (second.hits, second.misses) == (2, 0)
+
+
+def test_edited_file_is_rescanned(tree):
+    extract_paths(paths(tree), cache=cache(tree), root=str(tree))
+    (tree / 'src' / 'A.tsx').write_text("t('a.renamed');", encoding='utf-8')
+    again = cache(tree)
+    assert sorted(extract_paths(paths(tree), cache=again, root=str(tree))) == ['a.renamed', 'b.title']
+    assert (again.hits, again.misses) == (1, 1)
+
+
+def test_touched_but_unchanged_file_is_hashed_not_rescanned(tree):
+    extract_paths(paths(tree), cache=cache(tree), root=str(tree))
+    path = str(tree / 'src' / 'A.tsx')
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    again = cache(tree)
+    assert again.lookup(path) == [list(row) for row in scan_file(path)[1]]
+    again.save()
+    stored = json.loads((tree / 'cache' / 'extract.json').read_text(encoding='utf-8'))
+    assert stored['files']['src/A.tsx']['stat'][0] == st.st_mtime_ns + 10**9
+
+
+def test_deleted_files_drop_out(tree):
+    extract_paths(paths(tree), cache=cache(tree), root=str(tree))
+    os.unlink(tree / 'src' / 'B.tsx')
+    again = cache(tree)
+    extract_paths(paths(tree), cache=again, root=str(tree))
+    assert sorted(again.entries) == ['src/A.tsx']
+
+
+def test_other_version_or_root_starts_empty(tree):
+    extract_paths(paths(tree), cache=cache(tree), root=str(tree))
+    assert FileCache('extract', EXTRACT_VERSION + 1, cache_dir=str(tree / 'cache'), root=str(tree)).entries == {}
+    assert FileCache('extract', EXTRACT_VERSION, cache_dir=str(tree / 'cache'), root='/elsewhere').entries == {}
+
+
+def test_corrupt_cache_file_is_ignored(tree):
+    (tree / 'cache').mkdir()
+    (tree / 'cache' / 'extract.json').write_text('{"version": ', encoding='utf-8')
+    assert cache(tree).entries == {}
+
+
+def test_digest_is_sha1():
+    assert digest(b'') == 'da39a3ee5e6b4b0d3255bfef95601890afd80709'
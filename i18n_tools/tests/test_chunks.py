@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from i18n_tools.chunks import MANIFEST, build_manifest, namespaces_by_file, split_locale, write_chunks
+from i18n_tools.extract import Usage, extract_tree
+from i18n_tools.routes import parse_routes, route_files
+
+FILES = {
+    'main.tsx': "import { router } from './router';\nimport Shell from './Shell';\n",
+    'Shell.tsx': "t('nav.home');\n",
+    'Layout.tsx': "t('common.ok');\n",
+    'router.tsx': '''import Layout from './Layout';
+import { Jobs } from './pages/Jobs';
+import Admin, { AdminUsers as Users } from './pages/Admin';
+
+export const router = createBrowserRouter([
+  {
+    path: '/',
+    element: <Layout />,
+    errorElement: <Shell />,
+    children: [
+      { index: true, element: <Jobs /> },
+      { path: 'admin', element: <Admin />, children: [{ path: 'users', element: <Users /> }] },
+      { path: '/about', element: <Jobs /> },
+    ],
+  },
+]);
+''',
+    'pages/Jobs.tsx': "import Card from '../components/Card';\n",
+    'components/Card.tsx': "t('jobs.title');\n",
+    'pages/Admin/index.tsx': "t(`admin.${section}.title`);\n",
+}
+
+LOCALE = {'nav': {'home': 'Home'}, 'common': {'ok': 'OK'}, 'jobs': {'title': 'Jobs'},
+          'admin': {'users': {'title': 'Users'}}, 'unused': {'x': 'X'}}
+
+
+@pytest.fixture
+def root(tmp_path):
+    for name, text in FILES.items():
+        path = tmp_path / 'src' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    return tmp_path
+
+
+def test_routes_are_flattened_with_enclosing_components(root):
+    routes = parse_routes(str(root / 'src' / 'router.tsx'))
+    assert [(r.path, r.components, r.index) for r in routes] == [
+        ('/', ['Layout', 'Jobs'], True),
+        ('/', ['Layout'], False),
+        ('/about', ['Layout', 'Jobs'], False),
+        ('/admin', ['Layout', 'Admin'], False),
+        ('/admin/users', ['Layout', 'Admin', 'Users'], False),
+    ]
+
+
+def test_route_files_exclude_the_shell(root):
+    shell, routes = route_files(str(root))
+    assert shell == {'src/main.tsx', 'src/Shell.tsx', 'src/Layout.tsx'}
+    assert routes['/'] == {'src/pages/Jobs.tsx', 'src/components/Card.tsx'}
+    assert routes['/admin'] == {'src/pages/Admin/index.tsx'}
+
+
+def test_dynamic_first_segment_may_be_any_namespace():
+    usages = {'*.title': [Usage('*.title', 'a.tsx', 1, 1, None, ('x',))],
+              'ad*.x': [Usage('ad*.x', 'b.tsx', 1, 1, None, ('y',))],
+              'gone.key': [Usage('gone.key', 'c.tsx', 1, 1, None)]}
+    assert namespaces_by_file(usages, {'admin', 'jobs'}) == {'a.tsx': {'admin', 'jobs'}, 'b.tsx': {'admin'},
+                                                             'c.tsx': set()}
+
+
+def test_manifest_lists_shared_and_per_route_namespaces(root):
+    split = {'en': split_locale(LOCALE)}
+    manifest = build_manifest(split, extract_tree(str(root / 'src'), workers=1, root=str(root)), str(root))
+    assert manifest['shared'] == ['common', 'nav']
+    assert manifest['routes'] == {'/': ['jobs'], '/about': ['jobs'], '/admin': ['admin'], '/admin/users': ['admin']}
+    assert sorted(manifest['chunks']['en']) == ['admin', 'common', 'jobs', 'nav', 'unused']
+    assert manifest['chunks']['en']['jobs'].startswith('en/jobs.')
+
+
+def test_chunk_names_follow_their_content():
+    first = split_locale(LOCALE)
+    second = split_locale(dict(LOCALE, jobs={'title': 'All jobs'}))
+    assert first['nav'] == second['nav']
+    assert first['jobs'][0] != second['jobs'][0]
+    assert json.loads(first['jobs'][1]) == {'jobs': {'title': 'Jobs'}}
+
+
+def test_write_chunks_adds_new_and_removes_stale_files(tmp_path):
+    out = str(tmp_path / 'locales')
+    split = {'en': split_locale(LOCALE)}
+    assert write_chunks(split, {'version': 1}, out) == (5, 0)
+    changed = {'en': split_locale(dict(LOCALE, jobs={'title': 'All jobs'}))}
+    assert write_chunks(changed, {'version': 1}, out, dry_run=True) == (1, 1)
+    assert write_chunks(changed, {'version': 1}, out) == (1, 1)
+    assert sorted(os.listdir(os.path.join(out, 'en'))) == sorted(name for name, _ in changed['en'].values())
+    assert json.loads((tmp_path / 'locales' / MANIFEST).read_text(encoding='utf-8')) == {'version': 1}
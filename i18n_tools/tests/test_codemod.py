@@ -0,0 +1,79 @@
+import pytest
+
+from i18n_tools.cli import main
+from i18n_tools.codemod import build_trie, rename_key, rewrite_text
+
+TRIE = build_trie({'onboarding': 'auPair.onboarding', 'common.ok': 'common.confirm'})
+
+
+@pytest.mark.parametrize('key, expected', [
+    ('onboarding.title', 'auPair.onboarding.title'),
+    ('common.ok', 'common.confirm'),
+    ('common.ok.short', 'common.confirm.short'),
+    ('common.cancel', None),
+    ('onboarding', None),
+])
+def test_rename_key(key, expected):
+    assert rename_key(TRIE, key) == expected
+
+
+def test_longest_prefix_wins():
+    trie = build_trie({'a': 'x', 'a.b': 'y'})
+    assert rename_key(trie, 'a.b.c') == 'y.c'
+    assert rename_key(trie, 'a.c') == 'x.c'
+
+
+def test_literals_and_template_heads_are_rewritten():
+    text = "t('onboarding.title'); t(\"common.ok\"); t(`onboarding.steps.${n}`);\n"
+    new, count = rewrite_text(text, TRIE)
+    assert new == "t('auPair.onboarding.title'); t(\"common.confirm\"); t(`auPair.onboarding.steps.${n}`);\n"
+    assert count == 3
+
+
+def test_other_strings_are_left_alone():
+    text = "navigate('onboarding'); t('common.cancel'); log('onboarding.title is missing');\n"
+    assert rewrite_text(text, TRIE) == (text, 0)
+
+
+def test_quotes_in_comments_do_not_open_literals():
+    text = "// don't rename\nt('common.ok'); /* it's here */ t('onboarding.x');\n"
+    new, count = rewrite_text(text, TRIE)
+    assert count == 2
+    assert new == "// don't rename\nt('common.confirm'); /* it's here */ t('auPair.onboarding.x');\n"
+
+
+def test_i18n_key_and_i18n_t_are_key_contexts():
+    text = '<Trans i18nKey="onboarding.intro" />; i18n.t(\'common.ok\');\n'
+    assert rewrite_text(text, TRIE) == ('<Trans i18nKey="auPair.onboarding.intro" />; i18n.t(\'common.confirm\');\n', 2)
+
+
+def test_key_shaped_literals_elsewhere_need_a_known_key():
+    text = "import Page from './onboarding.tsx';\nconst item = { labelKey: 'onboarding.title', file: 'onboarding.tsx' };\n"
+    assert rewrite_text(text, TRIE) == (text, 0)
+    new, count = rewrite_text(text, TRIE, keys={'onboarding', 'onboarding.title'})
+    assert count == 1
+    assert "labelKey: 'auPair.onboarding.title'" in new
+    assert "'./onboarding.tsx'" in new and "file: 'onboarding.tsx'" in new
+
+
+def test_a_key_already_moved_in_the_locale_counts_as_known():
+    text = "const steps = [`onboarding.steps.${n}`, 'onboarding.title'];\n"
+    new, count = rewrite_text(text, TRIE, keys={'auPair.onboarding.steps', 'auPair.onboarding.title'})
+    assert (new, count) == ("const steps = [`auPair.onboarding.steps.${n}`, 'auPair.onboarding.title'];\n", 2)
+
+
+def test_codemod_command_checks_literals_against_the_reference_locale(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    (locales / 'en.json').write_text('{"onboarding": {"title": "Welcome"}}', encoding='utf-8')
+    src = tmp_path / 'src'
+    src.mkdir()
+    page = src / 'Page.tsx'
+    page.write_text("const a = t('onboarding.title');\nconst b = { key: 'onboarding.title', route: 'onboarding.done' };\n",
+                    encoding='utf-8')
+    status = main(['--root', str(tmp_path), '--locales-dir', str(locales), '--no-cache',
+                   'move', 'onboarding', 'auPair.onboarding', '+', 'codemod', 'onboarding=auPair.onboarding'])
+    assert status == 0
+    assert page.read_text(encoding='utf-8') == (
+        "const a = t('auPair.onboarding.title');\n"
+        "const b = { key: 'auPair.onboarding.title', route: 'onboarding.done' };\n")
@@ -0,0 +1,59 @@
+import json
+
+from i18n_tools.cli import main
+from i18n_tools.diff import Difference, diff_locales, diff_report, summarize, type_name
+from i18n_tools.index import FlatIndex
+
+EN = {'a': {'x': 'X', 'y': 'Y'}, 'b': 'B', 'c': {'d': 'D', 'e': {'f': 'F'}}, 'n': 1, 'flag': True}
+ZH = {'a': {'x': 'X'}, 'b': {'deep': 'B'}, 'c': 'C', 'n': '1', 'flag': True, 'z': 'Z'}
+
+
+def test_json_types_are_named():
+    assert [type_name(v) for v in ({}, '', True, 0, 1.5, [], None)] == \
+        ['object', 'string', 'boolean', 'number', 'number', 'array', 'null']
+
+
+def test_paths_below_a_conflict_are_not_reported_again():
+    diffs = diff_locales({'en': FlatIndex(EN), 'zh': FlatIndex(ZH)}, 'en')
+    assert diffs == {'zh': [
+        Difference('missing', 'a.y', 'zh', 'string', None),
+        Difference('conflict', 'b', 'zh', 'string', 'object'),
+        Difference('conflict', 'c', 'zh', 'object', 'string'),
+        Difference('type', 'n', 'zh', 'number', 'string'),
+        Difference('extra', 'z', 'zh', None, 'string'),
+    ]}
+    assert summarize(diffs) == {'zh': {'missing': 1, 'extra': 1, 'conflict': 2, 'type': 1}}
+
+
+def test_identical_locales_have_no_differences():
+    assert summarize(diff_locales({'en': FlatIndex(EN), 'fr': FlatIndex(EN)}, 'en')) == \
+        {'fr': {'missing': 0, 'extra': 0, 'conflict': 0, 'type': 0}}
+
+
+def _locales(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang, data in (('en', EN), ('zh', ZH)):
+        (locales / f'{lang}.json').write_text(json.dumps(data), encoding='utf-8')
+    return ['--root', str(tmp_path), '--locales-dir', str(locales), '--locales', 'en,zh', '--reference', 'en']
+
+
+def test_json_report_matches_the_text_report(tmp_path, capsys):
+    args = _locales(tmp_path)
+    assert main(args + ['diff']) == 1
+    out = capsys.readouterr().out
+    assert '[zh] missing a.y' in out
+    assert '[zh] conflict b: string in en, object in zh' in out
+    assert '[zh] vs en: 1 missing, 1 extra, 2 conflict, 1 type' in out
+    assert main(args + ['diff', '--json']) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report == json.loads(json.dumps(diff_report(
+        diff_locales({'en': FlatIndex(EN), 'zh': FlatIndex(ZH)}, 'en'), 'en')))
+
+
+def test_fail_on_limits_the_exit_status(tmp_path):
+    args = _locales(tmp_path)
+    assert main(args + ['diff', '--fail-on', 'type', '--fail-on', 'conflict']) == 1
+    (tmp_path / 'locales' / 'zh.json').write_text(json.dumps({**EN, 'z': 'Z'}), encoding='utf-8')
+    assert main(args + ['diff', '--fail-on', 'missing']) == 0
+    assert main(args + ['diff']) == 1
@@ -0,0 +1,46 @@
+import pytest
+
+from i18n_tools.duplicates import Duplicate, ScanError, find_duplicates
+from i18n_tools.scanner import iter_tokens
+
+
+def test_repeat_in_the_same_object_is_reported_with_positions():
+    text = '{\n  "a": {\n    "x": 1,\n    "x": 2\n  }\n}'
+    assert list(find_duplicates(text)) == [Duplicate('a.x', (3, 5), (4, 5))]
+
+
+def test_same_name_under_different_parents_is_not_a_duplicate():
+    assert list(find_duplicates('{"a": {"title": 1}, "b": {"title": 2}, "title": 3}')) == []
+
+
+def test_every_repeat_is_reported_against_the_first():
+    dups = list(find_duplicates('{"k": 1, "k": 2, "k": 3}'))
+    assert [(d.first, d.second) for d in dups] == [((1, 2), (1, 10)), ((1, 2), (1, 18))]
+
+
+def test_paths_inside_arrays_use_the_index():
+    assert [d.path for d in find_duplicates('{"list": [{"a": 1}, {"a": 1, "a": 2}]}')] == ['list.1.a']
+
+
+def test_escaped_keys_are_compared_decoded():
+    assert [d.path for d in find_duplicates('{"caf\\u00e9": 1, "café": 2}')] == ['café']
+
+
+def test_values_are_not_mistaken_for_keys():
+    assert list(find_duplicates('{"a": "b", "b": "a", "c": ["a", "a"]}')) == []
+
+
+@pytest.mark.parametrize('text, message, position', [
+    ('{"a": 1}}', "Unexpected '}'", (1, 9)),
+    ('{"a": @}', "Unexpected character '@'", (1, 7)),
+    ('{"a": {\n', 'Unexpected end of file', (2, 1)),
+])
+def test_broken_json_raises_scan_error(text, message, position):
+    with pytest.raises(ScanError) as e:
+        list(find_duplicates(text))
+    assert (e.value.msg, e.value.line, e.value.col) == (message, *position)
+
+
+def test_tokens_carry_line_and_column():
+    tokens = [(kind, line, col) for kind, _, _, line, col in iter_tokens('{\n  "a": true\n}')]
+    assert tokens == [('punct', 1, 1), ('string', 2, 3), ('punct', 2, 6), ('literal', 2, 8), ('punct', 3, 1)]
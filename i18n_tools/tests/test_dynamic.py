@@ -0,0 +1,79 @@
+from i18n_tools.dynamic import (check_patterns, enums_from_text, guess_enum, load_enums, pattern_regex,
+                                resolve_patterns)
+from i18n_tools.extract import Usage
+from i18n_tools.index import FlatIndex
+
+INDEX = FlatIndex({
+    'admin': {'visa': {'status': {'pending': 'Pending', 'approved': 'Approved', 'rejected': {'title': 'No'}}}},
+    'adminTools': {'status': {'x': 'X'}},
+    'steps': {'one': {'title': 'A'}, 'two': {'title': 'B', 'body': 'C'}},
+})
+
+
+def test_a_wildcard_matches_within_one_segment():
+    regex = pattern_regex('admin.visa.status.*')
+    assert regex.fullmatch('admin.visa.status.pending')
+    assert not regex.fullmatch('admin.visa.status.rejected.title')
+    assert not regex.fullmatch('admin.visa.status.')
+
+
+def test_patterns_resolve_against_the_sorted_keys():
+    assert resolve_patterns(['admin.visa.status.*', 'steps.*.title', 'admin*.status.x', 'none.*'], INDEX) == {
+        'admin*.status.x': ['adminTools.status.x'],
+        'admin.visa.status.*': ['admin.visa.status.approved', 'admin.visa.status.pending'],
+        'none.*': [],
+        'steps.*.title': ['steps.one.title', 'steps.two.title'],
+    }
+
+
+ENUMS_TS = '''
+export type VisaStatus = 'pending' | 'approved' | "rejected";
+export const STEPS = [
+  { value: 'one', label: 'First', options: ['ignored'] },
+  { value: 'two', label: 'Second' },
+];
+export const Colors: string[] = ['red', 'green'];
+'''
+
+
+def test_unions_and_constant_arrays_are_enums():
+    assert enums_from_text(ENUMS_TS) == {
+        'VisaStatus': ['pending', 'approved', 'rejected'],
+        'STEPS': ['one', 'two'],
+        'Colors': ['red', 'green'],
+    }
+
+
+def test_enum_is_guessed_from_the_expression():
+    enums = {'VisaStatus': [], 'STEPS': []}
+    assert guess_enum('app.visa_status', enums) == 'VisaStatus'
+    assert guess_enum('step.toLowerCase()', enums) is None
+    assert guess_enum('steps.toLowerCase()', enums) == 'STEPS'
+
+
+def test_bound_enum_reports_missing_keys():
+    usages = {
+        'admin.visa.status.*': [Usage('admin.visa.status.*', 'a.tsx', 1, 1, None, ('app.visaStatus',))],
+        'steps.*.body': [Usage('steps.*.body', 'b.tsx', 1, 1, None, ('s',))],
+        'admin.visa.status': [Usage('admin.visa.status', 'c.tsx', 1, 1, None, None)],
+    }
+    enums = enums_from_text(ENUMS_TS)
+    result = check_patterns(usages, INDEX, enums, bindings={'steps.*.body': 'STEPS'})
+    assert set(result) == {'admin.visa.status.*', 'steps.*.body'}
+    status = result['admin.visa.status.*']
+    assert status.candidates == ['admin.visa.status.pending', 'admin.visa.status.approved', 'admin.visa.status.rejected']
+    assert status.missing == ['admin.visa.status.rejected']
+    assert result['steps.*.body'].missing == ['steps.one.body']
+
+
+def test_unbound_pattern_has_no_candidates():
+    usages = {'steps.*.title': [Usage('steps.*.title', 'a.tsx', 1, 1, None, ('whatever',))]}
+    resolution = check_patterns(usages, INDEX)['steps.*.title']
+    assert resolution.keys == ['steps.one.title', 'steps.two.title']
+    assert resolution.candidates is None and resolution.missing is None
+
+
+def test_enums_are_loaded_from_the_enum_dirs(tmp_path):
+    (tmp_path / 'src' / 'types').mkdir(parents=True)
+    (tmp_path / 'src' / 'types' / 'visa.ts').write_text(ENUMS_TS, encoding='utf-8')
+    assert sorted(load_enums(root=str(tmp_path))) == ['Colors', 'STEPS', 'VisaStatus']
@@ -0,0 +1,74 @@
+import pytest
+
+from i18n_tools.extract import (Usage, extract_paths, extract_text, iter_source_files, references_text,
+                                scan_template)
+
+SOURCE = '''import { t } from 'i18next';
+export function Page() {
+  const title = t('jobs.title');
+  const empty = t("jobs.empty", 'Nothing yet');
+  const more = i18n.t('jobs.more', { defaultValue: 'More' }) || 'x';
+  const alt = t('jobs.alt') || 'Fallback';
+  const status = t(`admin.visa.status.${app.status}`);
+  return <Trans i18nKey="jobs.intro" defaults="Hello <b>there</b>" />;
+}
+'''
+
+
+def test_every_form_is_extracted_in_source_order():
+    assert extract_text(SOURCE) == [
+        ('jobs.title', 3, 17, None, None),
+        ('jobs.empty', 4, 17, 'Nothing yet', None),
+        ('jobs.more', 5, 16, 'More', None),
+        ('jobs.alt', 6, 15, 'Fallback', None),
+        ('admin.visa.status.*', 7, 18, None, ('app.status',)),
+        ('jobs.intro', 8, 10, 'Hello <b>there</b>', None),
+    ]
+
+
+def test_calls_that_are_not_t_are_ignored():
+    assert extract_text("format('a.b'); obj.t('c.d'); at('e.f'); t(key);") == []
+
+
+def test_escaped_quotes_in_keys_and_defaults():
+    assert extract_text("t('it\\'s.key', 'Don\\'t')") == [("it's.key", 1, 1, "Don't", None)]
+
+
+def test_template_without_expressions_is_a_plain_key_and_prose_is_skipped():
+    assert extract_text('t(`a.b`); t(`Hello ${name}, welcome`)') == [('a.b', 1, 1, None, None)]
+
+
+def test_scan_template_counts_nested_braces():
+    text = '`a.${fn({x: `b${y}`})}.c` rest'
+    assert scan_template(text, 0) == (['a.', '.c'], ['fn({x: `b${y}`})'], 25)
+    assert scan_template('`open ${x', 0) is None
+
+
+def test_references_include_key_shaped_strings_anywhere():
+    text = "const items = [{ label: 'nav.home' }, 'plain']; const k = `education.levels.${x}`;"
+    assert references_text(text) == ['education.levels.*', 'nav.home']
+
+
+@pytest.fixture
+def src(tmp_path):
+    (tmp_path / 'src' / 'pages').mkdir(parents=True)
+    (tmp_path / 'src' / 'pages' / 'Jobs.tsx').write_text("t('jobs.title'); t('common.ok');", encoding='utf-8')
+    (tmp_path / 'src' / 'App.ts').write_text("t('common.ok');", encoding='utf-8')
+    (tmp_path / 'src' / 'types.d.ts').write_text("t('not.scanned');", encoding='utf-8')
+    (tmp_path / 'src' / 'notes.md').write_text("t('not.scanned');", encoding='utf-8')
+    return tmp_path
+
+
+def test_source_files_skip_declarations_and_other_extensions(src):
+    assert [p[len(str(src)) + 1:] for p in iter_source_files(str(src / 'src'))] == ['src/App.ts', 'src/pages/Jobs.tsx']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_usages_are_merged_per_key(src, workers):
+    for i in range(20):
+        (src / 'src' / f'Page{i:02}.tsx').write_text(f"t('page.p{i}'); t('common.ok');", encoding='utf-8')
+    index = extract_paths(list(iter_source_files(str(src / 'src'))), workers=workers, root=str(src))
+    assert len(index) == 22
+    assert index['jobs.title'] == [Usage('jobs.title', 'src/pages/Jobs.tsx', 1, 1, None, None)]
+    assert [u.path for u in index['common.ok']][:3] == ['src/App.ts', 'src/Page00.tsx', 'src/Page01.tsx']
+    assert len(index['common.ok']) == 22
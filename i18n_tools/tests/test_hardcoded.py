@@ -0,0 +1,64 @@
+import json
+
+from i18n_tools.cli import main
+from i18n_tools.hardcoded import scan_text
+
+PAGE = '''import { toast } from 'sonner';
+
+export function Page<T>({ items }: Props<T>) {
+  const few = items.length < 3 && items.length > 0;
+  const label = t('page.title') || 'Fallback title';
+  if (!few) toast.error('Could not load jobs');
+  showToast(t('page.saved'), 'success');
+  alert(`Deleted ${items.length} items`);
+  return (
+    <div className="p-4" title="Job board" data-id="board">
+      <h1>{t('page.title')}</h1>
+      <p>Premium Only</p>
+      <input placeholder='Search jobs' aria-label={"Search"} />
+      {few ? 'Few left' : <span>{label}</span>}
+      <p>{items.length} &nbsp; 42</p>
+      <Trans>Hello <b>world</b></Trans>
+    </div>
+  );
+}
+'''
+
+
+def _rows(text, jsx=True):
+    return [(r['type'], r.get('attr'), r['text'], r['line']) for r in scan_text(text, jsx)]
+
+
+def test_jsx_text_props_and_toasts_are_found():
+    assert _rows(PAGE) == [
+        ('TOAST', None, 'Could not load jobs', 6),
+        ('TOAST', None, 'Deleted ${items.length} items', 8),
+        ('ATTR', 'title', 'Job board', 10),
+        ('JSX_TEXT', None, 'Premium Only', 12),
+        ('ATTR', 'placeholder', 'Search jobs', 13),
+        ('ATTR', 'aria-label', 'Search', 13),
+        ('JSX_TEXT', None, 'Few left', 14),
+        ('JSX_TEXT', None, 'Hello', 16),
+        ('JSX_TEXT', None, 'world', 16),
+    ]
+
+
+def test_comparisons_and_generics_are_not_jsx():
+    text = 'const ok = a < b && c > d;\nfunction f<T>(x: Array<T>): T { return x[0]; }\n'
+    assert _rows(text) == []
+    assert _rows("const s = 'plain text';\nconst el = x < y ? 1 : 2;\n", jsx=False) == []
+
+
+def test_report_is_written_and_checked(tmp_path, capsys):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'Page.tsx').write_text(PAGE, encoding='utf-8')
+    (tmp_path / 'src' / 'Clean.tsx').write_text("export const C = () => <p>{t('a.b')}</p>;\n", encoding='utf-8')
+    args = ['--root', str(tmp_path), '--no-cache', 'hardcoded']
+    assert main(args + ['--check']) == 1
+    assert main(args) == 0
+    report = json.loads((tmp_path / 'hardcoded_strings.json').read_text(encoding='utf-8'))
+    assert list(report) == ['src/Page.tsx']
+    assert len(report['src/Page.tsx']) == 9
+    capsys.readouterr()
+    assert main(args + ['--check']) == 0
+    assert 'is up to date' in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import pytest
+
+from i18n_tools.index import FlatIndex, flatten
+
+DATA = {
+    'admin': {'title': 'Admin', 'users': {'list': 'Users', 'add': 'Add user'}},
+    'adminPanel': {'title': 'Panel'},
+    'count': 3,
+    'empty': {},
+}
+
+
+@pytest.fixture
+def index():
+    return FlatIndex(DATA)
+
+
+def test_flatten_in_document_order():
+    assert [(p, b) for p, _, b in flatten(DATA)] == [
+        ('admin', True), ('admin.title', False), ('admin.users', True), ('admin.users.list', False),
+        ('admin.users.add', False), ('adminPanel', True), ('adminPanel.title', False), ('count', False),
+        ('empty', True),
+    ]
+
+
+def test_leaves_and_branches(index):
+    assert list(index) == ['admin.title', 'admin.users.list', 'admin.users.add', 'adminPanel.title', 'count']
+    assert index.get('admin.users.add') == 'Add user'
+    assert index.get('admin.users', 'none') == 'none'
+    assert 'admin.users' not in index and index.is_branch('admin.users')
+    assert index.has('admin.users') and index.has('count') and index.has('') and not index.has('missing')
+    assert index.is_branch('empty') and len(index) == 5
+
+
+def test_string_prefix_includes_sibling_keys(index):
+    assert index.with_prefix('admin') == ['admin.title', 'admin.users.add', 'admin.users.list', 'adminPanel.title']
+    assert index.count_prefix('admin.users.') == 2
+
+
+def test_under_stops_at_the_object(index):
+    assert index.under('admin') == ['admin.title', 'admin.users.add', 'admin.users.list']
+    assert index.under('empty') == []
+    assert len(index.under('')) == 5
+
+
+def test_range(index):
+    assert index.range('admin.u', 'adminP') == ['admin.users.add', 'admin.users.list']
+
+
+def test_prefix_queries_agree_with_a_scan():
+    data = {f'k{i % 7}': {f'n{j}': str(j) for j in range(i % 5)} for i in range(50)}
+    index = FlatIndex(data)
+    for prefix in ('', 'k', 'k3', 'k3.', 'k3.n1', 'z', 'k6.n'):
+        assert index.with_prefix(prefix) == sorted(p for p in index.values if p.startswith(prefix))
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from i18n_tools.cli import main
+from i18n_tools.extract import Usage
+from i18n_tools.index import FlatIndex
+from i18n_tools.missing import fill_items, iter_nested, iter_patch, marker, missing_keys, report_items
+
+EN = {'nav': {'home': 'Home', 'jobs': 'Jobs'}, 'title': 'Title'}
+ZH = {'nav': {'home': '首页'}}
+SOURCE = "t('nav.home');\nt('nav.jobs');\nt('title');\nt('form.email.label');\nt('form.name');\nt(`x.${k}`);\n"
+
+
+def _nested(missing):
+    """The report built in memory, as ``missing`` did before it streamed."""
+    out = {}
+    for lang, keys in missing:
+        node = out.setdefault(lang, {})
+        for segments in keys:
+            parent = node
+            for part in segments[:-1]:
+                parent = parent.setdefault(part, {})
+            parent[segments[-1]] = marker('.'.join(segments))
+    return out
+
+
+def test_keys_below_a_missing_leaf_are_left_out():
+    usages = {k: [Usage(k, 'a.tsx', 1, 1, None)] for k in ('a.b', 'a.b.c', 'a.bc', 'd', 'nav.home', 'x.*')}
+    assert missing_keys(usages, FlatIndex({'nav': {'home': 'Home'}})) == [['a', 'b'], ['a', 'bc'], ['d']]
+
+
+@pytest.mark.parametrize('missing', [
+    [],
+    [('en', [])],
+    [('en', []), ('zh', [['a', 'b', 'c'], ['a', 'd'], ['e'], ['f', 'g']])],
+    [('zh', [['引号"', 'x']]), ('fr', [['a']])],
+])
+def test_streamed_report_matches_json_dumps(missing):
+    assert ''.join(iter_nested(report_items(missing))) == \
+        json.dumps(_nested(missing), ensure_ascii=False, indent=2)
+
+
+def test_fill_patch_uses_the_fallback_where_it_has_a_string():
+    missing = [('zh', [['nav', 'jobs'], ['nav', 'more'], ['title']])]
+    fallback = FlatIndex({'nav': {'jobs': 'Jobs', 'more': {'x': 'X'}}, 'title': 'Title'})
+    patch = json.loads(''.join(iter_patch(fill_items(missing, fallback), 'fill')))
+    assert patch == {'description': 'fill', 'merge': 'keep', 'on_conflict': 'skip',
+                     'values': {'zh': {'nav': {'jobs': 'Jobs', 'more': marker('nav.more')}, 'title': 'Title'}}}
+
+
+def _project(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'App.tsx').write_text(SOURCE, encoding='utf-8')
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang, data in (('en', EN), ('zh', ZH)):
+        (locales / f'{lang}.json').write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    return ['--root', str(tmp_path), '--locales-dir', str(locales), '--locales', 'en,zh', '--no-cache']
+
+
+def test_report_file_and_stdout_match_the_in_memory_report(tmp_path, capsys):
+    args = _project(tmp_path)
+    expected = json.dumps(_nested([
+        ('en', [['form', 'email', 'label'], ['form', 'name']]),
+        ('zh', [['form', 'email', 'label'], ['form', 'name'], ['nav', 'jobs'], ['title']]),
+    ]), ensure_ascii=False, indent=2) + '\n'
+    assert main(args + ['missing', '--out', 'report.json']) == 0
+    assert (tmp_path / 'report.json').read_text(encoding='utf-8') == expected
+    capsys.readouterr()
+    assert main(args + ['missing', '--out', '-']) == 0
+    out, err = capsys.readouterr()
+    assert out == expected
+    assert err == '[en] Missing keys: 2\n[zh] Missing keys: 4\n'
+
+
+def test_fill_patch_only_adds_keys(tmp_path):
+    args = _project(tmp_path)
+    assert main(args + ['missing', '--out', 'report.json', '--patch', 'fill.json', '--fallback', 'en']) == 0
+    assert main(args + ['patch', str(tmp_path / 'fill.json')]) == 0
+    zh = json.loads((tmp_path / 'locales' / 'zh.json').read_text(encoding='utf-8'))
+    assert zh == {'nav': {'home': '首页', 'jobs': 'Jobs'}, 'title': 'Title',
+                  'form': {'email': {'label': marker('form.email.label')}, 'name': marker('form.name')}}
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from i18n_tools.cli import main
+from i18n_tools.patch import Patch, PatchError, PatchRun, _patch, patch_locale
+
+
+def make(values, path='', merge='overwrite', on_conflict='replace', name='p'):
+    return Patch(name, path, merge, on_conflict, values, '')
+
+
+def apply(data, *patches, lang='en'):
+    counts, conflicts, failed, out = patch_locale(list(patches), lang, data)
+    return counts, conflicts, failed, out
+
+
+def test_overwrite_deep_merges_and_replaces_leaves():
+    data = {'a': {'b': 'old', 'c': 'keep'}}
+    counts, conflicts, failed, out = apply(data, make({None: {'a': {'b': 'new', 'd': 'add'}}}))
+    assert out is data
+    assert data == {'a': {'b': 'new', 'c': 'keep', 'd': 'add'}}
+    assert counts[('p', 'en')] == {'added': 1, 'changed': 1, 'kept': 0}
+    assert not conflicts and not failed
+
+
+def test_keep_only_fills_missing_leaves():
+    data = {'a': {'b': 'mine'}}
+    counts, *_ = apply(data, make({None: {'b': 'theirs', 'c': 'new'}}, path='a', merge='keep'))
+    assert data == {'a': {'b': 'mine', 'c': 'new'}}
+    assert counts[('p', 'en')] == {'added': 1, 'changed': 0, 'kept': 1}
+
+
+def test_two_level_replaces_deeper_content_wholesale():
+    data = {'a': {'x': {'deep': {'old': '1'}, 'other': '2'}}}
+    apply(data, make({None: {'x': {'deep': {'new': '3'}}}}, path='a', merge='two-level'))
+    assert data == {'a': {'x': {'deep': {'new': '3'}, 'other': '2'}}}
+
+
+def test_replace_sets_the_path_and_creates_parents():
+    data = {'a': {'b': {'old': '1'}}}
+    apply(data, make({None: 'flat'}, path='a.b', merge='replace'))
+    apply(data, make({None: {'z': '1'}}, path='x.y', merge='replace'))
+    assert data == {'a': {'b': 'flat'}, 'x': {'y': {'z': '1'}}}
+
+
+def test_values_only_touch_the_named_locales():
+    data = {'a': 'x'}
+    assert apply(data, make({'zh': {'a': 'y'}}), lang='en')[3] is None
+    assert data == {'a': 'x'}
+
+
+@pytest.mark.parametrize('on_conflict, expected, failed', [
+    ('replace', {'a': {'b': 'new'}}, False),
+    ('rename', {'a_legacy': 'string', 'a': {'b': 'new'}}, False),
+    ('skip', {'a': 'string'}, False),
+    ('error', {'a': 'string'}, True),
+])
+def test_string_in_the_way_of_an_object(on_conflict, expected, failed):
+    data = {'a': 'string'}
+    _, conflicts, is_failed, _ = apply(data, make({None: {'a': {'b': 'new'}}}, on_conflict=on_conflict))
+    assert data == expected
+    assert is_failed is failed
+    assert [(c.path, c.existing, c.resolution) for c in conflicts] == [('a', 'string', on_conflict)]
+
+
+def test_two_patches_writing_one_leaf_are_an_overlap():
+    data = {}
+    _, conflicts, failed, _ = apply(data, make({None: {'a': '1'}}, name='first'),
+                                    make({None: {'a': '2'}}, name='second'))
+    assert data == {'a': '2'}
+    assert [c.resolution for c in conflicts] == ['overlap with first']
+    assert not failed
+
+
+def test_run_counts_per_patch_and_locale():
+    run = PatchRun()
+    patch = make({None: {'a': '1'}})
+    for lang in ('en', 'zh'):
+        run.apply({}, lang, patch)
+    assert set(run.counts) == {('p', 'en'), ('p', 'zh')}
+
+
+@pytest.mark.parametrize('raw, message', [
+    ({'merge': 'bogus', 'value': {}}, 'merge must be one of'),
+    ({'on_conflict': 'bogus', 'value': {}}, 'on_conflict must be one of'),
+    ({'value': {}, 'values': {}}, 'exactly one of value or values'),
+    ({'value': 'flat'}, 'need object content'),
+    ({'merge': 'replace', 'value': 'flat'}, 'non-empty path'),
+])
+def test_invalid_patches_are_rejected(raw, message):
+    with pytest.raises(PatchError, match=message):
+        _patch(raw, 'p', 'p.json')
+
+
+def test_aborted_patch_keeps_earlier_commands_of_the_chain(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang in ('en', 'zh'):
+        (locales / f'{lang}.json').write_text('{"a": {"x": "1"}, "b": "s"}', encoding='utf-8')
+    (tmp_path / 'p.json').write_text(json.dumps({
+        'on_conflict': 'error', 'values': {'en': {'c': {'y': '2'}}, 'zh': {'b': {'y': '2'}}},
+    }), encoding='utf-8')
+    status = main(['--root', str(tmp_path), '--locales-dir', str(locales), 'move', 'a', 'c', '+', 'patch', 'p.json'])
+    assert status == 1
+    for lang in ('en', 'zh'):
+        assert json.loads((locales / f'{lang}.json').read_text(encoding='utf-8')) == {'c': {'x': '1'}, 'b': 's'}
@@ -0,0 +1,76 @@
+import json
+
+from i18n_tools.cli import main
+from i18n_tools.index import FlatIndex
+from i18n_tools.prune import (DeadTree, bundle_bytes, dead_keys, dead_trees, entry_bytes, load_pins, prune_data,
+                              reachable_keys)
+
+DATA = {
+    'nav': {'home': 'Home', 'jobs': 'Jobs'},
+    'item': {'count_one': '{{count}} item', 'count_other': '{{count}} items'},
+    'status': {'pending': 'Pending', 'done': 'Done'},
+    'old': {'a': 'Old A', 'b': {'c': 'Old C'}},
+    'misc': 'Misc',
+}
+INDEX = FlatIndex(DATA)
+
+
+def test_pins_skip_comments_and_blank_lines(tmp_path):
+    path = tmp_path / 'pins.txt'
+    path.write_text('# runtime keys\nnav.home\n\n  status.*  # from the API\n', encoding='utf-8')
+    assert load_pins(str(path)) == ['nav.home', 'status.*']
+    assert load_pins(str(tmp_path / 'missing.txt')) == []
+
+
+def test_keys_objects_plurals_and_patterns_are_reachable():
+    keep = reachable_keys(INDEX, ['nav.home', 'item.count', 'status.*', 'old.b', 'gone.key'])
+    assert keep == {'nav.home', 'item.count_one', 'item.count_other', 'status.pending', 'status.done', 'old.b.c'}
+
+
+def test_dead_leaves_are_grouped_into_the_outermost_dead_objects():
+    keep = {'nav.home', 'item.count_one', 'item.count_other'}
+    dead = dead_keys(INDEX, keep)
+    assert list(dead) == ['nav.jobs', 'status.pending', 'status.done', 'old.a', 'old.b.c', 'misc']
+    assert dead['nav.jobs'] == entry_bytes('nav.jobs', 'Jobs') == len(b'"jobs":"Jobs",')
+    trees = dead_trees(INDEX, dead)
+    assert [(t.path, t.keys) for t in trees] == [('status', 2), ('old', 2), ('misc', 1), ('nav.jobs', 1)]
+    assert trees[1] == DeadTree('old', 2, dead['old.a'] + dead['old.b.c'])
+
+
+def test_pruned_data_drops_emptied_objects():
+    pruned = prune_data(DATA, {'nav.home', 'old.b.c'})
+    assert pruned == {'nav': {'home': 'Home'}, 'old': {'b': {'c': 'Old C'}}}
+    assert bundle_bytes(pruned) == b'{"nav":{"home":"Home"},"old":{"b":{"c":"Old C"}}}'
+
+
+def _project(tmp_path):
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'App.tsx').write_text("t('nav.home');\nconst label = 'item.count';\nt(`status.${s}`);\n",
+                                 encoding='utf-8')
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    (locales / 'en.json').write_text(json.dumps(DATA), encoding='utf-8')
+    (tmp_path / 'pins.txt').write_text('misc\n', encoding='utf-8')
+    return ['--root', str(tmp_path), '--locales-dir', str(locales), '--no-cache']
+
+
+def test_unused_reports_dead_keys(tmp_path, capsys):
+    assert main(_project(tmp_path) + ['unused', '--pins', 'pins.txt']) == 1
+    out = capsys.readouterr().out
+    assert '[en] 3 of 9 keys unused' in out
+    assert 'old.*  2 keys' in out
+    assert 'nav.jobs' in out
+
+
+def test_prune_writes_only_the_reachable_keys(tmp_path):
+    args = _project(tmp_path)
+    assert main(args + ['--dry-run', 'prune', '--pins', 'pins.txt', '--out', 'out']) == 0
+    assert not (tmp_path / 'out').exists()
+    assert main(args + ['prune', '--pins', 'pins.txt', '--out', 'out']) == 0
+    assert json.loads((tmp_path / 'out' / 'en.json').read_text(encoding='utf-8')) == {
+        'nav': {'home': 'Home'},
+        'item': {'count_one': '{{count}} item', 'count_other': '{{count}} items'},
+        'status': {'pending': 'Pending', 'done': 'Done'},
+        'misc': 'Misc',
+    }
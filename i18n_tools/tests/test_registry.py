@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from i18n_tools.cli import main
+from i18n_tools.parallel import locale_workers, map_locales
+from i18n_tools.registry import LocaleRegistry, Skipped
+from i18n_tools.store import LocaleError, LocaleStore
+
+
+def _leaves(lang, locale):
+    return lang, len(locale)
+
+
+@pytest.fixture
+def locales(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for name, text in (('zh.json', '{"a": "甲"}'), ('en.json', '{"a": "A", "b": "B"}'), ('pt_BR.json', '{}'),
+                       ('zh-Hant.json', '{"a": "甲"}'), ('en_clean.json', ''), ('fr.json', ''),
+                       ('.en.json.tmp', '{}'), ('notes.txt', 'x')):
+        (locales / name).write_text(text, encoding='utf-8')
+    (locales / 'sub.json').mkdir()
+    return locales
+
+
+def test_locales_are_found_with_the_reference_first(locales):
+    registry = LocaleRegistry(str(locales))
+    assert registry.langs == ('en', 'pt_BR', 'zh', 'zh-Hant')
+    assert registry.reference == 'en' and registry.others() == ('pt_BR', 'zh', 'zh-Hant')
+    assert registry.skipped == [Skipped('en_clean.json', 'not a language tag'), Skipped('fr.json', 'empty')]
+    assert LocaleRegistry(str(locales), 'zh').langs == ('zh', 'en', 'pt_BR', 'zh-Hant')
+    with pytest.raises(ValueError, match="reference locale 'fr' is not in"):
+        LocaleRegistry(str(locales), 'fr')
+
+
+def test_without_en_the_first_locale_is_the_reference(locales):
+    (locales / 'en.json').unlink()
+    assert LocaleRegistry(str(locales)).reference == 'pt_BR'
+
+
+def test_small_batches_run_in_process():
+    assert locale_workers(2, workers=8) == 1
+    assert locale_workers(3, workers=8) == 3
+    assert locale_workers(10, workers=4) == 4
+    assert locale_workers(10, workers=4, min_parallel=20) == 1
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_map_locales_keeps_the_order(workers):
+    assert map_locales(_leaves, {'zh': {'a': 1}, 'en': {}, 'fr': {'a': 1, 'b': 2}}, workers) == \
+        {'zh': ('zh', 1), 'en': ('en', 0), 'fr': ('fr', 2)}
+
+
+def test_store_map_parses_in_the_workers(locales):
+    store = LocaleStore(('en', 'zh', 'zh-Hant', 'pt_BR'), str(locales))
+    store.tree('zh').copy('a', 'b')
+    store.mark_dirty('zh')
+    assert store.map(_leaves, store.langs, workers=2, view='index') == \
+        {'en': ('en', 2), 'zh': ('zh', 2), 'zh-Hant': ('zh-Hant', 1), 'pt_BR': ('pt_BR', 0)}
+    (locales / 'pt_BR.json').write_text('{"a": ', encoding='utf-8')
+    store.reload('pt_BR')
+    with pytest.raises(LocaleError) as e:
+        store.map(_leaves, store.langs, workers=2)
+    assert e.value.lang == 'pt_BR'
+
+
+def test_commands_use_the_discovered_locales(tmp_path, locales, capsys):
+    assert main(['--root', str(tmp_path), '--locales-dir', str(locales), 'locales']) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        'en: locales/en.json (reference)', 'pt_BR: locales/pt_BR.json', 'zh: locales/zh.json',
+        'zh-Hant: locales/zh-Hant.json', 'skipped en_clean.json: not a language tag', 'skipped fr.json: empty']
+    assert main(['--root', str(tmp_path), '--locales-dir', str(locales), 'diff', '--json']) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report['reference'] == 'en' and list(report['summary']) == ['pt_BR', 'zh', 'zh-Hant']
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from i18n_tools.repair import apply_edits, check_text
+
+
+def repaired(text):
+    problems = check_text(text)
+    assert problems
+    out = apply_edits(text, problems)
+    assert not check_text(out)
+    return json.loads(out)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": 1,}', {'a': 1}),
+    ('{"a": 1 "b": 2}', {'a': 1, 'b': 2}),
+    ("{'a': 'x'}", {'a': 'x'}),
+    ('{a: "x"}', {'a': 'x'}),
+    ('{"a": {"b": "x"}', {'a': {'b': 'x'}}),
+    ('{"a": "x", // note\n "b": "y"}', {'a': 'x', 'b': 'y'}),
+])
+def test_broken_text_is_repaired(text, expected):
+    assert repaired(text) == expected
+
+
+def test_duplicate_keeps_the_value_json_would_keep():
+    assert repaired('{"a": "first", "a": "second"}') == json.loads('{"a": "first", "a": "second"}')
+
+
+def test_unescaped_quote_is_escaped():
+    assert repaired('{"a": "say "hi" now"}') == {'a': 'say "hi" now'}
+
+
+def test_everything_outside_the_edits_is_kept():
+    text = '{\n    "a":   "x",\n    "b": "y",\n}\n'
+    assert apply_edits(text, check_text(text)) == '{\n    "a":   "x",\n    "b": "y"\n}\n'
+
+
+def test_valid_text_has_no_problems():
+    assert check_text('{"a": {"b": ["x", 1, true, null]}}') == []
@@ -0,0 +1,102 @@
+import pytest
+
+from i18n_tools import ops
+from i18n_tools.search import SearchIndex, query_terms, search_file, terms, within
+from i18n_tools.store import LocaleStore
+
+EN = '''{
+  "location": {"selectCity": "Select a city", "district": "District"},
+  "jobs": {"title": "Find au pair jobs", "empty": "No jobs yet"}
+}'''
+ZH = '''{
+  "location": {"selectCity": "选择城市", "district": "区"},
+  "jobs": {"title": "寻找互惠生工作", "empty": "暂无工作"}
+}'''
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / 'en.json').write_text(EN, encoding='utf-8')
+    (tmp_path / 'zh.json').write_text(ZH, encoding='utf-8')
+    return LocaleStore(('en', 'zh'), str(tmp_path))
+
+
+@pytest.fixture
+def index(store, tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.json'))
+    index.refresh(store, store.langs)
+    return index
+
+
+def paths(hits):
+    return [(h.lang, h.path) for h in hits]
+
+
+def test_terms_split_keys_and_cjk():
+    assert terms('location.selectCity', '选择城市') == {
+        '.location', '.select', '.city', '选', '择', '城', '市', '选择', '择城', '城市'}
+    assert query_terms('城市') == ['城市']
+    assert query_terms('市') == ['市']
+
+
+def test_cjk_bigrams_find_a_word_inside_a_value(index):
+    assert paths(index.search('城市')) == [('zh', 'location.selectCity')]
+    assert paths(index.search('工作', limit=0)) == [('zh', 'jobs.empty'), ('zh', 'jobs.title')]
+
+
+def test_exact_value_ranks_first(index):
+    assert paths(index.search('district'))[0] == ('en', 'location.district')
+
+
+def test_substring_and_fuzzy_words(index):
+    assert ('en', 'location.district') in paths(index.search('distr'))
+    assert ('en', 'location.district') in paths(index.search('distirct'))
+    assert index.search('distirct', fuzzy=False) == []
+
+
+def test_within():
+    assert within('loaction', 'location', 1) is False
+    assert within('loaction', 'location', 2)
+    assert within('city', 'cities', 1) is False
+
+
+def test_unchanged_files_are_not_reindexed(store, tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.json'))
+    assert set(index.refresh(store, store.langs)) == {'en', 'zh'}
+    index.save()
+    again = SearchIndex(str(tmp_path / 'search.json')).load()
+    assert again.refresh(store, store.langs) == {}
+    assert paths(again.search('城市')) == [('zh', 'location.selectCity')]
+
+
+def test_changed_file_reindexes_only_its_changes(store, tmp_path, index):
+    (tmp_path / 'en.json').write_text(EN.replace('"District"', '"Area"'), encoding='utf-8')
+    store.reload('en')
+    assert index.refresh(store, ['en']) == {'en': (1, 1)}
+    assert paths(index.search('area')) == [('en', 'location.district')]
+    assert [h.value for h in index.search('district', ['en'])] == ['Area']
+
+
+def test_unsaved_edits_are_searched(store, index):
+    store.tree('en').move('location', 'place')
+    store.mark_dirty('en')
+    index.refresh(store, ['en'])
+    assert paths(index.search('select city', ['en'])) == [('en', 'place.selectCity')]
+    store.discard('en')
+    index.refresh(store, ['en'])
+    assert paths(index.search('select city', ['en'])) == [('en', 'location.selectCity')]
+
+
+def test_search_in_a_chain_sees_the_earlier_commands(store):
+    lines = []
+    session = ops.Session(store, log=lines.append, use_cache=False)
+    store.tree('zh').move('location', 'place')
+    store.mark_dirty('zh')
+    assert ops.search(session, '城市') == 0
+    assert lines[-2].startswith('[zh] place.selectCity = ')
+
+
+def test_each_locales_dir_has_its_own_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert search_file('a', 'cache') != search_file('b', 'cache')
+    assert search_file('a', 'cache') == search_file(str(tmp_path / 'a'), 'cache')
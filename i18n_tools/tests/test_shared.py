@@ -0,0 +1,53 @@
+import json
+
+from i18n_tools.cli import main
+from i18n_tools.index import FlatIndex
+from i18n_tools.shared import Group, ValueIndex, inconsistent, rank, words
+
+EN = {'a': {'save': 'Save', 'cancel': 'Cancel', 'empty': ''},
+      'b': {'save': 'Save', 'cancel': 'Cancel', 'note': 'Save changes now'},
+      'c': {'save': 'Save', 'note': 'Save changes now'}}
+ZH = {'a': {'save': '保存', 'cancel': '取消'},
+      'b': {'save': '保存', 'cancel': '撤销', 'note': '立即保存更改'},
+      'c': {'save': '存储', 'note': '立即保存更改'}}
+INDEXES = {'en': FlatIndex(EN), 'zh': FlatIndex(ZH)}
+
+
+def test_strings_are_interned_once_across_locales():
+    values = ValueIndex(INDEXES)
+    assert len(values) == 3 + 5
+    assert values.groups('en') == {'Save': ['a.save', 'b.save', 'c.save'], 'Cancel': ['a.cancel', 'b.cancel'],
+                                   'Save changes now': ['b.note', 'c.note']}
+    assert values.groups('en', min_count=3) == {'Save': ['a.save', 'b.save', 'c.save']}
+    assert values.duplicated('en') == (3, 7, 2 * 4 + 6 + 16)
+    assert values.duplicated('zh') == (2, 4, 6 + 18)
+
+
+def test_groups_are_ranked_by_bytes_saved():
+    groups = rank(INDEXES, 'en')
+    assert [g.text for g in groups] == ['Save changes now', 'Save', 'Cancel']
+    note = groups[0]
+    assert note == Group('Save changes now', ['b.note', 'c.note'], 16 + 18, words(note.text),
+                         {'zh': {'立即保存更改': ['b.note', 'c.note']}})
+    assert groups[1].bytes == 2 * 4 + 6
+    assert groups[1].effort == 2
+
+
+def test_groups_translated_several_ways_are_flagged():
+    assert [(g.text, lang) for g, lang in inconsistent(rank(INDEXES, 'en'))] == [('Save', 'zh'), ('Cancel', 'zh')]
+
+
+def test_shared_command(tmp_path, capsys):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang, data in (('en', EN), ('zh', ZH)):
+        (locales / f'{lang}.json').write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    args = ['--root', str(tmp_path), '--locales-dir', str(locales), '--locales', 'en,zh', 'shared']
+    assert main(args + ['--limit', '1']) == 1
+    out = capsys.readouterr().out
+    assert '"Save changes now" x2: 34 B and 3 words of translation saved' in out
+    assert '... 2 more groups' in out
+    assert '[zh] "Save" is translated 2 ways:' in out
+    assert main(args + ['--json']) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert [f['text'] for f in report['inconsistent']] == ['Save', 'Cancel']
@@ -0,0 +1,70 @@
+import json
+
+from i18n_tools.splice import copy_data, splice
+
+TEXT = '''{
+  "common": {
+    "save": "Save",
+    "cancel":   "Cancel"
+  },
+  "jobs": {"title": "Jobs", "count": "{{count}} jobs"},
+  "empty": {}
+}
+'''
+
+
+def edited(change):
+    old = json.loads(TEXT)
+    new = copy_data(old)
+    change(new)
+    out = splice(TEXT, old, new)
+    assert json.loads(out) == new
+    return out
+
+
+def test_unchanged_text_is_returned_as_is():
+    old = json.loads(TEXT)
+    assert splice(TEXT, old, copy_data(old)) is TEXT
+
+
+def test_changed_value_keeps_the_layout_around_it():
+    out = edited(lambda d: d['common'].__setitem__('save', 'Store'))
+    assert out == TEXT.replace('"Save"', '"Store"')
+
+
+def test_removed_members_take_their_comma():
+    out = edited(lambda d: d['common'].pop('save'))
+    assert '"save"' not in out
+    assert '"cancel":   "Cancel"' in out
+    out = edited(lambda d: d['common'].pop('cancel'))
+    assert '"save": "Save"\n  }' in out
+
+
+def test_new_members_follow_their_predecessor():
+    def change(d):
+        d['common'] = {'save': 'Save', 'edit': 'Edit', 'cancel': 'Cancel'}
+    out = edited(change)
+    assert out.index('"save"') < out.index('"edit"') < out.index('"cancel"')
+    assert '\n    "edit": "Edit",' in out
+
+
+def test_new_member_in_an_empty_object_and_at_the_root():
+    def change(d):
+        d['empty']['a'] = {'b': 'c'}
+        d['zz'] = 'end'
+    edited(change)
+
+
+def test_reordered_object_is_rewritten_alone():
+    def change(d):
+        d['jobs'] = {'count': d['jobs']['count'], 'title': 'All jobs'}
+    out = edited(change)
+    assert list(json.loads(out)['jobs']) == ['count', 'title']
+    assert '"cancel":   "Cancel"' in out
+
+
+def test_copy_data_shares_nothing_mutable():
+    data = {'a': {'b': ['c']}}
+    copy = copy_data(data)
+    copy['a']['b'].append('d')
+    assert data == {'a': {'b': ['c']}}
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from i18n_tools import trace
+from i18n_tools.store import LocaleError, LocaleStore
+
+EN = '{\n    "common": {"ok": "OK",   "cancel": "Cancel"},\n    "title": "Jobs"\n}\n'
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / 'en.json').write_text(EN, encoding='utf-8')
+    (tmp_path / 'zh.json').write_text('{"title": "工作"}', encoding='utf-8')
+    return LocaleStore(('en', 'zh'), str(tmp_path))
+
+
+def parses(store, action):
+    """How many times ``action`` makes the store parse a locale."""
+    tracer = trace.enable()
+    try:
+        action()
+    finally:
+        trace.disable()
+    return sum(s.name == 'parse' for s in tracer.spans)
+
+
+def test_edit_keeps_the_layout_and_parses_once(store):
+    def action():
+        store.edit('en')['common']['ok'] = 'Confirm'
+        store.mark_dirty('en')
+        store.save()
+    assert parses(store, action) == 1
+    with open(store.path('en'), encoding='utf-8') as f:
+        assert f.read() == EN.replace('"OK"', '"Confirm"')
+
+
+def test_in_place_edit_is_compared_with_the_text(store):
+    store['en']['title'] = 'All jobs'
+    store.mark_dirty('en')
+    assert store.pending() == {'en': EN.replace('"Jobs"', '"All jobs"')}
+
+
+def test_unchanged_dirty_locale_is_not_written(store):
+    store.edit('en')
+    store.mark_dirty('en')
+    assert store.save() == []
+
+
+def test_normalize_rewrites_the_layout(store):
+    store['en']
+    store.mark_dirty('en', normalize=True)
+    assert store.pending() == {'en': json.dumps(json.loads(EN), indent=2, ensure_ascii=False)}
+
+
+def test_discard_drops_the_edit(store):
+    store.edit('en')['title'] = 'x'
+    store.mark_dirty('en')
+    store.discard('en')
+    assert store['en']['title'] == 'Jobs'
+    assert store.dirty == []
+
+
+def test_map_gives_tasks_the_store_data(store):
+    def task(lang, locale):
+        return locale['title']
+    assert store.map(task, ['en', 'zh'], workers=1) == {'en': 'Jobs', 'zh': '工作'}
+
+
+def test_broken_locale_raises_locale_error(store, tmp_path):
+    (tmp_path / 'zh.json').write_text('{"title": }', encoding='utf-8')
+    with pytest.raises(LocaleError) as e:
+        store['zh']
+    assert e.value.lang == 'zh'
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from i18n_tools.cli import main
+from i18n_tools.index import FlatIndex
+from i18n_tools.templates import COMPILED_VERSION, check_parity, compile_index, parse
+
+
+@pytest.mark.parametrize('value, segments, names', [
+    ('Plain text', 'Plain text', ()),
+    ('Redirecting in {{count}}s...', ['Redirecting in ', 'count', 's...'], ('count',)),
+    ('{{ name }} and {{user.name}}', ['', 'name', ' and ', 'user.name', ''], ('name', 'user.name')),
+    ('Unbalanced {{ brace', 'Unbalanced {{ brace', ()),
+])
+def test_parse_segments(value, segments, names):
+    template = parse(value)
+    assert template.segments == segments
+    assert template.names == names
+    assert not template.dynamic
+
+
+@pytest.mark.parametrize('value, names', [
+    ('Paid {{amount, currency}}', ('amount',)),
+    ('{{- html}} here', ('html',)),
+    ('See $t(common.help)', ()),
+])
+def test_i18next_features_are_dynamic(value, names):
+    template = parse(value)
+    assert template.dynamic
+    assert template.segments == value
+    assert template.names == names
+
+
+def test_segments_alternate_literal_and_name():
+    segments = parse('{{a}}{{b}}').segments
+    assert segments == ['', 'a', '', 'b', '']
+    assert ''.join(s if i % 2 == 0 else '{{%s}}' % s for i, s in enumerate(segments)) == '{{a}}{{b}}'
+
+
+def test_compile_leaves_dynamic_values_to_i18next():
+    messages, stats = compile_index(FlatIndex({
+        'plain': 'Hi', 'count': '{{n}} items', 'nested': 'See $t(plain)', 'number': 3,
+    }))
+    assert messages == {'plain': 'Hi', 'count': ['', 'n', ' items']}
+    assert stats == {'plain': 1, 'templates': 1, 'dynamic': 1, 'skipped': 1}
+
+
+def test_parity_compares_names_of_shared_keys():
+    indexes = {
+        'en': FlatIndex({'a': '{{n}} of {{total}}', 'b': 'Hi {{name}}', 'c': '{{x}}', 'd': 'plain'}),
+        'zh': FlatIndex({'a': '{{total}} 中的 {{n}}', 'b': '你好', 'd': '{{extra}}', 'e': '{{y}}'}),
+    }
+    mismatches = check_parity(indexes, 'en')
+    assert [(m.path, m.lang, m.missing, m.extra) for m in mismatches] == [
+        ('b', 'zh', ['name'], []),
+        ('d', 'zh', [], ['extra']),
+    ]
+
+
+def test_compile_command_writes_resources_and_reports_mismatches(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    (locales / 'en.json').write_text('{"a": "{{n}} left", "b": "Hi {{name}}"}', encoding='utf-8')
+    (locales / 'zh.json').write_text('{"a": "剩 {{n}}", "b": "你好"}', encoding='utf-8')
+    status = main(['--root', str(tmp_path), '--locales-dir', str(locales), 'compile', '--out', 'compiled'])
+    assert status == 1
+    resource = json.loads((tmp_path / 'compiled' / 'zh.json').read_text(encoding='utf-8'))
+    assert resource == {'version': COMPILED_VERSION, 'lang': 'zh', 'messages': {'a': ['剩 ', 'n', ''], 'b': '你好'}}
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from i18n_tools import trace
+from i18n_tools.cli import main
+from i18n_tools.parallel import map_files
+
+
+def _length(path):
+    trace.add_bytes(read=len(path))
+    return len(path)
+
+
+@pytest.fixture
+def tracer():
+    tracer = trace.enable()
+    yield tracer
+    trace.disable()
+
+
+def test_nothing_is_recorded_until_enabled():
+    assert trace.active() is None
+    assert trace.span('x') is trace.span('y')
+    trace.add_bytes(read=10)
+
+
+def test_nested_spans_roll_bytes_up(tracer):
+    with trace.span('outer'):
+        trace.add_bytes(read=5)
+        with trace.span('inner', file='a.json'):
+            trace.add_bytes(read=3, written=7)
+        with trace.span('inner', file='b.json'):
+            pass
+    inner, _, outer = tracer.spans
+    assert (inner.name, inner.depth, inner.read, inner.written) == ('inner', 1, 3, 7)
+    assert (outer.read, outer.written, outer.depth) == (8, 7, 0)
+    summary = tracer.summary()
+    assert list(summary) == ['outer', 'inner']
+    assert summary['inner']['calls'] == 2 and summary['inner']['read'] == 3
+    assert sorted(s.args['file'] for s in tracer.slowest_files()) == ['a.json', 'b.json']
+    slowest = max(tracer.spans[:2], key=lambda s: s.wall)
+    assert tracer.slowest_files(1) == [slowest]
+
+
+def test_memory_peaks_are_recorded_when_asked():
+    tracer = trace.enable(memory=True)
+    try:
+        with trace.span('alloc'):
+            data = [0] * 100_000
+        del data
+    finally:
+        trace.disable()
+    assert tracer.spans[0].peak >= 100_000 * 8
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_worker_spans_are_merged_under_the_open_span(tracer, workers):
+    paths = ['a', 'bb', 'ccc']
+    with trace.span('scan'):
+        assert map_files(_length, paths, workers, min_parallel=1) == [1, 2, 3]
+    files = [s for s in tracer.spans if s.name == '_length']
+    assert sorted(s.args['file'] for s in files) == paths
+    assert all(s.depth == 1 for s in files)
+    assert tracer.spans[-1].name == 'scan' and tracer.spans[-1].read == 6
+    assert (len({s.pid for s in files}) > 1 or files[0].pid != tracer.pid) == (workers > 1)
+
+
+def test_chrome_trace_has_one_complete_event_per_span(tracer):
+    with trace.span('load', lang='en'):
+        trace.add_bytes(read=4)
+    event, = tracer.chrome_trace()['traceEvents']
+    assert (event['name'], event['ph'], event['args']['lang'], event['args']['read']) == ('load', 'X', 'en', 4)
+
+
+def test_profile_and_trace_options(tmp_path, capsys):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    (locales / 'en.json').write_text('{"a": "A"}', encoding='utf-8')
+    out = tmp_path / 'trace.json'
+    assert main(['--root', str(tmp_path), '--locales-dir', str(locales), '--profile', '--trace', str(out),
+                 'audit']) == 0
+    assert trace.active() is None
+    names = {e['name'] for e in json.loads(out.read_text(encoding='utf-8'))['traceEvents']}
+    assert 'audit' in names
+    err = capsys.readouterr().err
+    assert err.splitlines()[1].startswith('phase')
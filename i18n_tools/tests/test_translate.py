@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from i18n_tools import translate
+from i18n_tools.cli import main
+from i18n_tools.index import FlatIndex
+from i18n_tools.translate import (FakeServer, Fill, HttpTranslator, TranslateError, TranslationMemory, batches,
+                                  is_english, nest, untranslated)
+
+EN = {'nav': {'home': 'Home', 'jobs': 'Jobs', 'count': '{{count}} jobs'}, 'brand': 'X', 'code': '42',
+      'title': 'Find work'}
+ZH = {'nav': {'home': '首页', 'jobs': 'Jobs', 'count': 'Open jobs'}, 'brand': 'X', 'code': '42'}
+
+
+class BrokenPlaceholders:
+    """Translates like ``FakeServer`` but loses the placeholders."""
+
+    name = 'broken'
+
+    async def translate(self, texts, source, target):
+        return [f'[{target}]' + t.replace('{{count}}', '{{n}}') for t in texts]
+
+
+class Failing:
+    name = 'failing'
+
+    async def translate(self, texts, source, target):
+        raise TranslateError('down')
+
+
+def test_missing_verbatim_and_latin_leaves_are_untranslated():
+    assert is_english('Open jobs') and not is_english('首页 Home') and not is_english('A')
+    assert untranslated(FlatIndex(EN), FlatIndex(ZH)) == {
+        'nav.jobs': 'Jobs', 'nav.count': '{{count}} jobs', 'title': 'Find work'}
+
+
+def test_batches_respect_count_and_size():
+    assert list(batches(['a', 'b', 'c'], size=2)) == [['a', 'b'], ['c']]
+    assert list(batches(['aaa', 'bb', 'c', 'dddd'], chars=4)) == [['aaa'], ['bb', 'c'], ['dddd']]
+    assert nest({'a.b': 1, 'a.c': 2, 'd': 3}) == {'a': {'b': 1, 'c': 2}, 'd': 3}
+
+
+def test_fill_goes_through_the_fake_server_once_per_text():
+    memory = TranslationMemory(':memory:')
+    with FakeServer() as server:
+        translator = HttpTranslator(server.url)
+        known, stats = Fill(translator, memory, 'en', 'zh', rate=0).run(['Jobs', '{{count}} jobs', 'Jobs'])
+        assert known == {'Jobs': '[zh]Jobs', '{{count}} jobs': '[zh]{{count}} jobs'}
+        assert stats == {'memory': 0, 'translated': 2, 'rejected': 0, 'failed': 0, 'requests': 1}
+        known, stats = Fill(translator, memory, 'en', 'zh', rate=0).run(['Jobs', 'Home'])
+        assert known == {'Jobs': '[zh]Jobs', 'Home': '[zh]Home'}
+        assert (stats['memory'], stats['translated']) == (1, 1)
+        assert server.requests == 2
+    assert len(memory) == 3
+    assert memory.lookup(['Jobs'], 'en', 'zh', 'other') == {}
+
+
+def test_translations_with_other_placeholders_are_rejected():
+    memory = TranslationMemory(':memory:')
+    lines = []
+    known, stats = Fill(BrokenPlaceholders(), memory, 'en', 'zh', rate=0, log=lines.append).run(
+        ['{{count}} jobs', 'Home'])
+    assert known == {'Home': '[zh]Home'}
+    assert (stats['translated'], stats['rejected']) == (1, 1)
+    assert lines == ["Rejected translation of '{{count}} jobs': '[zh]{{n}} jobs'"]
+    assert memory.lookup(['{{count}} jobs'], 'en', 'zh', 'broken') == {}
+
+
+def test_failed_batches_are_counted(monkeypatch):
+    monkeypatch.setattr(translate, 'RETRIES', 1)
+    known, stats = Fill(Failing(), TranslationMemory(':memory:'), 'en', 'zh', rate=0).run(['Home', 'Jobs'])
+    assert known == {}
+    assert (stats['failed'], stats['requests']) == (2, 1)
+
+
+@pytest.fixture
+def locales(tmp_path):
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang, data in (('en', EN), ('zh', ZH)):
+        (locales / f'{lang}.json').write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    return locales
+
+
+def test_translate_command_fills_the_locale(tmp_path, locales, capsys):
+    args = ['--root', str(tmp_path), '--locales-dir', str(locales), '--locales', 'en,zh']
+    assert main(args + ['translate', '--memory', 'memory.sqlite']) == 2
+    assert 'Error: the http backend needs --url' in capsys.readouterr().out
+    fake = ['translate', '--backend', 'fake', '--rate', '0', '--memory', 'memory.sqlite']
+    assert main(args + fake) == 0
+    zh = json.loads((locales / 'zh.json').read_text(encoding='utf-8'))
+    assert zh == {'nav': {'home': '首页', 'jobs': '[zh]Jobs', 'count': '[zh]{{count}} jobs'}, 'brand': 'X',
+                  'code': '42', 'title': '[zh]Find work'}
+    # The fake's output is still Latin text, so a second run asks again and the memory answers.
+    capsys.readouterr()
+    assert main(args + fake) == 0
+    assert '[zh] 3 from translation memory, 0 translated in 0 requests' in capsys.readouterr().out
@@ -0,0 +1,80 @@
+import pytest
+
+from i18n_tools.tree import LocaleTree, TreeConflict
+
+
+@pytest.fixture
+def tree():
+    return LocaleTree({
+        'common': {'ok': 'OK', 'cancel': 'Cancel'},
+        'jobs': {'title': 'Jobs', 'list': {'empty': 'None'}},
+        'footer': 'Footer',
+    })
+
+
+def test_move_relinks_and_creates_parents(tree):
+    node = tree.find('jobs.list')
+    tree.move('jobs.list', 'pages.jobs.list')
+    assert tree.find('pages.jobs.list') is node
+    assert tree.to_data() == {
+        'common': {'ok': 'OK', 'cancel': 'Cancel'},
+        'jobs': {'title': 'Jobs'},
+        'footer': 'Footer',
+        'pages': {'jobs': {'list': {'empty': 'None'}}},
+    }
+
+
+def test_move_replace_keeps_the_target_position(tree):
+    tree.move('footer', 'common', exists='replace')
+    assert list(tree.to_data()) == ['common', 'jobs']
+    assert tree.to_data()['common'] == 'Footer'
+
+
+def test_move_merge_combines_objects(tree):
+    tree.copy('common', 'jobs.list.common')
+    tree.move('jobs.list', 'jobs', exists='merge')
+    assert tree.to_data()['jobs'] == {'title': 'Jobs', 'empty': 'None', 'common': {'ok': 'OK', 'cancel': 'Cancel'}}
+
+
+def test_copy_leaves_the_source(tree):
+    tree.copy('common', 'shared')
+    tree.rename('shared.ok', 'yes')
+    data = tree.to_data()
+    assert data['common'] == {'ok': 'OK', 'cancel': 'Cancel'}
+    assert data['shared'] == {'yes': 'OK', 'cancel': 'Cancel'}
+
+
+def test_rename_keeps_the_position(tree):
+    tree.rename('common.ok', 'confirm')
+    assert list(tree.to_data()['common']) == ['confirm', 'cancel']
+
+
+def test_delete(tree):
+    tree.delete('jobs.list')
+    assert 'jobs.list' not in tree
+    assert tree.to_data()['jobs'] == {'title': 'Jobs'}
+
+
+@pytest.mark.parametrize('op, args, path', [
+    ('move', ('missing', 'x'), 'missing'),
+    ('move', ('common', 'jobs'), 'jobs'),
+    ('move', ('jobs', 'jobs.list.jobs'), 'jobs.list.jobs'),
+    ('move', ('common', 'footer.common'), 'footer'),
+    ('copy', ('common.ok', 'jobs', 'merge'), 'jobs'),
+    ('rename', ('common.ok', 'cancel'), 'common.cancel'),
+    ('rename', ('common.ok', 'a.b'), 'common.ok'),
+])
+def test_conflicts_change_nothing(tree, op, args, path):
+    before = tree.to_data()
+    with pytest.raises(TreeConflict) as e:
+        getattr(tree, op)(*args)
+    assert e.value.path == path
+    assert tree.to_data() == before
+
+
+def test_merge_with_a_different_leaf_is_a_conflict(tree):
+    tree.copy('common', 'other')
+    tree.find('other.ok').value = 'Okay'
+    with pytest.raises(TreeConflict) as e:
+        tree.move('other', 'common', exists='merge')
+    assert e.value.path == 'common.ok'
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from i18n_tools.ops import Session
+from i18n_tools.store import LocaleStore
+from i18n_tools.watch import InotifyWatcher, PollingWatcher, Watch, make_watcher
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'App.tsx').write_text("t('a.x');\n", encoding='utf-8')
+    locales = tmp_path / 'locales'
+    locales.mkdir()
+    for lang in ('en', 'zh'):
+        (locales / f'{lang}.json').write_text(json.dumps({'a': {'x': 'X'}}), encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def watch(tree):
+    store = LocaleStore(('en', 'zh'), str(tree / 'locales'))
+    session = Session(store, root=str(tree), use_cache=False)
+    watch = Watch(session, str(tree / 'src'), store.langs, workers=1)
+    assert watch.load_all() == ([], [])
+    return watch
+
+
+def test_locale_edits_report_new_and_fixed_problems(tree, watch):
+    zh = tree / 'locales' / 'zh.json'
+    zh.write_text('{"a": {"x": "X", "x": "Y"}, "b": "B"}', encoding='utf-8')
+    added, fixed = watch.update([str(zh)])
+    assert fixed == []
+    assert sorted(added) == ['[zh] extra b (vs en)', 'locales/zh.json:1:18: duplicate key "a.x" (first at line 1)']
+    zh.write_text('{"a": {"x": "X"}}', encoding='utf-8')
+    added, fixed = watch.update([str(zh)])
+    assert added == [] and len(fixed) == 2
+    assert watch.problems == {}
+
+
+def test_broken_locale_keeps_its_last_good_index(tree, watch):
+    zh = tree / 'locales' / 'zh.json'
+    zh.write_text('{"a": {"x": "X",}}', encoding='utf-8')
+    added, _ = watch.update([str(zh)])
+    assert [k[0] for k in watch.problems] == ['syntax'] * len(added)
+    assert 'zh' in watch.broken and watch.indexes['zh'].has('a.x')
+    zh.write_text('{"a": {"x": "X"}}', encoding='utf-8')
+    added, fixed = watch.update([str(zh)])
+    assert added == [] and fixed and watch.problems == {}
+
+
+def test_source_edits_rescan_only_that_file(tree, watch):
+    page = tree / 'src' / 'Page.tsx'
+    page.write_text("t('a.y');\nt(`a.${k}.z`);\n", encoding='utf-8')
+    added, fixed = watch.update([str(page)])
+    assert fixed == []
+    assert sorted(added) == [f'[{lang}] {what} (src/Page.tsx:{line})' for lang in ('en', 'zh')
+                             for what, line in (('missing key a.y', 1), ('pattern a.*.z matches nothing', 2))]
+    page.unlink()
+    added, fixed = watch.update([str(page)])
+    assert added == [] and len(fixed) == 4
+
+
+def test_only_sources_and_locales_are_wanted(tree, watch):
+    assert watch.wanted(str(tree / 'locales' / 'en.json'))
+    assert not watch.wanted(str(tree / 'locales' / 'fr.json'))
+    assert watch.wanted(str(tree / 'src' / 'deep' / 'A.tsx'))
+    assert not watch.wanted(str(tree / 'src' / 'types.d.ts'))
+    assert not watch.wanted(str(tree / 'App.tsx'))
+    assert watch.dirs() == [str(tree / 'src'), str(tree / 'locales')]
+
+
+@pytest.mark.parametrize('poll', [True, False])
+def test_watchers_report_written_files(tree, watch, poll):
+    watcher = make_watcher(watch.dirs(), watch.wanted, poll)
+    if poll:
+        assert isinstance(watcher, PollingWatcher)
+        watcher.interval = 0.01
+    elif not isinstance(watcher, InotifyWatcher):
+        pytest.skip('inotify is not available')
+    try:
+        assert watcher.changes(0.05) == set()
+        (tree / 'src' / 'New.tsx').write_text("t('a.x');\n", encoding='utf-8')
+        (tree / 'src' / 'notes.txt').write_text('ignored', encoding='utf-8')
+        (tree / 'locales' / 'en.json').write_text('{}', encoding='utf-8')
+        assert watcher.changes(2) == {str(tree / 'src' / 'New.tsx'), str(tree / 'locales' / 'en.json')}
+    finally:
+        watcher.close()
@@ -0,0 +1,188 @@
+"""Opt-in per-phase timing and memory instrumentation.
+
+Nothing is recorded until ``enable`` is called (``--profile`` or ``--trace``
+on the command line); until then ``span`` returns a shared no-op context and
+``add_bytes`` returns at once.
+
+A span records wall and CPU time, the bytes read and written inside it, the
+process's peak RSS when it ended and, with ``memory=True``, the tracemalloc
+peak reached inside it. Per-file work fanned out by ``parallel.map_files``
+runs in its own span, in the worker process if there is one; the worker's
+spans are sent back with the results and keep their pid, so a Chrome trace
+shows one lane per process.
+"""
+import collections
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not POSIX
+    resource = None
+
+Span = collections.namedtuple('Span', 'name args pid tid start wall cpu read written rss peak depth')
+
+_NULL = contextlib.nullcontext()
+_tracer = None
+
+
+def _rss():
+    """Peak resident set size of this process in bytes, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _Open:
+    __slots__ = ('name', 'args', 'start', 'cpu', 'read', 'written', 'peak')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.read = self.written = self.peak = 0
+        self.start = time.perf_counter()
+        self.cpu = time.process_time()
+
+
+class Tracer:
+    def __init__(self, memory=False, worker=False):
+        self.memory = memory
+        self.worker = worker
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._stack = []
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        if self.memory and self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+        if self.memory:
+            tracemalloc.reset_peak()
+        frame = _Open(name, args)
+        self._stack.append(frame)
+        try:
+            yield frame
+        finally:
+            wall = time.perf_counter() - frame.start
+            cpu = time.process_time() - frame.cpu
+            self._stack.pop()
+            peak = None
+            if self.memory:
+                peak = frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                parent = self._stack[-1]
+                parent.read += frame.read
+                parent.written += frame.written
+                parent.peak = max(parent.peak, frame.peak)
+            self.spans.append(Span(name, args, self.pid, threading.get_ident(), frame.start, wall, cpu,
+                                   frame.read, frame.written, _rss(), peak, len(self._stack)))
+
+    def add_bytes(self, read=0, written=0):
+        if self._stack:
+            frame = self._stack[-1]
+            frame.read += read
+            frame.written += written
+
+    def merge(self, spans):
+        """Add spans recorded in a worker process under the currently open span."""
+        depth = len(self._stack)
+        for s in spans:
+            self.spans.append(s._replace(depth=s.depth + depth))
+            if s.depth == 0:
+                self.add_bytes(s.read, s.written)
+
+    def summary(self):
+        """``{name: {'calls', 'wall', 'cpu', 'read', 'written', 'rss', 'peak'}}`` in first-seen order."""
+        out = {}
+        for s in sorted(self.spans, key=lambda s: s.start):
+            row = out.setdefault(s.name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'read': 0, 'written': 0,
+                                          'rss': None, 'peak': None})
+            row['calls'] += 1
+            row['wall'] += s.wall
+            row['cpu'] += s.cpu
+            row['read'] += s.read
+            row['written'] += s.written
+            for field in ('rss', 'peak'):
+                value = getattr(s, field)
+                if value is not None:
+                    row[field] = max(row[field] or 0, value)
+        return out
+
+    def slowest_files(self, limit=10):
+        return sorted((s for s in self.spans if 'file' in s.args), key=lambda s: s.wall, reverse=True)[:limit]
+
+    def chrome_trace(self):
+        """The spans as Chrome trace-event JSON (``chrome://tracing``, Perfetto, speedscope)."""
+        events = []
+        for s in self.spans:
+            args = dict(s.args, cpu_ms=round(s.cpu * 1000, 3), read=s.read, written=s.written)
+            if s.rss is not None:
+                args['rss'] = s.rss
+            if s.peak is not None:
+                args['tracemalloc_peak'] = s.peak
+            events.append({'name': s.name, 'cat': 'i18n', 'ph': 'X', 'pid': s.pid, 'tid': s.tid,
+                           'ts': round((s.start - self.origin) * 1e6, 1), 'dur': round(s.wall * 1e6, 1),
+                           'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def enable(memory=False, worker=False):
+    global _tracer
+    _tracer = Tracer(memory, worker)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
+
+
+def active():
+    """The tracer of this process; a tracer inherited through ``fork`` does not count."""
+    return _tracer if _tracer is not None and _tracer.pid == os.getpid() else None
+
+
+def span(name, **args):
+    tracer = active()
+    return tracer.span(name, **args) if tracer is not None else _NULL
+
+
+def add_bytes(read=0, written=0):
+    tracer = active()
+    if tracer is not None:
+        tracer.add_bytes(read, written)
+
+
+def _name(func):
+    while isinstance(func, functools.partial):
+        func = func.func
+    return func.__name__
+
+
+def call_traced(func, memory, path, label='file'):
+    """``(func(path), spans)``; ``spans`` is set in pool workers, which trace into a tracer of their own.
+
+    The span records ``path`` under ``label``.
+    """
+    tracer = active()
+    if tracer is None:
+        tracer = enable(memory, worker=True)
+    with tracer.span(_name(func), **{label: path}):
+        result = func(path)
+    if not tracer.worker:
+        return result, None
+    spans, tracer.spans = tracer.spans, []
+    return result, spans
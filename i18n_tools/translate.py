@@ -0,0 +1,301 @@
+"""Machine-translation fill for locale leaves that are missing or still English.
+
+``untranslated`` lists the reference locale's string leaves that a target
+locale lacks, holds verbatim, or holds as Latin text with no CJK at all
+(the English fallbacks the old fix scripts copied in). Each distinct source
+text is translated once:
+
+1. ``TranslationMemory`` (SQLite) answers every text it has seen before.
+2. The rest go to a ``Translator`` backend in batches, several requests at
+   a time under a ``RateLimiter``, on an asyncio event loop.
+3. Every translation received is stored in the memory as soon as its
+   batch completes, so an interrupted run loses at most the batches in
+   flight.
+
+A translation whose ``{{placeholders}}`` differ from the source's is
+rejected (see ``templates.py``) and the leaf is left alone.
+
+Backends:
+
+``http``  POSTs ``{"q": [...], "source", "target", "format": "text"}`` and
+          reads ``{"translatedText": [...]}``, the LibreTranslate API
+``fake``  the ``http`` backend against ``FakeServer``, a local HTTP server
+          that "translates" by wrapping each text in ``[zh]...``, for trying
+          the pipeline without a network or an account
+
+The memory records which backend produced each translation and only answers
+with that backend's. The ``fake`` backend uses a memory of its own, in
+memory unless a file is given, so its output never reaches the shared file.
+"""
+import asyncio
+import contextlib
+import http.server
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+
+from .cache import CACHE_DIR
+from .templates import parse
+
+MEMORY_FILE = os.path.join(CACHE_DIR, 'translation_memory.sqlite')
+API_KEY_ENV = 'I18N_TRANSLATE_API_KEY'
+BATCH_SIZE = 50
+# Characters per request; long values make for slow, fragile batches.
+BATCH_CHARS = 5000
+CONCURRENCY = 4
+RATE = 5.0  # requests per second
+TIMEOUT = 30.0
+RETRIES = 3
+
+CJK_RE = re.compile(r'[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]')
+LATIN_RE = re.compile(r'[A-Za-z]{2,}')
+BACKENDS = ('http', 'fake')
+
+
+class TranslateError(RuntimeError):
+    """A backend failed on a batch after every retry."""
+
+
+def is_english(value):
+    """True for text a zh locale should not contain: Latin words and no CJK."""
+    return bool(LATIN_RE.search(value)) and not CJK_RE.search(value)
+
+
+def untranslated(reference, index):
+    """``{path: source text}`` for the string leaves of ``reference`` that ``index`` lacks or holds in English."""
+    out = {}
+    for path, source in reference.items():
+        if not isinstance(source, str) or not LATIN_RE.search(source):
+            continue
+        value = index.get(path)
+        if value is None and not index.has(path):
+            out[path] = source
+        elif isinstance(value, str) and (value == source or is_english(value)):
+            out[path] = source
+    return out
+
+
+def batches(texts, size=BATCH_SIZE, chars=BATCH_CHARS):
+    """Split ``texts`` into lists of at most ``size`` texts and about ``chars`` characters."""
+    batch, length = [], 0
+    for text in texts:
+        if batch and (len(batch) >= size or length + len(text) > chars):
+            yield batch
+            batch, length = [], 0
+        batch.append(text)
+        length += len(text)
+    if batch:
+        yield batch
+
+
+def nest(values):
+    """Nested content for a patch from ``{dotted path: value}``."""
+    out = {}
+    for path, value in values.items():
+        *parents, key = path.split('.')
+        node = out
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[key] = value
+    return out
+
+
+def same_placeholders(source, translation):
+    return sorted(parse(source).names) == sorted(parse(translation).names)
+
+
+class TranslationMemory:
+    """``(source text, source lang, target lang) -> translation`` in a SQLite file."""
+
+    def __init__(self, path=MEMORY_FILE):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS memory ('
+                        'source TEXT NOT NULL, source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, '
+                        'translation TEXT NOT NULL, backend TEXT NOT NULL, created REAL NOT NULL, '
+                        'PRIMARY KEY (source, source_lang, target_lang))')
+        self.db.commit()
+
+    def lookup(self, texts, source_lang, target_lang, backend):
+        """``{text: translation}`` for the texts the memory has from ``backend``."""
+        out = {}
+        texts = list(texts)
+        for i in range(0, len(texts), 500):  # SQLite caps the number of bound parameters
+            chunk = texts[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT source, translation FROM memory WHERE source_lang = ? AND target_lang = ? AND backend = ? "
+                f"AND source IN ({', '.join('?' * len(chunk))})", (source_lang, target_lang, backend, *chunk))
+            out.update(rows)
+        return out
+
+    def store(self, pairs, source_lang, target_lang, backend):
+        now = time.time()
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?)',
+                                [(s, source_lang, target_lang, t, backend, now) for s, t in pairs])
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM memory').fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+class RateLimiter:
+    """Lets at most ``rate`` callers per second through ``wait``."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next - now
+            self.next = max(now, self.next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HttpTranslator:
+    """LibreTranslate-style JSON API; requests run in threads so batches overlap."""
+
+    name = 'http'
+
+    def __init__(self, url, api_key=None, timeout=TIMEOUT):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _post(self, texts, source, target):
+        body = {'q': texts, 'source': source, 'target': target, 'format': 'text'}
+        if self.api_key:
+            body['api_key'] = self.api_key
+        request = urllib.request.Request(self.url, json.dumps(body, ensure_ascii=False).encode('utf-8'),
+                                         {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            result = json.load(response)
+        translated = result.get('translatedText') if isinstance(result, dict) else None
+        if isinstance(translated, str):
+            translated = [translated]
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise TranslateError(f'{self.url}: expected {len(texts)} translations, got {result!r:.200}')
+        return translated
+
+    async def translate(self, texts, source, target):
+        return await asyncio.to_thread(self._post, texts, source, target)
+
+
+class _FakeHandler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        texts = body['q'] if isinstance(body['q'], list) else [body['q']]
+        self.server.requests += 1
+        data = json.dumps({'translatedText': [f"[{body['target']}]{t}" for t in texts]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeServer(http.server.ThreadingHTTPServer):
+    """Local stand-in for a translation API; ``with FakeServer() as server: server.url``."""
+
+    daemon_threads = True
+
+    def __init__(self, port=0):
+        super().__init__(('127.0.0.1', port), _FakeHandler)
+        self.requests = 0
+        self.url = f'http://127.0.0.1:{self.server_address[1]}/translate'
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class Fill:
+    """Translate ``texts`` through ``memory`` and ``translator``; ``(translations, stats)`` from ``run``."""
+
+    def __init__(self, translator, memory, source, target, concurrency=CONCURRENCY, rate=RATE, log=None):
+        self.translator = translator
+        self.memory = memory
+        self.source = source
+        self.target = target
+        self.concurrency = concurrency
+        self.rate = rate
+        self.log = log
+        self.stats = {'memory': 0, 'translated': 0, 'rejected': 0, 'failed': 0, 'requests': 0}
+
+    async def _batch(self, texts, limiter, semaphore, out):
+        async with semaphore:
+            for attempt in range(RETRIES):
+                await limiter.wait()
+                self.stats['requests'] += 1
+                try:
+                    translated = await self.translator.translate(texts, self.source, self.target)
+                    break
+                except (OSError, TranslateError, ValueError) as e:
+                    error = e
+                    await asyncio.sleep(2 ** attempt * 0.5)
+            else:
+                self.stats['failed'] += len(texts)
+                if self.log is not None:
+                    self.log(f"Batch of {len(texts)} failed: {error}")
+                return
+        good = []
+        for text, translation in zip(texts, translated):
+            if translation and same_placeholders(text, translation):
+                good.append((text, translation))
+            else:
+                self.stats['rejected'] += 1
+                if self.log is not None:
+                    self.log(f"Rejected translation of {text!r}: {translation!r}")
+        self.memory.store(good, self.source, self.target, self.translator.name)
+        self.stats['translated'] += len(good)
+        out.update(good)
+
+    async def _run(self, texts):
+        limiter = RateLimiter(self.rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        out = {}
+        await asyncio.gather(*(self._batch(b, limiter, semaphore, out) for b in batches(texts)))
+        return out
+
+    def run(self, texts):
+        texts = list(dict.fromkeys(texts))
+        known = self.memory.lookup(texts, self.source, self.target, self.translator.name)
+        self.stats['memory'] = len(known)
+        todo = [t for t in texts if t not in known]
+        if todo:
+            known.update(asyncio.run(self._run(todo)))
+        return known, self.stats
+
+
+@contextlib.contextmanager
+def open_translator(backend, url=None, api_key=None):
+    """The ``Translator`` for a backend name, with the fake server running while it is in use."""
+    if backend == 'fake':
+        with FakeServer() as server:
+            translator = HttpTranslator(server.url)
+            translator.name = 'fake'
+            yield translator
+        return
+    if not url:
+        raise TranslateError('the http backend needs --url')
+    yield HttpTranslator(url, api_key or os.environ.get(API_KEY_ENV))
+
+
@@ -0,0 +1,273 @@
+"""Mutable locale tree for moving, renaming, copying and deleting subtrees.
+
+Every object's children form a doubly linked list, which keeps document
+order, plus a dict from key to node for O(1) lookup. Each node points to its
+parent. Move, rename and delete therefore only relink a few pointers no
+matter how large the subtree is. Copy has to duplicate the subtree, so it
+is linear in its size. Finding a node costs one dict lookup per path
+segment.
+
+Conflicts are never resolved silently. A target that already exists, a
+missing source, a leaf where an object is needed, or a move into the
+node's own subtree raises ``TreeConflict`` before anything is changed.
+"""
+
+EXISTS = ('error', 'replace', 'merge')
+
+
+class TreeConflict(Exception):
+    """An operation would overwrite, lose or misplace locale content."""
+
+    def __init__(self, path, reason):
+        self.path = path
+        self.reason = reason
+        super().__init__(f'{path}: {reason}')
+
+
+class Node:
+    __slots__ = ('key', 'value', 'parent', 'children', 'first', 'last', 'prev', 'next')
+
+    def __init__(self, key, value=None, branch=False):
+        self.key = key
+        self.value = value
+        self.parent = self.prev = self.next = self.first = self.last = None
+        self.children = {} if branch else None
+
+    @property
+    def is_branch(self):
+        return self.children is not None
+
+    @property
+    def path(self):
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.key)
+            node = node.parent
+        return '.'.join(reversed(parts))
+
+    def __iter__(self):
+        """Children in document order."""
+        child = self.first
+        while child is not None:
+            yield child
+            child = child.next
+
+    def get(self, key):
+        return self.children.get(key) if self.children is not None else None
+
+    def unlink(self):
+        parent = self.parent
+        if self.prev is not None:
+            self.prev.next = self.next
+        else:
+            parent.first = self.next
+        if self.next is not None:
+            self.next.prev = self.prev
+        else:
+            parent.last = self.prev
+        del parent.children[self.key]
+        self.parent = self.prev = self.next = None
+
+    def append(self, child, before=None):
+        """Link ``child`` as the last child, or just before the child ``before``."""
+        child.parent = self
+        if before is None:
+            child.prev = self.last
+            if self.last is not None:
+                self.last.next = child
+            else:
+                self.first = child
+            self.last = child
+        else:
+            child.prev, child.next = before.prev, before
+            if before.prev is not None:
+                before.prev.next = child
+            else:
+                self.first = child
+            before.prev = child
+        self.children[child.key] = child
+
+
+def _build(key, value):
+    """Node for ``value``; nested objects are built with an explicit stack."""
+    if not isinstance(value, dict):
+        return Node(key, value)
+    root = Node(key, branch=True)
+    stack = [(root, value)]
+    while stack:
+        node, data = stack.pop()
+        for k, v in data.items():
+            child = Node(k, branch=True) if isinstance(v, dict) else Node(k, v)
+            node.append(child)
+            if child.is_branch:
+                stack.append((child, v))
+    return root
+
+
+def _export(node):
+    if not node.is_branch:
+        return node.value
+    out = {}
+    stack = [(node, out)]
+    while stack:
+        node, target = stack.pop()
+        for child in node:
+            if child.is_branch:
+                target[child.key] = sub = {}
+                stack.append((child, sub))
+            else:
+                target[child.key] = child.value
+    return out
+
+
+def _copy(node, key):
+    return _build(key, _export(node))
+
+
+def _split(path):
+    parent, _, key = path.rpartition('.')
+    return parent, key
+
+
+class LocaleTree:
+    """One locale as a tree of ``Node``s; ``to_data`` turns it back into dicts."""
+
+    def __init__(self, data):
+        self.root = _build('', data)
+
+    def to_data(self):
+        return _export(self.root)
+
+    def find(self, path):
+        """The node at the dotted ``path`` (the root for ``''``), or ``None``."""
+        node = self.root
+        for part in path.split('.') if path else ():
+            node = node.get(part)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, path):
+        return self.find(path) is not None
+
+    def _source(self, path):
+        node = self.find(path) if path else None
+        if node is None:
+            raise TreeConflict(path, 'does not exist')
+        return node
+
+    def _parent(self, path, create):
+        """The object that holds ``path``, creating missing objects on the way if asked."""
+        parent_path, key = _split(path)
+        node = self.root
+        missing = []
+        for part in parent_path.split('.') if parent_path else ():
+            if missing:
+                missing.append(part)
+                continue
+            child = node.get(part)
+            if child is None:
+                if not create:
+                    raise TreeConflict(parent_path, 'does not exist')
+                missing.append(part)
+            elif not child.is_branch:
+                raise TreeConflict(child.path, 'is a string, not an object')
+            else:
+                node = child
+        return node, missing, key
+
+    @staticmethod
+    def _make(node, missing):
+        for part in missing:
+            child = Node(part, branch=True)
+            node.append(child)
+            node = child
+        return node
+
+    def _check_merge(self, src, dst):
+        """Raise unless ``src`` can be merged into ``dst`` without losing a value."""
+        stack = [(src, dst)]
+        while stack:
+            a, b = stack.pop()
+            if a.is_branch != b.is_branch:
+                raise TreeConflict(b.path, 'is a string in one tree and an object in the other')
+            if not a.is_branch:
+                if a.value != b.value:
+                    raise TreeConflict(b.path, f'exists with a different value ({b.value!r} vs {a.value!r})')
+                continue
+            stack.extend((c, b.children[c.key]) for c in a if c.key in b.children)
+
+    def _merge(self, src, dst):
+        """Relink the children of ``src`` into ``dst``; checked by ``_check_merge``."""
+        stack = [(src, dst)]
+        while stack:
+            a, b = stack.pop()
+            for child in list(a):
+                existing = b.children.get(child.key)
+                if existing is None:
+                    child.unlink()
+                    b.append(child)
+                elif child.is_branch:
+                    stack.append((child, existing))
+
+    def _place(self, node, dst, exists):
+        """Link ``node`` (already unlinked or fresh) at the path ``dst``."""
+        parent, missing, key = self._parent(dst, create=True)
+        parent = self._make(parent, missing)
+        node.key = key
+        target = parent.children.get(key)
+        if target is not None:
+            if exists == 'replace':
+                anchor = target.next
+                target.unlink()
+                parent.append(node, anchor)
+            else:
+                self._merge(node, target)
+            return
+        parent.append(node)
+
+    def _check_target(self, src, dst, exists):
+        if dst == src.path or dst.startswith(src.path + '.'):
+            raise TreeConflict(dst, f'is inside {src.path}')
+        parent, missing, key = self._parent(dst, create=True)
+        target = None if missing else parent.children.get(key)
+        if target is not None:
+            if exists == 'error':
+                raise TreeConflict(dst, 'already exists')
+            if exists == 'merge':
+                if not target.is_branch or not src.is_branch:
+                    raise TreeConflict(dst, 'cannot merge a string')
+                self._check_merge(src, target)
+
+    def move(self, src, dst, exists='error'):
+        """Move the subtree at ``src`` to ``dst``.
+
+        ``exists`` decides what happens if ``dst`` is taken: ``error``,
+        ``replace`` it in place, or ``merge`` the two objects (any leaf present
+        in both with different values is a conflict).
+        """
+        node = self._source(src)
+        self._check_target(node, dst, exists)
+        node.unlink()
+        self._place(node, dst, exists)
+
+    def copy(self, src, dst, exists='error'):
+        node = self._source(src)
+        self._check_target(node, dst, exists)
+        self._place(_copy(node, node.key), dst, exists)
+
+    def rename(self, path, new_key):
+        """Rename the last segment of ``path`` in place, keeping its position."""
+        node = self._source(path)
+        if '.' in new_key or not new_key:
+            raise TreeConflict(path, f'invalid key {new_key!r}')
+        if new_key in node.parent.children:
+            parent = _split(path)[0]
+            raise TreeConflict(f'{parent}.{new_key}' if parent else new_key, 'already exists')
+        del node.parent.children[node.key]
+        node.key = new_key
+        node.parent.children[new_key] = node
+
+    def delete(self, path):
+        self._source(path).unlink()
@@ -0,0 +1,310 @@
+"""Resident watch mode: re-check locales and sources as they are saved.
+
+``Watch`` keeps the parsed locales, their ``FlatIndex``es and the per-file
+key usages in memory. When a locale changes only that locale is re-read,
+re-parsed and scanned for duplicates, and the cross-locale diff is redone
+from the indexes. When a source file changes only that file is re-scanned.
+After each batch of changes the problems that appeared or went away are
+printed, with the time taken.
+
+Changes come from inotify on Linux (through ``ctypes``, no dependency) and
+from polling file stats everywhere else or when asked to.
+"""
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import time
+
+from .diff import diff_locales
+from .duplicates import ScanError, find_duplicates
+from .dynamic import check_patterns
+from .extract import (SOURCE_EXTENSIONS, extraction_cache, is_pattern, iter_source_files, merge_usages,
+                      scan_file)
+from .parallel import map_files
+from .paths import rel
+from .repair import check_text
+
+POLL_INTERVAL = 0.5
+# Events arriving this soon after another are handled in the same batch.
+SETTLE = 0.02
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+def _walk_dirs(top):
+    for dirpath, dirnames, _ in os.walk(top):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+        yield dirpath
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on a few directory trees."""
+
+    def __init__(self, dirs, wanted):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add = libc.inotify_add_watch
+        self.wanted = wanted
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        for top in dirs:
+            for path in _walk_dirs(top):
+                self._watch(path)
+
+    def _watch(self, path):
+        wd = self._add(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, 'inotify watch limit reached (fs.inotify.max_user_watches)')
+            return
+        self.dirs[wd] = path
+
+    def _read(self, changed):
+        """Drain pending events into ``changed``; False after a queue overflow."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        ok = True
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, size = _EVENT.unpack_from(data, pos)
+            name = os.fsdecode(data[pos + _EVENT.size:pos + _EVENT.size + size].rstrip(b'\0'))
+            pos += _EVENT.size + size
+            if mask & IN_Q_OVERFLOW:
+                ok = False
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith('.'):
+                    for sub in _walk_dirs(path):
+                        self._watch(sub)
+                    changed.update(p for p in iter_source_files(path) if self.wanted(p))
+            elif self.wanted(path):
+                changed.add(path)
+        return ok
+
+    def changes(self, timeout=None):
+        """Paths changed since the last call, waiting up to ``timeout``; ``None`` means rescan everything."""
+        changed = set()
+        ok = True
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            ok = self._read(changed) and ok
+            ready, _, _ = select.select([self.fd], [], [], SETTLE)
+        return changed if ok else None
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Stat-based fallback: compares ``(mtime_ns, size)`` of every wanted file."""
+
+    def __init__(self, dirs, wanted, interval=POLL_INTERVAL):
+        self.dirs = dirs
+        self.wanted = wanted
+        self.interval = interval
+        self.seen = self._snapshot()
+
+    def _snapshot(self):
+        out = {}
+        for top in self.dirs:
+            for directory in _walk_dirs(top):
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_file() and self.wanted(entry.path):
+                            st = entry.stat()
+                            out[entry.path] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
+            current = self._snapshot()
+            changed = {p for p in current.keys() | self.seen.keys() if current.get(p) != self.seen.get(p)}
+            self.seen = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(dirs, wanted, poll=False):
+    """``InotifyWatcher`` where available, else ``PollingWatcher``."""
+    if not poll and hasattr(os, 'O_CLOEXEC') and ctypes.util.find_library('c'):
+        try:
+            return InotifyWatcher(dirs, wanted)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(dirs, wanted)
+
+
+class Watch:
+    """Problems of the current tree, updated incrementally.
+
+    ``problems`` maps ``(check, lang, subject)`` to the message printed for it.
+    """
+
+    def __init__(self, session, src_dir, langs, reference=None, workers=None):
+        self.session = session
+        self.store = session.store
+        self.src_dir = os.path.abspath(src_dir)
+        self.langs = tuple(langs)
+        self.reference = reference or self.langs[0]
+        self.workers = workers
+        self.indexes = {}
+        self.broken = set()
+        self.per_file = {}
+        self.usages = {}
+        self.problems = {}
+        self.locale_paths = {os.path.abspath(self.store.path(lang)): lang for lang in self.langs}
+
+    def wanted(self, path):
+        path = os.path.abspath(path)
+        if path in self.locale_paths:
+            return True
+        name = os.path.basename(path)
+        return (path.startswith(self.src_dir + os.sep) and name.endswith(SOURCE_EXTENSIONS)
+                and not name.endswith('.d.ts') and not name.startswith('.'))
+
+    def dirs(self):
+        dirs = [self.src_dir]
+        locales_dir = os.path.abspath(self.store.locales_dir)
+        if not locales_dir.startswith(self.src_dir + os.sep):
+            dirs.append(locales_dir)
+        return dirs
+
+    # -- loading -------------------------------------------------------
+
+    def load_all(self):
+        paths = list(iter_source_files(self.src_dir))
+        if self.session.use_cache:
+            self.per_file = extraction_cache(self.session.root).resolve(paths, scan_file, self.workers)
+        else:
+            self.per_file = dict(zip(paths, (rows for _, rows in map_files(scan_file, paths, self.workers))))
+        self.usages = merge_usages(self.per_file, self.session.root)
+        problems = {}
+        for lang in self.langs:
+            problems.update(self._check_locale(lang))
+        problems.update(self._check_diff())
+        problems.update(self._check_missing(self.langs))
+        return self._replace(problems, lambda key: True)
+
+    def _check_locale(self, lang):
+        """Re-read ``lang``; syntax and duplicate problems, keeping the last good index if it is broken."""
+        self.store.reload(lang)
+        text = self.store.text(lang)
+        name = rel(self.store.path(lang), self.session.root)
+        out = {}
+        try:
+            json.loads(text)
+        except json.JSONDecodeError:
+            self.broken.add(lang)
+            for p in check_text(text):
+                out[('syntax', lang, (p.line, p.col, p.kind))] = f"{name}:{p.line}:{p.col}: {p.message}"
+            return out
+        self.broken.discard(lang)
+        try:
+            for dup in find_duplicates(text):
+                out[('duplicate', lang, dup.path)] = (f"{name}:{dup.second[0]}:{dup.second[1]}: duplicate key "
+                                                      f"\"{dup.path}\" (first at line {dup.first[0]})")
+        except ScanError:
+            pass
+        self.indexes[lang] = self.store.index(lang)
+        return out
+
+    def _check_diff(self):
+        indexes = {lang: self.indexes[lang] for lang in self.langs if lang in self.indexes}
+        if self.reference not in indexes:
+            return {}
+        out = {}
+        for lang, items in diff_locales(indexes, self.reference).items():
+            for d in items:
+                if d.kind in ('missing', 'extra'):
+                    message = f"[{lang}] {d.kind} {d.path} (vs {self.reference})"
+                else:
+                    message = f"[{lang}] {d.kind} {d.path}: {d.expected} in {self.reference}, {d.actual} in {lang}"
+                out[('mismatch', lang, (d.kind, d.path))] = message
+        return out
+
+    def _check_missing(self, langs):
+        out = {}
+        for lang in langs:
+            index = self.indexes.get(lang)
+            if index is None:
+                continue
+            for key, uses in self.usages.items():
+                if not is_pattern(key) and not index.has(key):
+                    out[('missing', lang, key)] = f"[{lang}] missing key {key} ({uses[0].path}:{uses[0].line})"
+            for pattern, resolution in check_patterns(self.usages, index).items():
+                if not resolution.keys:
+                    first = self.usages[pattern][0]
+                    out[('missing', lang, pattern)] = f"[{lang}] pattern {pattern} matches nothing ({first.path}:{first.line})"
+        return out
+
+    # -- updates -------------------------------------------------------
+
+    def _replace(self, problems, covers):
+        """Swap in ``problems`` for every current problem ``covers`` selects; ``(added, fixed)``."""
+        old = {k: v for k, v in self.problems.items() if covers(k)}
+        for key in old:
+            del self.problems[key]
+        self.problems.update(problems)
+        added = [problems[k] for k in problems if k not in old]
+        fixed = [old[k] for k in old if k not in problems]
+        return added, fixed
+
+    def update(self, paths):
+        """Re-check after ``paths`` changed (``None``: everything); ``(added, fixed)``."""
+        if paths is None:
+            return self.load_all()
+        langs = [self.locale_paths[os.path.abspath(p)] for p in paths if os.path.abspath(p) in self.locale_paths]
+        sources = [p for p in paths if os.path.abspath(p) not in self.locale_paths]
+        for path in sources:
+            if os.path.exists(path):
+                self.per_file[path] = scan_file(path)[1]
+            else:
+                self.per_file.pop(path, None)
+        problems = {}
+        for lang in langs:
+            problems.update(self._check_locale(lang))
+        if sources:
+            self.usages = merge_usages(self.per_file, self.session.root)
+        missing_langs = self.langs if sources else [lang for lang in langs if lang not in self.broken]
+        problems.update(self._check_missing(missing_langs))
+        if langs:
+            problems.update(self._check_diff())
+        touched = set(langs)
+        missing_set = set(missing_langs)
+
+        def covers(key):
+            check, lang, _ = key
+            if check == 'syntax':
+                return lang in touched
+            if check == 'duplicate':
+                return lang in touched and lang not in self.broken
+            if check == 'missing':
+                return lang in missing_set
+            return bool(touched)
+
+        return self._replace(problems, covers)
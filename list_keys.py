@@ -1,22 +1,10 @@
-import json
+"""Print the root, admin, auPair and marketingAuPair keys of en.json.
 
-try:
-    with open('src/i18n/locales/en.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print("Root keys:", list(data.keys()))
-    
-    if "admin" in data:
-        print("Admin keys:", list(data["admin"].keys()))
-    else:
-        print("Usage of 'admin' key not found at root.")
+Kept as a shortcut for ``python -m i18n_tools list '' admin auPair marketingAuPair --lang en``.
+"""
+import sys
 
-    if "auPair" in data:
-        print("auPair keys:", list(data["auPair"].keys()))
-    else:
-        print("Usage of 'auPair' key not found at root.")
-        
-    if "marketingAuPair" in data:
-        print("marketingAuPair keys:", list(data["marketingAuPair"].keys()))
+from i18n_tools.cli import main
 
-except Exception as e:
-    print(f"Error: {e}")
+if __name__ == '__main__':
+    sys.exit(main(['list', '', 'admin', 'auPair', 'marketingAuPair', '--lang', 'en']))
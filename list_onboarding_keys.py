@@ -1,13 +1,10 @@
-import json
+"""Print the keys of auPair.onboarding in en.json.
 
-try:
-    with open('src/i18n/locales/en.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    if 'auPair' in data and 'onboarding' in data['auPair']:
-        print("Keys in auPair.onboarding:", list(data['auPair']['onboarding'].keys()))
-    else:
-        print("auPair.onboarding not found")
+Kept as a shortcut for ``python -m i18n_tools list auPair.onboarding --lang en``.
+"""
+import sys
 
-except Exception as e:
-    print(f"Error: {e}")
+from i18n_tools.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['list', 'auPair.onboarding', '--lang', 'en']))
@@ -1,8 +1,10 @@
-import json
+"""Print the root keys of zh.json.
 
-try:
-    with open('src/i18n/locales/zh.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print("Root keys:", list(data.keys()))
-except Exception as e:
-    print(f"Error: {e}")
+Kept as a shortcut for ``python -m i18n_tools list --lang zh``.
+"""
+import sys
+
+from i18n_tools.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['list', '--lang', 'zh']))
@@ -0,0 +1,76 @@
+import { matchPath } from 'react-router-dom';
+import i18n from './config';
+
+// Reads the manifest written by `python -m i18n_tools chunks` into public/locales.
+interface ChunkManifest {
+  version: number;
+  chunks: Record<string, Record<string, string>>;
+  shared: string[];
+  routes: Record<string, string[]>;
+}
+
+const CHUNKS_BASE = '/locales/';
+
+let manifestPromise: Promise<ChunkManifest> | null = null;
+const loaded = new Set<string>();
+
+function loadManifest(): Promise<ChunkManifest> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${CHUNKS_BASE}manifest.json`).then((res) => {
+      if (!res.ok) throw new Error(`Failed to load locale manifest: ${res.status}`);
+      return res.json();
+    });
+  }
+  return manifestPromise;
+}
+
+// Static segments beat params, params beat splats.
+function routeRank(pattern: string): number {
+  if (pattern.includes('*')) return 2;
+  return pattern.includes(':') ? 1 : 0;
+}
+
+function routeNamespaces(manifest: ChunkManifest, pathname: string): string[] {
+  const patterns = Object.keys(manifest.routes).sort((a, b) => routeRank(a) - routeRank(b));
+  const match = patterns.find((pattern) => matchPath(pattern, pathname));
+  return match ? manifest.routes[match] : [];
+}
+
+export async function loadNamespaces(lang: string, namespaces: string[]): Promise<void> {
+  const manifest = await loadManifest();
+  const files = manifest.chunks[lang] || {};
+  await Promise.all(
+    namespaces
+      .filter((ns) => files[ns] && !loaded.has(`${lang}/${ns}`))
+      .map(async (ns) => {
+        const res = await fetch(`${CHUNKS_BASE}${files[ns]}`);
+        if (!res.ok) throw new Error(`Failed to load ${lang}/${ns}: ${res.status}`);
+        i18n.addResourceBundle(lang, 'translation', await res.json(), true, true);
+        loaded.add(`${lang}/${ns}`);
+      })
+  );
+}
+
+// Loads the shell namespaces plus whatever the matched route needs, for the
+// current language and the 'en' fallback.
+export async function loadRouteTranslations(pathname: string, lang: string = i18n.language): Promise<void> {
+  const manifest = await loadManifest();
+  const namespaces = [...manifest.shared, ...routeNamespaces(manifest, pathname)];
+  const langs = lang === 'en' ? ['en'] : [lang, 'en'];
+  await Promise.all(langs.map((l) => loadNamespaces(l, namespaces)));
+}
+
+interface RouterLike {
+  state: { location: { pathname: string } };
+  subscribe(listener: (state: { location: { pathname: string } }) => void): () => void;
+}
+
+// Loads the translations for the current route before the first render,
+// then for every navigation and language change.
+export async function initChunkedLocales(router: RouterLike): Promise<void> {
+  const load = (pathname: string) =>
+    loadRouteTranslations(pathname).catch((err) => console.error(err));
+  router.subscribe((state) => void load(state.location.pathname));
+  i18n.on('languageChanged', () => void load(router.state.location.pathname));
+  await load(router.state.location.pathname);
+}
@@ -1,15 +1,40 @@
 import i18n from 'i18next';
 import { initReactI18next } from 'react-i18next';
+import { compiledFormat, loadCompiledMessages } from './format';
 import en from './locales/en.json';
 import zh from './locales/zh.json';
 
+// `npm run build:chunked` sets this after `python -m i18n_tools chunks` has
+// written public/locales. The full locales then drop out of the bundle, and
+// chunks.ts loads the namespaces each route needs.
+export const CHUNKED_LOCALES = import.meta.env.VITE_I18N_CHUNKS === 'true';
+
+// `npm run build:compiled` sets this after `python -m i18n_tools compile` has
+// written public/locales/compiled. Strings are then formatted from their
+// precompiled messages (see format.ts) instead of by i18next's interpolation.
+export const COMPILED_MESSAGES = import.meta.env.VITE_I18N_COMPILED === 'true';
+
+if (COMPILED_MESSAGES) {
+  i18n.use(compiledFormat);
+  loadCompiledMessages(i18n);
+}
+
 i18n
   .use(initReactI18next)
   .init({
-    resources: {
-      en: { translation: en },
-      zh: { translation: zh },
-    },
+    ...(CHUNKED_LOCALES
+      ? {
+          resources: {},
+          partialBundledLanguages: true,
+          // Re-render when a chunk arrives after the first paint.
+          react: { bindI18nStore: 'added' },
+        }
+      : {
+          resources: {
+            en: { translation: en },
+            zh: { translation: zh },
+          },
+        }),
     lng: 'zh',
     fallbackLng: 'en',
     interpolation: {
@@ -0,0 +1,130 @@
+import type { i18n as I18n, InterpolationOptions } from 'i18next';
+
+// Runtime for the message files written by `python -m i18n_tools compile` into
+// public/locales/compiled. A compiled message is either a plain string or a
+// list alternating literal text and placeholder names, starting and ending
+// with literal text, so formatting is concatenation with no regex per call.
+export type CompiledMessage = string | string[];
+
+export interface CompiledResource {
+  version: number;
+  lang: string;
+  messages: Record<string, CompiledMessage>;
+}
+
+export type Values = Record<string, unknown>;
+
+type ParseOptions = Values & {
+  replace?: Values | string;
+  interpolation?: InterpolationOptions;
+  nest?: boolean;
+};
+
+interface ParseInfo {
+  resolved?: { usedLng?: string; exactUsedKey?: string };
+}
+
+const COMPILED_BASE = '/locales/compiled/';
+const COMPILED_VERSION = 2;
+const NAMESPACE = 'translation';
+
+const compiled = new Map<string, Record<string, CompiledMessage>>();
+const pending = new Map<string, Promise<void>>();
+let instance: I18n | null = null;
+
+function lookup(values: Values, name: string): unknown {
+  if (!name.includes('.')) return values[name];
+  return name
+    .split('.')
+    .reduce<unknown>((v, part) => (v !== null && typeof v === 'object' ? (v as Values)[part] : undefined), values);
+}
+
+// As in i18next, an unknown placeholder stays {{name}} and null renders empty.
+export function formatMessage(message: CompiledMessage, values: Values = {}): string {
+  if (typeof message === 'string') return message;
+  let out = message[0];
+  for (let i = 1; i < message.length; i += 2) {
+    const value = lookup(values, message[i]);
+    out += (value === undefined ? `{{${message[i]}}}` : value === null ? '' : String(value)) + message[i + 1];
+  }
+  return out;
+}
+
+function variables(options: ParseOptions): Values {
+  return options.replace && typeof options.replace !== 'string' ? options.replace : options;
+}
+
+// What i18next does itself when no i18nFormat module is installed.
+function interpolate(i18next: I18n, res: string, options: ParseOptions, lng: string): string {
+  const { interpolator } = i18next.services;
+  const interpolation = options as InterpolationOptions;
+  const out = interpolator.interpolate(res, variables(options), lng, interpolation);
+  if (options.nest === false) return out;
+  return interpolator.nest(out, i18next.t.bind(i18next), interpolation);
+}
+
+function escaping(i18next: I18n, options: ParseOptions): boolean {
+  return options.interpolation?.escapeValue ?? i18next.options.interpolation?.escapeValue ?? true;
+}
+
+// An i18next `i18nFormat` module: i18next hands it each resolved string in
+// place of its own interpolation. A string with a compiled message for the
+// key and language it was found under is formatted from that message; plain
+// strings come back as they are. Everything else (no compiled file loaded
+// yet, `$t()` or `{{value, format}}`, escaping switched on, a compiled file
+// from other locales) goes through i18next's interpolator as before.
+export const compiledFormat = {
+  type: 'i18nFormat' as const,
+
+  init(i18next: I18n) {
+    instance = i18next;
+  },
+
+  parse(res: string, options: ParseOptions, lng: string, ns: string, key: string, info?: ParseInfo): string {
+    const i18next = instance!;
+    if (typeof res !== 'string') return res;
+    const messages = ns === NAMESPACE ? compiled.get(info?.resolved?.usedLng ?? lng) : undefined;
+    const message = messages?.[info?.resolved?.exactUsedKey ?? key];
+    if (message === undefined || escaping(i18next, options)) return interpolate(i18next, res, options, lng);
+    if (typeof message === 'string') {
+      return message === res ? res : interpolate(i18next, res, options, lng);
+    }
+    if (!res.startsWith(message[0]) || !res.endsWith(message[message.length - 1])) {
+      return interpolate(i18next, res, options, lng);
+    }
+    return formatMessage(message, variables(options));
+  },
+};
+
+export function loadCompiled(lang: string): Promise<void> {
+  let promise = pending.get(lang);
+  if (!promise) {
+    promise = fetch(`${COMPILED_BASE}${lang}.json`)
+      .then(async (res) => {
+        if (!res.ok) throw new Error(`Failed to load compiled ${lang} messages: ${res.status}`);
+        const resource: CompiledResource = await res.json();
+        if (resource.version !== COMPILED_VERSION) {
+          throw new Error(`Compiled ${lang} messages have version ${resource.version}, expected ${COMPILED_VERSION}`);
+        }
+        compiled.set(lang, resource.messages);
+      })
+      .catch((err) => {
+        pending.delete(lang); // retried on the next language change
+        throw err;
+      });
+    pending.set(lang, promise);
+  }
+  return promise;
+}
+
+// Loads the compiled messages of the current language and its fallbacks on
+// every language change, the first one during init included. Rendering does
+// not wait: until a file arrives its strings are interpolated by i18next, with
+// the same result.
+export function loadCompiledMessages(i18next: I18n): void {
+  i18next.on('languageChanged', () => {
+    for (const lang of i18next.languages ?? []) {
+      loadCompiled(lang).catch((err) => console.error(err));
+    }
+  });
+}
@@ -6,19 +6,24 @@ import { I18nProvider } from './contexts/I18nContext';
 import { PersonalizationProvider } from './contexts/PersonalizationContext';
 import { ToastProvider } from './components/ui/Toast';
 import { router } from './router';
-import './i18n/config';
+import { CHUNKED_LOCALES } from './i18n/config';
+import { initChunkedLocales } from './i18n/chunks';
 import './index.css';
 
-createRoot(document.getElementById('root')!).render(
-  <StrictMode>
-    <I18nProvider>
-      <AuthProvider>
-        <PersonalizationProvider>
-          <ToastProvider> 
-            <RouterProvider router={router} />
-           </ToastProvider>
-        </PersonalizationProvider>
-      </AuthProvider>
-    </I18nProvider>
-  </StrictMode>
-);
+const localesReady = CHUNKED_LOCALES ? initChunkedLocales(router) : Promise.resolve();
+
+localesReady.then(() => {
+  createRoot(document.getElementById('root')!).render(
+    <StrictMode>
+      <I18nProvider>
+        <AuthProvider>
+          <PersonalizationProvider>
+            <ToastProvider> 
+              <RouterProvider router={router} />
+             </ToastProvider>
+          </PersonalizationProvider>
+        </AuthProvider>
+      </I18nProvider>
+    </StrictMode>
+  );
+});